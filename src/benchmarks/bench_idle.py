@@ -0,0 +1,71 @@
+"""
+Idle CPU benchmark for the main loop.
+
+Starts a game under SDL's dummy video driver, where the human player is
+first to move, and lets Game.run sit waiting for input for a few seconds
+in each loop mode. Reports the CPU time the process used per second of
+wall time, how often the loop woke up to handle events and step the
+logic, and how many frames were presented.
+
+The dummy driver cannot block, so SDL's event.wait() polls internally
+there and the CPU figure has a floor of SDL's own; on a desktop video
+driver the event-driven loop sleeps in the OS. Wakeups/s is what the
+loop itself costs either way. Run from src/:
+
+    python -m benchmarks.bench_idle
+"""
+import contextlib
+import io
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from main import Game
+
+
+def measure(label, event_driven, seconds):
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(event_driven=event_driven)
+
+    frames = [0]
+    wakeups = [0]
+    update = pygame.display.update
+    process_turn = game.logic.process_turn
+
+    def counting_update(*args):
+        frames[0] += 1
+        return update(*args)
+
+    def counting_process_turn(*args):
+        wakeups[0] += 1
+        return process_turn(*args)
+
+    # Ask the loop to quit once the time is up
+    pygame.time.set_timer(pygame.QUIT, int(seconds * 1000), loops=1)
+    pygame.display.update = counting_update
+    game.logic.process_turn = counting_process_turn
+    try:
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        game.run()
+        cpu = time.process_time() - cpu
+        wall = time.perf_counter() - wall
+    finally:
+        pygame.display.update = update
+
+    print(f"{label:>12}: {cpu / wall * 100:5.1f}% CPU, "
+          f"{wakeups[0] / wall:6.1f} wakeups/s, "
+          f"{frames[0] / wall:6.1f} updates/s over {wall:.1f} s")
+
+
+def main(seconds=5.0):
+    measure("polling", False, seconds)
+    measure("event-driven", True, seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Microbenchmark for neighbour iteration on tile placement.
+
+Compares the shared neighbour table against the old behaviour of building a
+fresh list of tuples on every lookup, over seeded random placement orders.
+Run from src/:
+
+    python -m benchmarks.bench_neighbors
+"""
+import random
+import time
+import tracemalloc
+
+import game.board as board_module
+from game.ai_player import AIPlayer
+from game.board import Board
+from game.corporation import Corporation
+from utils.constants import BOARD_WIDTH, BOARD_HEIGHT, CORPORATION_COLORS
+
+
+def legacy_get_neighbors(col, row):
+    """The original Board.get_neighbors: a new list per call."""
+    neighbors = []
+    if col > 0:
+        neighbors.append((col-1, row))
+    if col < BOARD_WIDTH - 1:
+        neighbors.append((col+1, row))
+    if row > 0:
+        neighbors.append((col, row-1))
+    if row < BOARD_HEIGHT - 1:
+        neighbors.append((col, row+1))
+    return neighbors
+
+
+class _LegacyColumn:
+    def __init__(self, table, col):
+        self.table = table
+        self.col = col
+
+    def __getitem__(self, row):
+        self.table.lookups += 1
+        return legacy_get_neighbors(self.col, row)
+
+
+class _LegacyTable:
+    """Stands in for NEIGHBORS but rebuilds the list on every lookup."""
+
+    def __init__(self):
+        self.lookups = 0
+
+    def __getitem__(self, col):
+        return _LegacyColumn(self, col)
+
+
+def placement_sequences(num_games, seed):
+    rng = random.Random(seed)
+    cells = [(col, row) for col in range(BOARD_WIDTH) for row in range(BOARD_HEIGHT)]
+    sequences = []
+    for _ in range(num_games):
+        order = cells[:]
+        rng.shuffle(order)
+        sequences.append(order[:70])
+    return sequences
+
+
+def place_all(sequence, ai):
+    """One placement = AI move choice over a one-tile hand, then place_tile."""
+    board = Board()
+    corporations = {name: Corporation(name) for name in CORPORATION_COLORS.keys()}
+    for tile in sequence:
+        ai.tiles_in_hand = [tile]
+        ai.decide_move(board, corporations)
+        board.place_tile(tile[0], tile[1], "bench", corporations)
+
+
+def lookup_cost(board, cells):
+    """Bytes and objects left allocated per neighbour lookup."""
+    kept = [None] * len(cells)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i, (col, row) in enumerate(cells):
+        kept[i] = board.get_neighbors(col, row)
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    objects = sum(1 + len(n) for n in kept if not isinstance(n, tuple))
+    return allocated / len(cells), objects / len(cells)
+
+
+def measure(label, sequences, lookups_per_placement):
+    ai = AIPlayer("bench")
+    placements = sum(len(s) for s in sequences)
+
+    start = time.perf_counter()
+    for sequence in sequences:
+        place_all(sequence, ai)
+    elapsed = time.perf_counter() - start
+
+    lookup_bytes, lookup_objects = lookup_cost(Board(), sequences[0])
+    print(f"{label:>8}: {elapsed / placements * 1e6:6.2f} us/placement, "
+          f"{lookup_objects * lookups_per_placement:5.1f} objects and "
+          f"{lookup_bytes * lookups_per_placement:6.1f} B allocated/placement "
+          f"by neighbour iteration")
+
+
+def main(num_games=500, seed=1234):
+    sequences = placement_sequences(num_games, seed)
+
+    # Count lookups per placement once, through the legacy stand-in.
+    table = board_module.NEIGHBORS
+    original = Board.get_neighbors
+    legacy = _LegacyTable()
+    board_module.NEIGHBORS = legacy
+    Board.get_neighbors = lambda self, col, row: legacy[col][row]
+    try:
+        place_all(sequences[0], AIPlayer("bench"))
+        lookups_per_placement = legacy.lookups / len(sequences[0])
+        measure("legacy", sequences, lookups_per_placement)
+    finally:
+        board_module.NEIGHBORS = table
+        Board.get_neighbors = original
+    measure("table", sequences, lookups_per_placement)
+
+
+if __name__ == "__main__":
+    main()
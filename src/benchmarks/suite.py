@@ -0,0 +1,343 @@
+"""
+Benchmark suite for the engine and renderer hot paths.
+
+Every benchmark runs over positions taken from seeded headless games, so
+two runs with the same --seeds time exactly the same work. Each case is
+set up untimed (the position restored, any move leading up to the call
+made) and only the call itself is timed, --repeat times. A benchmark's
+figure is the sum of each case's best time divided by the case count:
+the best times are the ones least disturbed by the rest of the machine,
+so they are what gets compared (medians are kept alongside).
+The renderer is timed under SDL's dummy video driver.
+
+Results go to a JSON file. --compare checks them against an earlier
+results file and exits non-zero if anything got slower by more than
+--threshold. Run from src/:
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --compare baseline.json
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from game.board import BLOCKED, DEAD, FOUND, INDEPENDENT, JOIN, MERGE
+from game.game_log import DISCARD_LOG
+from game.headless import MAX_TURNS, HeadlessGame
+from utils import helpers
+
+
+class Position:
+    """A turn of a seeded game: the game it came from and a snapshot to go back to it."""
+
+    def __init__(self, game, snapshot):
+        self.game = game
+        self.snapshot = snapshot
+
+    def restore(self):
+        self.game.logic.restore(self.snapshot)
+        return self.game
+
+    @property
+    def player(self):
+        return self.game.players[self.snapshot.turn[0]]
+
+    @property
+    def phase(self):
+        return self.snapshot.turn[1]
+
+
+def harvest(seeds):
+    """Positions at the start of every tile placement and stock purchase in seeded games."""
+    positions = []
+    for seed in seeds:
+        game = HeadlessGame(3, seed)
+        logic = game.logic
+        seen = set()
+        while logic.turn_phase != "end_game" and logic.turn_count < MAX_TURNS:
+            key = (logic.turn_count, logic.turn_phase)
+            if key in seen:
+                break  # Stuck (nobody can play); the headless runner would stop here too
+            seen.add(key)
+            if logic.turn_phase in ("tile_placement", "buy_stock"):
+                positions.append(Position(game, logic.snapshot()))
+            while (logic.turn_count, logic.turn_phase) == key:
+                logic.process_turn(DISCARD_LOG)
+                if logic.turn_phase == "tile_placement" and logic.turn_count == key[0]:
+                    break  # A tile that could not be placed; try the turn again
+    return positions
+
+
+def hand_plays(positions, *kinds):
+    """(position, play) for every tile in hand, at tile placement, of one of kinds."""
+    cases = []
+    for position in positions:
+        if position.phase != "tile_placement":
+            continue
+        game = position.restore()
+        plays = game.board.classify_hand(position.player.tiles_in_hand, game.corporations)
+        cases.extend((position, play) for play in plays if play.kind in kinds)
+    return cases
+
+
+# --- benchmarks -------------------------------------------------------------
+#
+# Each returns (cases, prepare, call): prepare(case) sets the case up and
+# returns the arguments for call, which is what gets timed.
+
+def _board_call(method):
+    """call for cases whose prepare returns (board method args...) with the board first."""
+    return lambda board, *args: getattr(board, method)(*args)
+
+
+def bench_place_tile(positions):
+    def prepare(case):
+        position, play = case
+        game = position.restore()
+        col, row = play.tile
+        return game.board, col, row, position.player.name, game.corporations
+
+    kinds = (INDEPENDENT, JOIN, FOUND, MERGE, BLOCKED, DEAD)
+    return hand_plays(positions, *kinds), prepare, _board_call("place_tile")
+
+
+def bench_found_chain(positions):
+    def prepare(case):
+        position, play = case
+        game = position.restore()
+        col, row = play.tile
+        game.board.place_tile(col, row, position.player.name, game.corporations, play)
+        chain = next(c.name for c in game.corporations.values() if c.size == 0)
+        return game.board, col, row, chain
+
+    return hand_plays(positions, FOUND), prepare, _board_call("found_chain")
+
+
+def bench_merge_chains(positions):
+    def prepare(case):
+        position, play = case
+        game = position.restore()
+        col, row = play.tile
+        return game.board, col, row, list(play.chains), game.corporations
+
+    return hand_plays(positions, MERGE), prepare, _board_call("merge_chains")
+
+
+def bench_absorb_independents(positions):
+    def prepare(case):
+        position, play = case
+        game = position.restore()
+        col, row = play.tile
+        chain = game.board.place_tile(col, row, position.player.name, game.corporations, play)
+        return game.board, col, row, chain
+
+    cases = [(position, play) for position, play in hand_plays(positions, JOIN)
+             if _touches_independent(position, play)]
+    return cases, prepare, helpers.absorb_independents
+
+
+def _touches_independent(position, play):
+    state = position.restore().board.state
+    col, row = play.tile
+    return any(state[nc][nr] is not None and state[nc][nr]["chain"] is None
+               for nc, nr in position.game.board.get_neighbors(col, row))
+
+
+def bench_decide_move(positions):
+    def prepare(position):
+        game = position.restore()
+        return position.player, game.board, game.corporations
+
+    cases = [p for p in positions if p.phase == "tile_placement"]
+    return cases, prepare, lambda player, *args: player.decide_move(*args)
+
+
+def bench_decide_stock_purchases(positions):
+    def prepare(position):
+        game = position.restore()
+        return position.player, game.corporations, position.player.money
+
+    cases = [p for p in positions if p.phase == "buy_stock"]
+    return cases, prepare, lambda player, *args: player.decide_stock_purchases(*args)
+
+
+def bench_merger_resolution(positions):
+    """A whole AI merger: the board merge, every defunct chain's bonuses, sales and trades."""
+    def prepare(case):
+        position, play = case
+        return position.restore().logic, play.tile
+
+    def call(logic, tile):
+        logic._initiate_merge(*tile, DISCARD_LOG)
+        logic._process_merger_resolution(DISCARD_LOG)
+
+    return hand_plays(positions, MERGE), prepare, call
+
+
+def bench_game(seeds):
+    """One whole headless game per case."""
+    def prepare(seed):
+        return (HeadlessGame(3, seed),)
+
+    return list(seeds), prepare, lambda game: game.run()
+
+
+_ui = []
+
+
+def _ui_game():
+    """The one windowed Game the renderer benchmarks share (SDL allows one window)."""
+    if not _ui:
+        from main import Game
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            _ui.append(Game())
+    return _ui[0]
+
+
+def bench_draw(positions, full):
+    """BoardRenderer.draw for each turn of the first game, redrawing all of it if full."""
+    ui = _ui_game()
+    first = positions[0].game
+    cases = [p for p in positions if p.game is first and p.phase == "tile_placement"]
+
+    def prepare(position):
+        ui.logic.restore(position.snapshot)
+        if full:
+            ui.renderer.invalidate()
+        return ()
+
+    return cases, prepare, ui.renderer.draw
+
+
+# --- runner -----------------------------------------------------------------
+
+def measure(cases, prepare, call, repeat):
+    """
+    Total seconds for every case, taking each case's best and median time
+    over repeat runs. Per-case bests filter out the interruptions a
+    busy machine puts into any one run of a few microseconds.
+    """
+    times = [[] for _ in cases]
+    clock = time.perf_counter
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            for case, case_times in zip(cases, times):
+                args = prepare(case)
+                start = clock()
+                call(*args)
+                case_times.append(clock() - start)
+        finally:
+            gc.enable()
+    return (sum(statistics.median(t) for t in times),
+            sum(min(t) for t in times))
+
+
+def benchmarks(positions, seeds):
+    return {
+        "board.place_tile": lambda: bench_place_tile(positions),
+        "board.found_chain": lambda: bench_found_chain(positions),
+        "board.merge_chains": lambda: bench_merge_chains(positions),
+        "helpers.absorb_independents": lambda: bench_absorb_independents(positions),
+        "ai.decide_move": lambda: bench_decide_move(positions),
+        "ai.decide_stock_purchases": lambda: bench_decide_stock_purchases(positions),
+        "logic.merger_resolution": lambda: bench_merger_resolution(positions),
+        "game.headless": lambda: bench_game(seeds),
+        "render.draw_turn": lambda: bench_draw(positions, full=False),
+        "render.draw_full": lambda: bench_draw(positions, full=True),
+    }
+
+
+def run(seeds, repeat, only=None):
+    positions = harvest(seeds)
+    results = {}
+    for name, build in benchmarks(positions, seeds).items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        cases, prepare, call = build()
+        median, best = measure(cases, prepare, call, repeat)
+        ops = max(len(cases), 1)
+        results[name] = {
+            "cases": len(cases),
+            "per_op_us": best / ops * 1e6,
+            "median_per_op_us": median / ops * 1e6,
+            "total_ms": best * 1000,
+        }
+        print(f"{name:<30}{len(cases):>7} cases {best / ops * 1e6:>12.2f} us/op "
+              f"(median {median / ops * 1e6:.2f})")
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "pygame": pygame.version.ver,
+            "seeds": list(seeds),
+            "repeat": repeat,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Print each benchmark against the baseline. Returns the names that regressed."""
+    regressions = []
+    print(f"\n{'benchmark':<30}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            print(f"{name:<30}{'-':>12}{result['per_op_us']:>12.2f}      new")
+            continue
+        change = result["per_op_us"] / old["per_op_us"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{name:<30}{old['per_op_us']:>12.2f}{result['per_op_us']:>12.2f}"
+              f"{change:>+9.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the engine and renderer hot paths.")
+    parser.add_argument("--seeds", type=int, default=8, help="seeded games to take positions from")
+    parser.add_argument("--repeat", type=int, default=7, help="runs of each benchmark")
+    parser.add_argument("--only", nargs="*", help="benchmark name prefixes to run")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="results JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="slowdown (as a fraction) counted as a regression")
+    args = parser.parse_args(argv)
+
+    current = run(range(args.seeds), args.repeat, args.only)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: "
+                  f"{', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
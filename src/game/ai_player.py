@@ -1,80 +1,67 @@
+from operator import itemgetter
+
+from game.board import OCCUPIED, BLOCKED, DEAD
 from game.player import Player
 from utils.constants import CORPORATION_COLORS
 
 class AIPlayer(Player):
+    __slots__ = ()
+
     def __init__(self, name):
         super().__init__(name, is_human=False)
 
-    def decide_move(self, board, corporations):
+    def decide_move(self, board, corporations, plays=None):
         """
         Basic AI logic for tile placement:
         1. Try to place the first playable tile in hand
         2. Prefer mergers > founding > expansion
-        3. Skip tiles that would illegally found a new chain
+        3. Skip tiles that would illegally found a new chain or merge safe chains
+        plays is board.classify_hand() of this hand, if the caller has it.
         """
-        for tile in self.tiles_in_hand:
-            col, row = tile
-            if not board.is_tile_empty(col, row):
-                continue
+        if plays is None:
+            plays = board.classify_hand(self.tiles_in_hand, corporations)
+        for play in plays:
+            if play.kind != OCCUPIED and play.kind != BLOCKED and play.kind != DEAD:
+                return play.tile  # First playable tile
 
-            # Simulate placement to check for blocked state
-            result = self._simulate_placement(col, row, board, corporations)
-            
-            if result == "blocked":
-                continue  # Skip this tile, can't place right now
-            else:
-                return tile  # Return first playable tile
-        
         # If all tiles are blocked, return None (handle dead tiles elsewhere)
         return None
-    
+
     def decide_stock_purchases(self, corporations, available_money):
         purchases = []
-        active_chains = [c for c in corporations.values() if c.size >= 2]
-        
-        # Prioritize chains by stock price growth potential
-        prioritized_chains = sorted(
-            active_chains,
-            key=lambda x: (
-                x.get_stock_price() * min(x.size / 10, 1),  # Value growth potential
-                -x.stocks_remaining  # Prefer chains with more available stocks
-            ),
-            reverse=True
-        )
+        max_purchases = min(3, available_money // 200)  # At least 200 per stock
+        if max_purchases <= 0:
+            return purchases
+        # Prioritize chains by stock price growth potential, reading each
+        # chain's price and size once
+        prioritized_chains = []
+        for chain in corporations.values():
+            size = chain.size
+            if size >= 2:
+                price = chain.get_stock_price()
+                priority = (
+                    price * min(size / 10, 1),  # Value growth potential
+                    -chain.stocks_remaining  # Prefer chains with more available stocks
+                )
+                prioritized_chains.append((priority, price, chain))
+        prioritized_chains.sort(key=itemgetter(0), reverse=True)
         
         remaining_money = available_money
-        max_purchases = min(3, available_money // 200)  # At least 200 per stock
         
-        for chain in prioritized_chains:
-            price = chain.get_stock_price()
+        for _, price, chain in prioritized_chains:
+            # Count locally; GameLogic takes the stock when the purchase is made.
+            stocks_left = chain.stocks_remaining
             while (remaining_money >= price and 
-                chain.stocks_remaining > 0 and 
+                stocks_left > 0 and 
                 len(purchases) < max_purchases):
                 purchases.append(chain.name)
                 remaining_money -= price
-                chain.stocks_remaining -= 1
-                if len(purchases) >= 3:
-                    break
+                stocks_left -= 1
+            if len(purchases) >= max_purchases:
+                break
         
         return purchases
 
-    def _simulate_placement(self, col, row, board, corporations):
-        """Helper to predict placement result without modifying state"""
-        neighbors = board.get_neighbors(col, row)
-        adjacent_chains = set()
-        adjacent_independents = []
-        
-        for (nc, nr) in neighbors:
-            cell = board.state[nc][nr]
-            if cell:
-                if cell["chain"]:
-                    adjacent_chains.add(cell["chain"])
-                else:
-                    adjacent_independents.append((nc, nr))
-
-        # Check for new chain founding validity
-        if len(adjacent_chains) == 0 and len(adjacent_independents) > 0:
-            if all(corp.size > 0 for corp in corporations.values()):
-                return "blocked"
-        
-        return "valid"  # Simplified check for demonstration
\ No newline at end of file
+    def choose_chain_to_found(self, available_chains):
+        """Pick which hotel chain to found from the available corporations."""
+        return available_chains[0]
@@ -0,0 +1,441 @@
+"""
+Lockstep batch simulator: advances K AI-only games at once with NumPy.
+
+All game state lives in arrays with a leading batch dimension, and one
+call to step() plays one turn in every unfinished game:
+
+    board             (K, 109) int8   -1 empty, 0 independent, 1..7 chain id
+                                      (column 108 is an always-empty pad cell)
+    corp_size         (K, 7)   int16  Corporation.size
+    stocks_remaining  (K, 7)   int16  Corporation.stocks_remaining
+    money             (K, P)   int64  Player.money
+    holdings          (K, P, 7) int16 Player.stocks
+    hands             (K, P, H) int16 Player.tiles_in_hand as cell indices, in
+                                      order and packed to the left, -1 empty
+
+Cells are indexed col * BOARD_HEIGHT + row and chains follow the order of
+CORPORATION_COLORS. Every seat plays the AIPlayer policy: the first tile in
+hand that is neither blocked nor dead, and up to three stocks in the chains
+AIPlayer prefers. A seat with no tile to play discards its dead tiles and
+draws replacements, then draws its tile for the turn anyway, as GameLogic
+does; so hands can grow past six, and H widens when one would overflow.
+Mergers pick the surviving chain and settle the defunct ones in
+GameLogic's order: merger stock is converted 2:1 where possible and the
+rest sold at half the defunct chain's pre-merger price.
+"""
+import numpy as np
+
+from game.board import NEIGHBORS
+from game.corporation import BONUS_TABLES, PRICE_TABLES
+from utils.constants import BOARD_WIDTH, BOARD_HEIGHT, CORPORATION_COLORS
+
+NUM_CELLS = BOARD_WIDTH * BOARD_HEIGHT
+PAD = NUM_CELLS  # Index of the always-empty cell used to pad lookups
+HAND_SIZE = 6  # Tiles dealt to each player
+CHAIN_NAMES = list(CORPORATION_COLORS.keys())
+NUM_CHAINS = len(CHAIN_NAMES)
+CHAIN_BITS = 1 << np.arange(NUM_CHAINS)
+# Number of set bits for every 7-bit chain mask.
+POPCOUNT = np.array([bin(mask).count("1") for mask in range(1 << NUM_CHAINS)])
+
+
+def _neighbor_array():
+    table = np.full((NUM_CELLS + 1, 4), PAD, dtype=np.int16)
+    for col in range(BOARD_WIDTH):
+        for row in range(BOARD_HEIGHT):
+            for i, (nc, nr) in enumerate(NEIGHBORS[col][row]):
+                table[col * BOARD_HEIGHT + row, i] = nc * BOARD_HEIGHT + nr
+    return table
+
+
+NEIGHBOR_INDEX = _neighbor_array()
+# (7, 109) price and bonus indexed by chain id and size
+PRICE_TABLE = np.array([PRICE_TABLES[name] for name in CHAIN_NAMES], dtype=np.int64)
+BONUS_TABLE = np.array([BONUS_TABLES[name] for name in CHAIN_NAMES], dtype=np.int64)
+
+
+class BatchResult:
+    """Final state of a finished batch."""
+
+    def __init__(self, money, turns, completed):
+        self.money = money          # (K, P) final cash after scoring
+        self.turns = turns          # (K,) turns played
+        self.completed = completed  # (K,) False if stopped by the turn cap or a stall
+        self.winners = money == money.max(axis=1, keepdims=True)  # (K, P), ties included
+
+    def win_rates(self):
+        """Share of games won per seat, splitting ties."""
+        return (self.winners / self.winners.sum(axis=1, keepdims=True)).mean(axis=0)
+
+
+class BatchSimulator:
+    def __init__(self, num_games, num_players=3, seed=None):
+        self.num_games = num_games
+        self.num_players = num_players
+        self.rng = np.random.default_rng(seed)
+        k = num_games
+
+        self.board = np.full((k, NUM_CELLS + 1), -1, dtype=np.int8)
+        self.corp_size = np.zeros((k, NUM_CHAINS), dtype=np.int16)
+        self.stocks_remaining = np.full((k, NUM_CHAINS), 25, dtype=np.int16)
+        self.money = np.full((k, num_players), 6000, dtype=np.int64)
+        self.holdings = np.zeros((k, num_players, NUM_CHAINS), dtype=np.int16)
+        self.current = np.zeros(k, dtype=np.int64)
+        self.turns = np.zeros(k, dtype=np.int64)
+        self.idle_turns = np.zeros(k, dtype=np.int64)
+        self.tiles_held = np.full(k, num_players * HAND_SIZE, dtype=np.int64)
+        self.done = np.zeros(k, dtype=bool)
+        self.completed = np.zeros(k, dtype=bool)
+        self.scored = False
+
+        # Each game's deck is its own permutation, drawn from with a cursor.
+        self.deck = self.rng.permuted(
+            np.tile(np.arange(NUM_CELLS, dtype=np.int16), (k, 1)), axis=1)
+        dealt = num_players * HAND_SIZE
+        self.hands = self.deck[:, :dealt].reshape(k, num_players, HAND_SIZE).copy()
+        self.cursor = np.full(k, dealt, dtype=np.int64)
+
+    @classmethod
+    def from_game_logic(cls, logic, num_games, seed=None):
+        """
+        Start num_games copies of a GameLogic position, each with its own
+        shuffle of the tiles that are not on the board or in a hand.
+        Intended for Monte Carlo rollouts from a live game.
+        """
+        sim = cls(num_games, len(logic.players), seed)
+        k = num_games
+
+        used = set()
+        for col in range(BOARD_WIDTH):
+            for row in range(BOARD_HEIGHT):
+                cell = logic.board.state[col][row]
+                if cell is None:
+                    continue
+                index = col * BOARD_HEIGHT + row
+                used.add(index)
+                label = 0 if cell["chain"] is None else CHAIN_NAMES.index(cell["chain"]) + 1
+                sim.board[:, index] = label
+
+        width = max([HAND_SIZE] + [len(player.hand) for player in logic.players])
+        sim.hands = np.full((k, sim.num_players, width), -1, dtype=np.int16)
+        for seat, player in enumerate(logic.players):
+            sim.money[:, seat] = player.money
+            for chain_id, name in enumerate(CHAIN_NAMES):
+                sim.holdings[:, seat, chain_id] = player.stocks.get(name, 0)
+            for slot, (col, row) in enumerate(player.tiles_in_hand):
+                sim.hands[:, seat, slot] = col * BOARD_HEIGHT + row
+                used.add(col * BOARD_HEIGHT + row)
+        sim.tiles_held[:] = (sim.hands >= 0).sum(axis=(1, 2))
+
+        for chain_id, name in enumerate(CHAIN_NAMES):
+            sim.stocks_remaining[:, chain_id] = logic.corporations[name].stocks_remaining
+        sim._update_sizes()
+
+        remaining = np.array([i for i in range(NUM_CELLS) if i not in used], dtype=np.int16)
+        left = min(len(remaining), logic.tile_deck.remaining())
+        sim.deck[:] = -1
+        if left:
+            sim.deck[:, NUM_CELLS - left:] = sim.rng.permuted(
+                np.tile(remaining, (k, 1)), axis=1)[:, :left]
+        sim.cursor[:] = NUM_CELLS - left
+        sim.current[:] = logic.current_turn_index
+        return sim
+
+    # --- helpers -------------------------------------------------------------
+
+    def _update_sizes(self):
+        # Count labels per game with one bincount over offset labels.
+        k = self.num_games
+        offset = self.board[:, :NUM_CELLS].astype(np.int64) + 1
+        offset += (NUM_CHAINS + 2) * np.arange(k)[:, None]
+        counts = np.bincount(offset.ravel(), minlength=k * (NUM_CHAINS + 2))
+        self.corp_size[:] = counts.reshape(k, NUM_CHAINS + 2)[:, 2:]
+
+    def _flood(self, seed_cells, allowed):
+        """
+        Grow a region from seed_cells (bool, (n, 109)) through the allowed
+        cells of the given games. Returns the (n, 109) region mask.
+        """
+        region = seed_cells & allowed
+        while True:
+            grown = (region | region[:, NEIGHBOR_INDEX].any(axis=2)) & allowed
+            grown[:, PAD] = False
+            if (grown == region).all():
+                return region
+            region = grown
+
+    def _absorb(self, games, tiles, labels):
+        """Label the placed tiles and every independent connected to them."""
+        n = len(games)
+        seed = np.zeros((n, NUM_CELLS + 1), dtype=bool)
+        seed[np.arange(n), tiles] = True
+        allowed = (self.board[games] == 0) | seed
+        region = self._flood(seed, allowed)
+        board = self.board[games]
+        self.board[games] = np.where(region, labels[:, None].astype(np.int8), board)
+
+    def _pay_bonuses(self, games, chain_ids, sizes):
+        """Majority/minority bonuses with the same tie rules as GameLogic."""
+        held = self.holdings[games, :, chain_ids]  # (n, P)
+        bonus = BONUS_TABLE[chain_ids, sizes]
+
+        top = held.max(axis=1)
+        majority = (held == top[:, None]) & (top > 0)[:, None]
+        num_majority = majority.sum(axis=1)
+
+        rest = np.where(majority, -1, held)
+        second = rest.max(axis=1)
+        minority = (rest == second[:, None]) & (second > 0)[:, None]
+        num_minority = np.maximum(minority.sum(axis=1), 1)
+
+        tied = num_majority > 1
+        split = bonus // np.maximum(num_majority, 1)
+        payout = np.where(
+            tied[:, None],
+            majority * split[:, None],
+            majority * bonus[:, None] + minority * ((bonus // 2) // num_minority)[:, None],
+        )
+        self.money[games] += payout
+
+    # --- turn phases ---------------------------------------------------------
+
+    def _place_tiles(self, active):
+        k = self.num_games
+        games = np.arange(k)
+        hand = self.hands[games, self.current]  # (K, H)
+        valid = hand >= 0
+        tiles = np.where(valid, hand, PAD)
+
+        empty = valid & (self.board[games[:, None], tiles] == -1)
+        around = self.board[games[:, None, None], NEIGHBOR_INDEX[tiles]]  # (K, H, 4)
+        # Bit 0 marks an independent neighbour, bits 1..7 the chains; empty
+        # neighbours (-1) shift to 0 and drop out.
+        label_bits = np.left_shift(1, around.astype(np.int64) + 1) >> 1
+        present = np.bitwise_or.reduce(label_bits, axis=2)                # (K, H)
+        chain_mask = present >> 1
+        num_chains = POPCOUNT[chain_mask]
+        has_independent = (present & 1).astype(bool)
+
+        can_found = (self.corp_size == 0).any(axis=1)
+        blocked = (num_chains == 0) & has_independent & ~can_found[:, None]
+        # Dead: would merge two or more safe chains (Board.classify_hand)
+        safe_mask = ((self.corp_size >= 11) * CHAIN_BITS).sum(axis=1)
+        dead = empty & (POPCOUNT[chain_mask & safe_mask[:, None]] >= 2)
+        playable = empty & ~blocked & ~dead
+
+        moved = playable.any(axis=1) & active
+        slot = playable.argmax(axis=1)
+        tile = hand[games, slot]
+        n_chains = num_chains[games, slot]
+        independent_next = has_independent[games, slot]
+        chains_next = (chain_mask[games, slot, None] & CHAIN_BITS) > 0  # (K, 7)
+
+        # Lone tile with no neighbours.
+        lone = moved & (n_chains == 0) & ~independent_next
+        self.board[lone, tile[lone]] = 0
+
+        # Only independents adjacent: found the first free chain, if any.
+        found = np.flatnonzero(moved & (n_chains == 0) & independent_next)
+        if len(found):
+            self.board[found, tile[found]] = 0
+            free = (self.corp_size[found] == 0) & (self.stocks_remaining[found] > 0)
+            founding = free.any(axis=1)
+            found = found[founding]
+            chain_ids = free[founding].argmax(axis=1)
+            self._absorb(found, tile[found], chain_ids + 1)
+            self.stocks_remaining[found, chain_ids] -= 1
+            self.holdings[found, self.current[found], chain_ids] += 1
+
+        # One chain adjacent: join it and absorb connected independents.
+        join = np.flatnonzero(moved & (n_chains == 1))
+        if len(join):
+            chain_ids = chains_next[join].argmax(axis=1)
+            self._absorb(join, tile[join], chain_ids + 1)
+
+        merge = np.flatnonzero(moved & (n_chains > 1))
+        if len(merge):
+            self._merge(merge, tile[merge])
+
+        self._update_sizes()
+        self._exchange_dead(np.flatnonzero(active & ~moved), dead)
+        return moved, slot
+
+    def _exchange_dead(self, games, dead):
+        """
+        Discard the dead tiles of the given games' current seats and draw
+        as many replacements, keeping the rest of the hand in order.
+        """
+        games = games[dead[games].any(axis=1)]
+        if not len(games):
+            return
+        seats = self.current[games]
+        hand = self.hands[games, seats]
+        keep = (hand >= 0) & ~dead[games]
+        hand = np.take_along_axis(hand, np.argsort(~keep, axis=1, kind="stable"), axis=1)
+
+        kept = keep.sum(axis=1)
+        drawn = np.minimum(dead[games].sum(axis=1), NUM_CELLS - self.cursor[games])
+        draw = np.arange(hand.shape[1]) - kept[:, None]  # Which replacement each slot gets
+        from_deck = (draw >= 0) & (draw < drawn[:, None])
+        cells = np.minimum(self.cursor[games, None] + draw, NUM_CELLS - 1)
+        fresh = self.deck[games[:, None], np.maximum(cells, 0)]
+        hand = np.where(from_deck, fresh, np.where(draw < 0, hand, -1))
+
+        self.hands[games, seats] = hand
+        self.cursor[games] += drawn
+
+    def _merge(self, games, tiles):
+        n = len(games)
+        # Where each chain first appears around the tile, in neighbour order
+        # (4 if it does not): GameLogic's order for ties and for settling.
+        around = self.board[games[:, None], NEIGHBOR_INDEX[tiles]].astype(np.int64)  # (n, 4)
+        is_chain = around[:, :, None] == np.arange(1, NUM_CHAINS + 1)           # (n, 4, 7)
+        first = np.where(is_chain.any(axis=1), is_chain.argmax(axis=1), 4)      # (n, 7)
+        adjacent = first < 4
+
+        sizes = self.corp_size[games].astype(np.int64)
+        prices = PRICE_TABLE[np.arange(NUM_CHAINS), sizes]
+        # Size first, stock price breaks ties, then the first chain met
+        rank = (sizes * 10000 + prices) * 8 + 4 - first
+        dominant = np.where(adjacent, rank, -1).argmax(axis=1)
+        losing = adjacent.copy()
+        losing[np.arange(n), dominant] = False
+        relabel = np.zeros((n, NUM_CHAINS + 2), dtype=bool)  # indexed by label + 1
+
+        # Defunct chains in neighbour order, one chain per pass.
+        while losing.any():
+            pending = losing.any(axis=1)
+            sub = games[pending]
+            rows = np.flatnonzero(pending)
+            loser = np.where(losing[rows], first[rows], 4).argmin(axis=1)
+            loser_size = sizes[rows, loser]
+            self._pay_bonuses(sub, loser, loser_size)
+
+            # Each shareholder, in seat order, trades 2:1 then sells the rest.
+            half_price = PRICE_TABLE[loser, loser_size] // 2
+            dom = dominant[rows]
+            for seat in range(self.num_players):
+                held = self.holdings[sub, seat, loser].astype(np.int64)
+                trade = np.minimum(held // 2, self.stocks_remaining[sub, dom])
+                self.holdings[sub, seat, dom] += trade
+                self.stocks_remaining[sub, dom] -= trade
+                sold = held - 2 * trade
+                self.money[sub, seat] += sold * half_price
+                self.holdings[sub, seat, loser] = 0
+                self.stocks_remaining[sub, loser] += held
+
+            relabel[rows, loser + 2] = True
+            losing[rows, loser] = False
+
+        board = self.board[games].astype(np.int64)
+        moved = np.take_along_axis(relabel, board + 1, axis=1)
+        self.board[games] = np.where(moved, (dominant + 1)[:, None], board).astype(np.int8)
+        self._absorb(games, tiles, dominant + 1)
+
+    def _buy_stocks(self, active):
+        games = np.flatnonzero(active)
+        seats = self.current[games]
+        sizes = self.corp_size[games].astype(np.int64)
+        prices = PRICE_TABLE[np.arange(NUM_CHAINS), sizes]
+        # AIPlayer's ordering: growth potential, then fewer remaining shares.
+        priority = prices * np.minimum(sizes, 10) - self.stocks_remaining[games]
+        money = self.money[games, seats]
+        max_purchases = np.minimum(3, money // 200)
+
+        for purchase in range(3):
+            can_buy = ((sizes >= 2) & (prices <= money[:, None])
+                       & (self.stocks_remaining[games] > 0)
+                       & (purchase < max_purchases)[:, None])
+            buying = can_buy.any(axis=1)
+            choice = np.where(can_buy, priority, np.iinfo(np.int64).min).argmax(axis=1)
+            rows = np.flatnonzero(buying)
+            chosen = choice[rows]
+            money[rows] -= prices[rows, chosen]
+            self.stocks_remaining[games[rows], chosen] -= 1
+            self.holdings[games[rows], seats[rows], chosen] += 1
+
+        self.money[games, seats] = money
+
+    def _draw_tiles(self, active, moved, slot):
+        """
+        Drop the played tile, if any, and append a new one, keeping hand
+        order. Every seat draws, whether or not it played a tile.
+        """
+        games = np.flatnonzero(active)
+        if not len(games):
+            return
+        seats = self.current[games]
+        hand = self.hands[games, seats]
+        width = hand.shape[1]
+        played = moved[games]
+        positions = np.arange(width)
+        shift = played[:, None] & (positions >= slot[games, None])
+        hand = np.take_along_axis(hand, np.minimum(positions + shift, width - 1), axis=1)
+        hand[played, -1] = -1
+
+        held = (hand >= 0).sum(axis=1)
+        has_tile = self.cursor[games] < NUM_CELLS
+        if (has_tile & (held == width)).any():
+            # A hand that has grown without playing needs another slot
+            self.hands = np.pad(self.hands, ((0, 0), (0, 0), (0, 1)), constant_values=-1)
+            hand = np.pad(hand, ((0, 0), (0, 1)), constant_values=-1)
+        rows = np.flatnonzero(has_tile)
+        hand[rows, held[rows]] = self.deck[games[rows], self.cursor[games[rows]]]
+        self.cursor[games] += has_tile
+        self.hands[games, seats] = hand
+
+    def _check_end(self, active, max_turns):
+        sizes = self.corp_size
+        live = sizes > 0
+        big = (sizes >= 41).any(axis=1)
+        all_safe = live.any(axis=1) & ((sizes >= 11) | ~live).all(axis=1)
+        finished = active & (big | all_safe)
+
+        # Stalled like the headless runner: a full round with the deck empty
+        # and no change in the number of tiles held
+        held = (self.hands >= 0).sum(axis=(1, 2))
+        idle = (self.cursor >= NUM_CELLS) & (held == self.tiles_held)
+        self.idle_turns = np.where(active, np.where(idle, self.idle_turns + 1, 0), self.idle_turns)
+        self.tiles_held = np.where(active, held, self.tiles_held)
+        stalled = active & (self.idle_turns >= self.num_players)
+        capped = active & (self.turns >= max_turns)
+
+        # The headless runner counts a game ending on the capped turn as cut short
+        self.completed |= finished & ~capped
+        self.done |= finished | stalled | capped
+
+    # --- public API ----------------------------------------------------------
+
+    def step(self, max_turns=500):
+        """Play one turn in every unfinished game."""
+        active = ~self.done
+        moved, slot = self._place_tiles(active)
+        self._buy_stocks(active)
+        self._draw_tiles(active, moved, slot)
+        self.turns += active
+        self._check_end(active, max_turns)
+        self.current = np.where(active, (self.current + 1) % self.num_players, self.current)
+
+    def final_scoring(self):
+        """Pay bonuses for every active chain and sell all stock at market price."""
+        if self.scored:
+            return
+        self.scored = True
+        for chain_id in range(NUM_CHAINS):
+            sizes = self.corp_size[:, chain_id].astype(np.int64)
+            live = np.flatnonzero(sizes >= 2)
+            if not len(live):
+                continue
+            chain_ids = np.full(len(live), chain_id)
+            self._pay_bonuses(live, chain_ids, sizes[live])
+            price = PRICE_TABLE[chain_id, sizes]
+            self.money += self.holdings[:, :, chain_id] * price[:, None]
+            self.stocks_remaining[:, chain_id] += self.holdings[:, :, chain_id].sum(axis=1)
+            self.holdings[:, :, chain_id] = 0
+
+    def run(self, max_turns=500):
+        """Step until every game has ended, then score. Returns a BatchResult."""
+        while not self.done.all():
+            self.step(max_turns)
+        self.final_scoring()
+        return BatchResult(self.money.copy(), self.turns.copy(), self.completed.copy())
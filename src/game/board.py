@@ -1,103 +1,228 @@
 # src/board.py
+from collections import namedtuple
+from functools import lru_cache
+from game.chain_components import ChainComponents, rollback
+from game.zobrist import CELL_KEYS, LABELS
 from utils.constants import BOARD_WIDTH, BOARD_HEIGHT
 
+@lru_cache(maxsize=None)
+def build_neighbor_table(width, height):
+    """
+    Orthogonal neighbours of every cell, as table[col][row] -> tuple of
+    (col, row). Built once per board geometry and shared, so looking up
+    neighbours never allocates.
+    """
+    table = []
+    for col in range(width):
+        column = []
+        for row in range(height):
+            neighbors = []
+            if col > 0:
+                neighbors.append((col-1, row))
+            if col < width - 1:
+                neighbors.append((col+1, row))
+            if row > 0:
+                neighbors.append((col, row-1))
+            if row < height - 1:
+                neighbors.append((col, row+1))
+            column.append(tuple(neighbors))
+        table.append(tuple(column))
+    return tuple(table)
+
+NEIGHBORS = build_neighbor_table(BOARD_WIDTH, BOARD_HEIGHT)
+
+# What playing a tile would do, as reported by Board.classify_hand
+OCCUPIED = "occupied"        # Already on the board
+INDEPENDENT = "independent"  # Touches nothing
+JOIN = "join"                # Grows the one adjacent chain
+FOUND = "found"              # Touches only independents: founds a chain
+MERGE = "merge"              # Touches two or more chains
+BLOCKED = "blocked"          # Would found a chain, but every chain is active
+DEAD = "dead"                # Would merge two or more safe chains; never playable
+
+# tile is (col, row); chains are the chains adjacent to it.
+TilePlay = namedtuple("TilePlay", "tile kind chains")
+
+
 class Board:
     def __init__(self):
         # Each cell will be None if empty, else a dict with keys: "owner" and "chain"
         self.state = [[None for _ in range(BOARD_HEIGHT)] for _ in range(BOARD_WIDTH)]
-    
+        # Connected groups of placed tiles, kept in step with state
+        self.components = ChainComponents()
+        # Zobrist hash of the placed tiles and their chains
+        self.hash = 0
+        # While recording, every change is logged here so undo() can revert it
+        self.journal = None
+        self._recorded_hash = 0
+
+    def snapshot(self):
+        """Compact, immutable copy of the board (see GameLogic.snapshot)."""
+        return self._snapshot_cells(), self.components.snapshot()
+
+    def restore(self, snapshot):
+        cells, components = snapshot
+        self._restore_cells(cells)
+        self.components.restore(components)
+
+    def start_recording(self):
+        """Log every change to the board from now on (see GameLogic.make_move)."""
+        self.journal = []
+        self.components.journal = self.journal
+        self._recorded_hash = self.hash
+
+    def stop_recording(self):
+        """Stop logging and return the changes, to pass to undo() later."""
+        journal, self.journal = self.journal, None
+        self.components.journal = None
+        return self._recorded_hash, journal
+
+    def undo(self, changes):
+        """Revert the changes returned by stop_recording()."""
+        self.hash, journal = changes
+        rollback(journal)
+
+    def _snapshot_cells(self):
+        return tuple(tuple(None if cell is None else (cell["owner"], cell["chain"])
+                           for cell in column)
+                     for column in self.state)
+
+    def _restore_cells(self, cells):
+        self.state = [[None if cell is None else {"owner": cell[0], "chain": cell[1]}
+                       for cell in column]
+                      for column in cells]
+        self.hash = 0
+        for col, column in enumerate(cells):
+            for row, cell in enumerate(column):
+                if cell is not None:
+                    self.hash ^= CELL_KEYS[col * BOARD_HEIGHT + row][LABELS[cell[1]]]
+
     def is_tile_empty(self, col, row):
         return self.state[col][row] is None
 
     def get_neighbors(self, col, row):
-        neighbors = []
-        if col > 0:
-            neighbors.append((col-1, row))
-        if col < BOARD_WIDTH - 1:
-            neighbors.append((col+1, row))
-        if row > 0:
-            neighbors.append((col, row-1))
-        if row < BOARD_HEIGHT - 1:
-            neighbors.append((col, row+1))
-        return neighbors
-
-    def place_tile(self, col, row, placer, corporations=None):
+        """Shared, read-only tuple of the cells next to (col, row)."""
+        return NEIGHBORS[col][row]
+
+    def classify_hand(self, tiles, corporations):
+        """
+        Work out what playing each tile would do, in one pass over the hand.
+        Returns a TilePlay per tile, in order. Any of them can be handed
+        back to place_tile() to skip its own neighbour scan.
+        """
+        state = self.state
+        all_active = None  # Worked out the first time a tile would found a chain
+        plays = []
+        for tile in tiles:
+            col, row = tile
+            if state[col][row] is not None:
+                plays.append(TilePlay(tile, OCCUPIED, ()))
+                continue
+
+            # Most tiles touch no chain, so this stays the shared empty tuple
+            chains = ()
+            touches_independent = False
+            for nc, nr in NEIGHBORS[col][row]:
+                cell = state[nc][nr]
+                if cell is not None:
+                    chain = cell["chain"]
+                    if chain is None:
+                        touches_independent = True
+                    elif chain not in chains:
+                        chains += (chain,)
+
+            if len(chains) > 1:
+                safe = 0
+                if corporations:
+                    safe = sum(1 for chain in chains if corporations[chain].is_safe())
+                kind = DEAD if safe >= 2 else MERGE
+            elif chains:
+                kind = JOIN
+            elif touches_independent:
+                if all_active is None:
+                    all_active = bool(corporations) and all(
+                        corp.size > 0 for corp in corporations.values())
+                kind = BLOCKED if all_active else FOUND
+            else:
+                kind = INDEPENDENT
+            plays.append(TilePlay(tile, kind, chains))
+        return plays
+
+    def place_tile(self, col, row, placer, corporations=None, play=None):
         """
         Place a tile at (col, row) and determine hotel chain affiliation.
+        play is this tile's TilePlay from classify_hand(), if already known.
         Returns:
-         - True if the tile is placed normally (joins or extends an existing chain).
+         - True if the tile is placed as an independent.
+         - The chain name if the tile joins the one chain next to it.
          - "new_chain" if the tile is adjacent only to independent buildings,
            signaling that a new hotel chain should be founded.
          - "merge" if the tile touches tiles from two or more chains,
-           signaling a merger.
+           signaling a merger. Nothing is placed.
+         - "blocked" if it would found a chain but none is left to found.
          - False if the tile is already occupied.
         """
-        if not self.is_tile_empty(col, row):
-            return False
-        
-        neighbors = self.get_neighbors(col, row)
-        adjacent_chains = set()
-        adjacent_independents = []
+        if play is None:
+            play = self.classify_hand(((col, row),), corporations)[0]
+        kind = play.kind
 
-        for (nc, nr) in neighbors:
-            cell = self.state[nc][nr]
-            if cell:
-                if cell["chain"] is not None:
-                    adjacent_chains.add(cell["chain"])
-                else:
-                    adjacent_independents.append((nc, nr))
-        
-        # Case 1: No adjacent placed tiles – independent placement.
-        if len(adjacent_chains) == 0 and len(adjacent_independents) == 0:
-            self.state[col][row] = {"owner": placer, "chain": None}
-            return True
+        if kind == OCCUPIED:
+            return False
+        if kind == MERGE or kind == DEAD:
+            return "merge"
+        if kind == BLOCKED:
+            return "blocked"
 
-        # Case 2: Exactly one chain adjacent: join that chain.
-        if len(adjacent_chains) == 1:
-            chain_name = adjacent_chains.pop()
-            self.state[col][row] = {"owner": placer, "chain": chain_name}
+        index = col * BOARD_HEIGHT + row
+        if kind == JOIN:
+            # Adjacent independents are picked up later by absorb_independents.
+            chain_name = play.chains[0]
+            self._add_tile(col, row, placer, chain_name)
+            self.components.union(index, self.components.chain_roots[chain_name], chain_name)
             return chain_name
 
-        # Case 3: Multiple chains adjacent: a merger.
-        if len(adjacent_chains) > 1:
-            # We'll signal a merger.
-            return "merge"
+        self._add_tile(col, row, placer, None)
+        if kind == INDEPENDENT:
+            return True
+        # Only independents next to it: join them up for found_chain
+        for nc, nr in NEIGHBORS[col][row]:
+            if self.state[nc][nr] is not None:
+                self.components.union(index, nc * BOARD_HEIGHT + nr, None)
+        return "new_chain"
 
-        # Case 4: Adjacent independents (and no chain) – new chain founding.
-        if len(adjacent_chains) == 0 and len(adjacent_independents) > 0:
-            if corporations and all(corp.size > 0 for corp in corporations.values()):
-                return "blocked"  # Can't found new chain
-            else:
-                self.state[col][row] = {"owner": placer, "chain": None}
-                return "new_chain"
+    def _add_tile(self, col, row, placer, chain_name):
+        if self.journal is not None:
+            self.journal.append((self.state[col], row, None))
+        self.state[col][row] = {"owner": placer, "chain": chain_name}
+        index = col * BOARD_HEIGHT + row
+        self.hash ^= CELL_KEYS[index][LABELS[chain_name]]
+        self.components.add(index, chain_name)
 
-        print(f"Placed at ({col}, {row}). Neighbors: {neighbors}")
+    def _relabel_component(self, index, chain_name):
+        """Set the chain of every tile in index's component. Returns its size."""
+        count = 0
+        journal = self.journal
+        new = LABELS[chain_name]
+        for member in self.components.members(index):
+            cell = self.state[member // BOARD_HEIGHT][member % BOARD_HEIGHT]
+            if journal is not None:
+                journal.append((cell, "chain", cell["chain"]))
+            keys = CELL_KEYS[member]
+            self.hash ^= keys[LABELS[cell["chain"]]] ^ keys[new]
+            cell["chain"] = chain_name
+            count += 1
+        self.components.relabel(index, chain_name)
+        return count
+
+    def chain_size(self, chain_name):
+        """Number of tiles currently in the named chain."""
+        return self.components.chain_size(chain_name)
 
     def found_chain(self, col, row, chain_name):
         """Convert ALL connected independents (including the placed tile) to this chain"""
-        stack = [(col, row)]
-        visited = set()
-        absorbed = 0
-
-        while stack:
-            c, r = stack.pop()
-            if (c, r) in visited or not (0 <= c < BOARD_WIDTH and 0 <= r < BOARD_HEIGHT):
-                continue
-            visited.add((c, r))
-
-            # Skip invalid or empty tiles
-            if not (0 <= c < BOARD_WIDTH and 0 <= r < BOARD_HEIGHT):
-                continue
-            if self.is_tile_empty(c, r):
-                continue
-
-            cell = self.state[c][r]
-            if cell and cell["chain"] is None:
-                cell["chain"] = chain_name
-                absorbed += 1
-                stack.extend(self.get_neighbors(c, r))  # Flood-fill
-
-        return absorbed
+        if self.is_tile_empty(col, row) or self.state[col][row]["chain"] is not None:
+            return 0
+        return self._relabel_component(col * BOARD_HEIGHT + row, chain_name)
 
     def merge_chains(self, col, row, adjacent_chains, corporations):
         # Determine dominant chain by size then stock price
@@ -113,18 +238,18 @@ class Board:
                 max_value = corp.current_value
 
         # Add the merger tile to the dominant chain
-        self.state[col][row] = {"owner": "Merged", "chain": dominant}
+        self._add_tile(col, row, "Merged", dominant)
 
         losing_chains = [c for c in adjacent_chains if c != dominant]
         absorbed_count = 1
 
-        # Update board state
-        for c in range(BOARD_WIDTH):
-            for r in range(BOARD_HEIGHT):
-                cell = self.state[c][r]
-                if cell and cell["chain"] in losing_chains:
-                    cell["chain"] = dominant
-                    absorbed_count += 1
+        # Relabel only the tiles of the losing chains, then join everything
+        index = col * BOARD_HEIGHT + row
+        roots = {chain: self.components.chain_roots[chain] for chain in adjacent_chains}
+        for chain, root in roots.items():
+            if chain != dominant:
+                absorbed_count += self._relabel_component(root, dominant)
+            self.components.union(index, root, dominant)
 
         return dominant, absorbed_count, losing_chains
 
@@ -132,10 +257,9 @@ class Board:
         if not self.is_tile_empty(col, row):
             return False
             
-        neighbors = self.get_neighbors(col, row)
         adjacent_chains = set()
         
-        for (nc, nr) in neighbors:
+        for (nc, nr) in NEIGHBORS[col][row]:
             cell = self.state[nc][nr]
             if cell and cell["chain"]:
                 corp = corporations[cell["chain"]]
@@ -146,20 +270,24 @@ class Board:
 
     def get_connected_independents(self, col, row):
         """Get all connected independent tiles"""
-        stack = [(col, row)]
-        visited = set()
-        connected = []
-        
-        while stack:
-            c, r = stack.pop()
-            if (c, r) in visited:
-                continue
-            visited.add((c, r))
-            
-            if self.is_tile_empty(c, r) or self.state[c][r]["chain"] is not None:
-                continue
-                
-            connected.append((c, r))
-            stack.extend(self.get_neighbors(c, r))
-        
-        return connected
\ No newline at end of file
+        if self.is_tile_empty(col, row) or self.state[col][row]["chain"] is not None:
+            return []
+        return [(index // BOARD_HEIGHT, index % BOARD_HEIGHT)
+                for index in self.components.members(col * BOARD_HEIGHT + row)]
+
+    def absorb_independents(self, col, row, chain_name):
+        """
+        Absorb every independent group touching the given position into
+        chain_name. Returns count of independents absorbed
+        """
+        index = col * BOARD_HEIGHT + row
+        absorbed_count = 0
+
+        for ncol, nrow in NEIGHBORS[col][row]:
+            cell = self.state[ncol][nrow]
+            # Check if neighbor exists and is independent
+            if cell and cell["chain"] is None:
+                absorbed_count += self._relabel_component(ncol * BOARD_HEIGHT + nrow, chain_name)
+                self.components.union(index, ncol * BOARD_HEIGHT + nrow, chain_name)
+
+        return absorbed_count
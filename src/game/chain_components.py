@@ -0,0 +1,145 @@
+from utils.constants import BOARD_WIDTH, BOARD_HEIGHT
+
+NUM_CELLS = BOARD_WIDTH * BOARD_HEIGHT
+
+# Old value for a journal entry whose key didn't exist before the change.
+MISSING = object()
+
+
+def rollback(journal):
+    """
+    Undo a journal of (container, key, old value) entries, newest first.
+    Containers are lists or dicts; MISSING removes a key that was added.
+    """
+    for container, key, old in reversed(journal):
+        if old is MISSING:
+            container.pop(key, None)
+        else:
+            container[key] = old
+
+
+class ChainComponents:
+    """
+    Disjoint-set forest over placed tiles. Each component is one connected
+    group of tiles sharing a label (a chain name, or None for independents).
+
+    Cells are indexed col * BOARD_HEIGHT + row. Alongside the usual parent
+    and size arrays, `next` links every component into a circular list so
+    its tiles can be walked without scanning the board, and joining two
+    lists is a constant-time splice.
+
+    Union by size keeps every tree within log2(108) levels, so find() does
+    no path compression: each change is then a handful of array writes,
+    which a journal (see Board.start_recording) can roll back exactly.
+    """
+
+    def __init__(self):
+        self.parent = [-1] * NUM_CELLS  # -1 while the cell is empty
+        self.size = [0] * NUM_CELLS
+        self.label = [None] * NUM_CELLS
+        self.next = list(range(NUM_CELLS))
+        self.chain_roots = {}  # chain name -> any cell of that chain
+        self.journal = None  # List of (container, key, old value) while recording
+
+    def add(self, index, label):
+        """
+        Start a new single-tile component. A labelled tile is expected to be
+        joined to its chain with union() straight away, so it is not
+        registered in chain_roots on its own.
+        """
+        if self.journal is not None:
+            self.journal.extend(((self.parent, index, self.parent[index]),
+                                 (self.size, index, self.size[index]),
+                                 (self.label, index, self.label[index]),
+                                 (self.next, index, self.next[index])))
+        self.parent[index] = index
+        self.size[index] = 1
+        self.label[index] = label
+        self.next[index] = index
+
+    def contains(self, index):
+        return self.parent[index] != -1
+
+    def find(self, index):
+        parent = self.parent
+        while parent[index] != index:
+            index = parent[index]
+        return index
+
+    def union(self, a, b, label):
+        """Join the components of a and b under label. Returns the new root."""
+        ra = self.find(a)
+        rb = self.find(b)
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        if self.journal is not None:
+            self._record_root(self.label[ra], self.label[rb], label)
+            self.journal.extend(((self.parent, rb, self.parent[rb]),
+                                 (self.size, ra, self.size[ra]),
+                                 (self.next, ra, self.next[ra]),
+                                 (self.next, rb, self.next[rb]),
+                                 (self.label, ra, self.label[ra])))
+        if ra != rb:
+            self.parent[rb] = ra
+            self.size[ra] += self.size[rb]
+            self.next[ra], self.next[rb] = self.next[rb], self.next[ra]
+        for name in (self.label[ra], self.label[rb]):
+            if name is not None and name != label:
+                self.chain_roots.pop(name, None)
+        self.label[ra] = label
+        if label is not None:
+            self.chain_roots[label] = ra
+        return ra
+
+    def relabel(self, index, label):
+        """Give the whole component containing index a new label."""
+        root = self.find(index)
+        old = self.label[root]
+        if self.journal is not None:
+            self._record_root(old, label)
+            self.journal.append((self.label, root, old))
+        if old is not None and old != label:
+            self.chain_roots.pop(old, None)
+        self.label[root] = label
+        if label is not None:
+            self.chain_roots[label] = root
+        return root
+
+    def _record_root(self, *names):
+        """Journal the chain_roots entries of the named chains."""
+        for name in names:
+            if name is not None:
+                self.journal.append((self.chain_roots, name, self.chain_roots.get(name, MISSING)))
+
+    def members(self, index):
+        """Yield every cell index in the component containing index."""
+        start = index
+        yield index
+        index = self.next[index]
+        while index != start:
+            yield index
+            index = self.next[index]
+
+    def snapshot(self):
+        return (tuple(self.parent), tuple(self.size), tuple(self.label),
+                tuple(self.next), tuple(self.chain_roots.items()))
+
+    def restore(self, snapshot):
+        parent, size, label, next_cells, chain_roots = snapshot
+        self.parent = list(parent)
+        self.size = list(size)
+        self.label = list(label)
+        self.next = list(next_cells)
+        self.chain_roots = dict(chain_roots)
+
+    def label_of(self, index):
+        return self.label[self.find(index)]
+
+    def component_size(self, index):
+        return self.size[self.find(index)]
+
+    def chain_size(self, chain_name):
+        index = self.chain_roots.get(chain_name)
+        if index is None:
+            return 0
+        return self.size[self.find(index)]
@@ -1,4 +1,6 @@
-from utils.constants import CORPORATION_COLORS
+from game.shareholders import ShareholderIndex
+from game.zobrist import POOL_KEYS
+from utils.constants import BOARD_WIDTH, BOARD_HEIGHT, CORPORATION_COLORS
 
 CHAIN_DATA = {
     "Worldwide": {
@@ -73,16 +75,40 @@ CHAIN_DATA = {
     }
 }
 
+_size_tables = {}
+
+
+def _size_table(brackets):
+    """
+    Value for every chain size from 0 to a full board, from a bracket list
+    of (min_size, value). Chains with the same brackets share one table.
+    """
+    key = tuple(brackets)
+    if key not in _size_tables:
+        table = [0] * (BOARD_WIDTH * BOARD_HEIGHT + 1)
+        for min_size, value in brackets:
+            table[min_size:] = [value] * (len(table) - min_size)
+        _size_tables[key] = tuple(table)
+    return _size_tables[key]
+
+
+# Stock price and majority bonus by chain name, indexed by size
+PRICE_TABLES = {name: _size_table(data["price"]) for name, data in CHAIN_DATA.items()}
+BONUS_TABLES = {name: _size_table(data["bonus"]) for name, data in CHAIN_DATA.items()}
+
+
 class Corporation:
     def __init__(self, name, initial_stocks=25):
         self.name = name
+        self.hash = 0  # Zobrist key of the stock pool, kept by the setter below
         self.stocks_remaining = initial_stocks
-        self.size = 0  # Number of tiles in the chain
-        self.current_value = 0  # Stock price, updated based on size
-        self._size = 0
+        self._size = 0  # Number of tiles in the chain
+        self._prices = PRICE_TABLES[name]
+        self._bonuses = BONUS_TABLES[name]
         self.headquarters_placed = False
         self.hq_position = None
-        self.current_bonus = 0
+        # Who holds how much of this chain, by seat (see GameLogic)
+        self.shareholders = ShareholderIndex()
 
     @property
     def color(self):
@@ -94,6 +120,15 @@ class Corporation:
         self.headquarters_placed = True
         self.hq_position = (col, row)
 
+    @property
+    def stocks_remaining(self):
+        return self._stocks_remaining
+
+    @stocks_remaining.setter
+    def stocks_remaining(self, value):
+        self._stocks_remaining = value
+        self.hash = POOL_KEYS[self.name][value]
+
     @property
     def size(self):
         return self._size
@@ -101,19 +136,21 @@ class Corporation:
     @size.setter
     def size(self, value):
         self._size = max(0, value)
-        self.update_value() # Auto-update value when size changes
-        self.update_bonus()
+
+    @property
+    def current_value(self):
+        """Stock price at the current size."""
+        return self._prices[self._size]
+
+    @property
+    def current_bonus(self):
+        """Majority bonus at the current size."""
+        return self._bonuses[self._size]
 
     def add_tile(self, count=1):
-        """Add one or more tiles to the hotel chain and update its value."""
+        """Add one or more tiles to the hotel chain."""
         self.size += count
     
-    def update_value(self):
-        self.current_value = self.get_stock_price()
-
-    def update_bonus(self):
-        self.current_bonus = self.get_majority_bonus()
-    
     def remove_stocks(self, quantity):
         """
         Remove stocks from the corporation when players buy them.
@@ -130,7 +167,7 @@ class Corporation:
     
     def is_safe(self):
         """A hotel chain is 'safe' if it has 11 or more tiles."""
-        return self.size >= 11
+        return self._size >= 11
     
     def place_headquarters(self, col, row):
         if not self.headquarters_placed:
@@ -138,23 +175,25 @@ class Corporation:
             self.hq_position = (col, row)
 
     def get_stock_price(self):
-        if self.size < 2:
-            return 0
-        brackets = CHAIN_DATA[self.name]["price"]
-        for min_size, price in reversed(brackets):
-            if self.size >= min_size:
-                return price
-        return 0
+        return self._prices[self._size]
     
     def get_majority_bonus(self):
         """Returns majority bonus for a chain based on its tile size"""
-        if self.size < 2:
-            return 0
-        brackets = CHAIN_DATA[self.name]["bonus"]
-        for min_size, majority in reversed(brackets):
-            if self.size >= min_size:
-                return majority
-        return 0
+        return self._bonuses[self._size]
+
+    def price_at(self, size):
+        """Stock price the chain would have at the given size."""
+        return self._prices[size]
+
+    def bonus_at(self, size):
+        """Majority bonus the chain would pay at the given size."""
+        return self._bonuses[size]
+
+    def snapshot(self):
+        return (self.stocks_remaining, self.size, self.headquarters_placed, self.hq_position)
+
+    def restore(self, snapshot):
+        self.stocks_remaining, self.size, self.headquarters_placed, self.hq_position = snapshot
 
     def __str__(self):
         return (f"Corporation {self.name} | Size: {self.size} | Value: ${self.current_value} | "
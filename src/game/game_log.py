@@ -0,0 +1,90 @@
+"""
+The game log: a bounded ring buffer of log records.
+
+A record keeps the message template and its arguments (the structured
+event) and only formats the text the first time someone reads it, so
+simulations that never display their log never pay for formatting. Once
+the buffer is full the oldest records are dropped, which keeps memory
+flat over long games and sessions.
+"""
+from collections import deque
+
+
+class LogRecord:
+    __slots__ = ("seq", "template", "args", "_text")
+
+    def __init__(self, seq, template, args):
+        self.seq = seq  # Position in the whole log, counting dropped records
+        self.template = template
+        self.args = args
+        self._text = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = self.template.format(*self.args) if self.args else self.template
+        return self._text
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"LogRecord({self.seq}, {self.text!r})"
+
+
+class GameLog:
+    """
+    Log records, newest last, holding at most `capacity` of them.
+
+    add() records a template and arguments for str.format; append() takes a
+    finished message, so the log can stand in where a list of strings was
+    used. Indexing, slicing and iteration give message text.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.records = deque(maxlen=capacity)
+        self.total = 0  # Records ever added, so it changes with every add
+
+    def add(self, template, *args):
+        self.records.append(LogRecord(self.total, template, args))
+        self.total += 1
+
+    def append(self, message):
+        self.records.append(LogRecord(self.total, message, ()))
+        self.total += 1
+
+    def clear(self):
+        self.records.clear()
+
+    def window(self, count, back=0):
+        """The `count` records that end `back` records before the newest."""
+        records = self.records
+        stop = len(records) - back
+        start = max(0, stop - count)
+        return [records[i] for i in range(start, stop)]
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return (record.text for record in self.records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [record.text for record in list(self.records)[index]]
+        return self.records[index].text
+
+
+class _DiscardLog(GameLog):
+    """A log that keeps nothing, without building records to throw away."""
+
+    def add(self, template, *args):
+        pass
+
+    def append(self, message):
+        pass
+
+
+# For messages nobody reads, e.g. moves played out during a search
+DISCARD_LOG = _DiscardLog(capacity=0)
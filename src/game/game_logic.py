@@ -1,7 +1,82 @@
-from utils.helpers import *
+
+import copy
+
+from game.board import OCCUPIED, BLOCKED, DEAD
+from game.game_log import DISCARD_LOG
+from game.moves import BuyStocks, FoundChain, MergerChoice, PlaceTile
+from game.shareholders import ShareholderIndex
+from game.zobrist import MERGER_KEYS, PHASE_KEYS, SEAT_KEYS, seat_mix
+
+# Tile kinds (see Board.classify_hand) a PlaceTile move may not play
+UNPLAYABLE = (OCCUPIED, BLOCKED, DEAD)
+
+
+def bonus_payouts(shareholders, majority_bonus):
+    """
+    Shareholder bonuses for a chain from its ShareholderIndex, as (seat,
+    amount, kind) in the order they are paid. One majority holder takes
+    the majority bonus and the next largest holding(s) share the minority
+    bonus (half of it); a tie for the majority splits the majority bonus
+    and pays no minority.
+    """
+    majority = shareholders.majority()
+    if not majority:
+        return []
+    if len(majority) > 1:
+        split = majority_bonus // len(majority)
+        return [(seat, split, "split majority") for seat in majority]
+
+    payouts = [(majority[0], majority_bonus, "majority")]
+    minority = shareholders.minority()
+    if len(minority) > 1:
+        split = majority_bonus // 2 // len(minority)
+        payouts.extend((seat, split, "split minority") for seat in minority)
+    elif minority:
+        payouts.append((minority[0], majority_bonus // 2, "minority"))
+    return payouts
+
+
+class GameSnapshot:
+    """
+    Compact, immutable copy of a game position made by GameLogic.snapshot().
+    Holds only plain values (players are referred to by seat), so it can be
+    pickled for save games or sent to another process.
+    """
+    __slots__ = ("board", "corporations", "players", "tile_deck", "turn")
+
+    def __init__(self, board, corporations, players, tile_deck, turn):
+        self.board = board
+        self.corporations = corporations
+        self.players = players
+        self.tile_deck = tile_deck
+        self.turn = turn
+
+    def __getstate__(self):
+        return (self.board, self.corporations, self.players, self.tile_deck, self.turn)
+
+    def __setstate__(self, state):
+        self.board, self.corporations, self.players, self.tile_deck, self.turn = state
+
+
+class UndoRecord:
+    """
+    What GameLogic.make_move() changed, so unmake_move() can put it back:
+    the board's change journal, the prior turn state, the corporations and
+    players the move touched, and the tile it drew from the deck.
+    """
+    __slots__ = ("move", "turn", "board", "corporations", "players", "drawn")
+
+    def __init__(self, move, turn, board, corporations, players, drawn):
+        self.move = move
+        self.turn = turn
+        self.board = board
+        self.corporations = corporations
+        self.players = players
+        self.drawn = drawn
+
 
 class GameLogic:
-    def __init__(self, players, tile_deck, board, corporations):
+    def __init__(self, players, tile_deck, board, corporations, verbose=True):
         self.players = players
         self.tile_deck = tile_deck
         self.board = board
@@ -11,39 +86,339 @@ class GameLogic:
         self.turn_phases = ["tile_placement", "buy_stock", "draw_tile", "end_turn", "end_game"]
         self.stocks_to_buy = 3
         self.merger_state = None
+        # Tile waiting for a FoundChain move (the "chain_founding" phase)
+        self.founding_tile = None
+        self.turn_count = 0
+        self.final_scores = None
+        # Debug prints to the console. Headless simulations turn these off.
+        self.verbose = verbose
+        # GameRecordWriter to send moves and decisions to, if recording
+        self.recorder = None
+
+        # Fresh shareholder indexes (corporations may be copies sharing one)
+        # that the players keep up to date from here on
+        for corp in corporations.values():
+            corp.shareholders = ShareholderIndex()
+        for seat, player in enumerate(players):
+            player.bind_shareholders(seat, corporations)
+
+        # Search-based AIs need to see the whole game, not just the board.
+        for player in players:
+            if hasattr(player, "bind_game"):
+                player.bind_game(self)
 
     def get_current_player(self):
         return self.players[self.current_turn_index]
 
+    def snapshot(self):
+        """Copy the current position into a GameSnapshot."""
+        merger = None
+        if self.merger_state:
+            merger = dict(self.merger_state)
+            merger['losing_chains'] = tuple(merger['losing_chains'])
+            merger['players_to_process'] = tuple(
+                self.players.index(p) for p in merger['players_to_process'])
+            merger = tuple(merger.items())
+        final = None
+        if self.final_scores is not None:
+            final = tuple(self.players.index(p) for p in self.final_scores)
+
+        return GameSnapshot(
+            self.board.snapshot(),
+            tuple(corp.snapshot() for corp in self.corporations.values()),
+            tuple(player.snapshot() for player in self.players),
+            self.tile_deck.snapshot(),
+            (self.current_turn_index, self.turn_phase, self.stocks_to_buy,
+             self.turn_count, merger, final, self.founding_tile),
+        )
+
+    def restore(self, snapshot):
+        """Put this game back to a position taken with snapshot()."""
+        self.board.restore(snapshot.board)
+        for corp, state in zip(self.corporations.values(), snapshot.corporations):
+            corp.restore(state)
+        for player, state in zip(self.players, snapshot.players):
+            player.restore(state)
+        self.tile_deck.restore(snapshot.tile_deck)
+
+        (self.current_turn_index, self.turn_phase, self.stocks_to_buy,
+         self.turn_count, merger, final, self.founding_tile) = snapshot.turn
+        self.merger_state = None
+        if merger is not None:
+            self.merger_state = dict(merger)
+            self.merger_state['losing_chains'] = list(self.merger_state['losing_chains'])
+            self.merger_state['players_to_process'] = [
+                self.players[i] for i in self.merger_state['players_to_process']]
+        self.final_scores = None if final is None else [self.players[i] for i in final]
+
+    def clone(self, players=None):
+        """
+        Independent copy of this game. players, if given, takes over the
+        seats (e.g. rollout AIs in a search); otherwise every player is
+        shallow-copied so it keeps its class and settings.
+        """
+        if players is None:
+            players = [copy.copy(player) for player in self.players]
+        game = GameLogic(
+            players,
+            copy.copy(self.tile_deck),
+            type(self.board)(),
+            {name: copy.copy(corp) for name, corp in self.corporations.items()},
+            verbose=self.verbose,
+        )
+        game.restore(self.snapshot())
+        return game
+
+    # --- make/unmake moves ---------------------------------------------------
+    #
+    # A cheaper alternative to snapshot/restore for search: make_move()
+    # changes the game in place and returns an UndoRecord, unmake_move()
+    # reverts it exactly. Moves are undone in the reverse order they were
+    # made. A turn is PlaceTile, then FoundChain if the tile founds a chain
+    # or one MergerChoice per shareholder of each defunct chain, then
+    # BuyStocks, which also draws the replacement tile and ends the turn.
+
+    def legal_moves(self):
+        """Every move the player to act can make in the current phase."""
+        if self.turn_phase == "tile_placement":
+            player = self.get_current_player()
+            plays = self.board.classify_hand(player.tiles_in_hand, self.corporations)
+            moves = [PlaceTile(play.tile) for play in plays if play.kind not in UNPLAYABLE]
+            return moves or [PlaceTile(None)]
+
+        if self.turn_phase == "chain_founding":
+            return [FoundChain(corp.name) for corp in self.corporations.values()
+                    if corp.size == 0 and corp.stocks_remaining > 0]
+
+        if self.turn_phase == "merger_resolution" and self.merger_state:
+            state = self.merger_state
+            player = state['players_to_process'][state['current_player_idx']]
+            chain_name = state['losing_chains'][state['current_chain_idx']][0]
+            held = player.stocks[chain_name]
+            tradeable = min(held // 2, self.corporations[state['dominant']].stocks_remaining)
+            return [MergerChoice(sell, trade)
+                    for trade in range(0, tradeable * 2 + 1, 2)
+                    for sell in range(held - trade + 1)]
+
+        if self.turn_phase == "buy_stock":
+            player = self.get_current_player()
+            moves = [BuyStocks(())]
+            self._add_purchases(moves, (), player.money, self.stocks_to_buy)
+            return moves
+
+        return []
+
+    def _add_purchases(self, moves, bought, money, left):
+        """Append every BuyStocks extending bought, in chain order."""
+        if not left:
+            return
+        names = list(self.corporations)
+        start = names.index(bought[-1]) if bought else 0
+        for name in names[start:]:
+            corp = self.corporations[name]
+            price = corp.get_stock_price()
+            if corp.size < 2 or price > money or bought.count(name) >= corp.stocks_remaining:
+                continue
+            chains = bought + (name,)
+            moves.append(BuyStocks(chains))
+            self._add_purchases(moves, chains, money - price, left - 1)
+
+    def make_move(self, move):
+        """
+        Apply move for the player to act. Returns an UndoRecord for
+        unmake_move(), or None (changing nothing) if the move is illegal.
+        """
+        if isinstance(move, PlaceTile):
+            apply, phase = self._make_place_tile, "tile_placement"
+        elif isinstance(move, FoundChain):
+            apply, phase = self._make_found_chain, "chain_founding"
+        elif isinstance(move, MergerChoice):
+            apply, phase = self._make_merger_choice, "merger_resolution"
+        elif isinstance(move, BuyStocks):
+            apply, phase = self._make_buy_stocks, "buy_stock"
+        else:
+            return None
+        if self.turn_phase != phase:
+            return None
+
+        # A tile placement can pay merger bonuses to anyone; the other moves
+        # only change the player making them.
+        if isinstance(move, (PlaceTile, MergerChoice)):
+            seats = range(len(self.players))
+        else:
+            seats = (self.current_turn_index,)
+        record = UndoRecord(
+            move,
+            self._turn_state(),
+            None,
+            tuple(corp.snapshot() for corp in self.corporations.values()),
+            tuple((seat, self.players[seat].snapshot()) for seat in seats),
+            None,
+        )
+
+        self.board.start_recording()
+        try:
+            done = apply(move, record)
+        finally:
+            record.board = self.board.stop_recording()
+        if not done:
+            self.unmake_move(record)
+            return None
+        if self.recorder is not None:
+            self.recorder.move(move)
+        return record
+
+    def unmake_move(self, record):
+        """Revert the move that returned record."""
+        self.board.undo(record.board)
+        for corp, state in zip(self.corporations.values(), record.corporations):
+            corp.restore(state)
+        for seat, state in record.players:
+            self.players[seat].restore(state)
+        if record.drawn is not None:
+            self.tile_deck.undraw()
+        (self.current_turn_index, self.turn_phase, self.stocks_to_buy,
+         self.turn_count, merger, self.founding_tile) = record.turn
+        self.merger_state = None if merger is None else dict(merger)
+
+    def _turn_state(self):
+        merger = None if self.merger_state is None else dict(self.merger_state)
+        return (self.current_turn_index, self.turn_phase, self.stocks_to_buy,
+                self.turn_count, merger, self.founding_tile)
+
+    def _make_place_tile(self, move, record):
+        player = self.get_current_player()
+        if move.tile is None:
+            self.turn_phase = "buy_stock"
+            return True
+        if not player.has_tile(move.tile):
+            return False
+        play = self.board.classify_hand([move.tile], self.corporations)[0]
+        if play.kind in UNPLAYABLE:
+            return False
+
+        col, row = move.tile
+        result = self.board.place_tile(col, row, player.name, self.corporations, play)
+        player.remove_tile(move.tile)
+
+        if result == "new_chain":
+            if any(c.size == 0 and c.stocks_remaining > 0 for c in self.corporations.values()):
+                self.founding_tile = move.tile
+                self.turn_phase = "chain_founding"
+            else:
+                self.turn_phase = "buy_stock"  # Nothing left to found; stays independent
+        elif result == "merge":
+            self._initiate_merge(col, row, DISCARD_LOG, play.chains)
+            self._advance_merger(DISCARD_LOG, settle_ai=False)
+        elif isinstance(result, str):
+            self.board.absorb_independents(col, row, result)
+            self.sync_chain_size(result)
+            self.turn_phase = "buy_stock"
+        else:
+            self.turn_phase = "buy_stock"
+        return True
+
+    def _make_found_chain(self, move, record):
+        corp = self.corporations.get(move.chain)
+        if corp is None or corp.size > 0 or corp.stocks_remaining <= 0:
+            return False
+
+        col, row = self.founding_tile
+        self.board.found_chain(col, row, corp.name)
+        self.sync_chain_size(corp.name)
+        corp.place_headquarters(col, row)
+        corp.stocks_remaining -= 1
+        self.get_current_player().add_stocks(corp.name, 1)
+
+        self.founding_tile = None
+        self.turn_phase = "buy_stock"
+        return True
+
+    def _make_merger_choice(self, move, record):
+        state = self.merger_state
+        player = state['players_to_process'][state['current_player_idx']]
+        chain_name = state['losing_chains'][state['current_chain_idx']][0]
+        dominant = self.corporations[state['dominant']]
+
+        sell, trade = move
+        if (sell < 0 or trade < 0 or trade % 2
+                or sell + trade > player.stocks[chain_name]
+                or trade // 2 > dominant.stocks_remaining):
+            return False
+
+        self._apply_merger_choice(player, move, DISCARD_LOG)
+        state['current_player_idx'] += 1
+        self._advance_merger(DISCARD_LOG, settle_ai=False)
+        return True
+
+    def _make_buy_stocks(self, move, record):
+        player = self.get_current_player()
+        if len(move.chains) > self.stocks_to_buy:
+            return False
+        for chain_name in move.chains:
+            corp = self.corporations.get(chain_name)
+            if (corp is None or corp.size < 2 or corp.stocks_remaining <= 0
+                    or player.money < corp.get_stock_price()):
+                return False
+            player.buy_stock(chain_name, 1, corp.get_stock_price())
+            corp.stocks_remaining -= 1
+
+        record.drawn = self.tile_deck.draw_tile()
+        if record.drawn:
+            player.add_tile(record.drawn)
+
+        self.turn_count += 1
+        if self.check_end_game():
+            self.turn_phase = "end_game"
+        else:
+            self.current_turn_index = (self.current_turn_index + 1) % len(self.players)
+            self.stocks_to_buy = 3
+            self.turn_phase = "tile_placement"
+        return True
+
+    def position_hash(self):
+        """
+        64-bit Zobrist hash of the position: board, stock pools, every
+        player's holdings and cash, whose turn it is and the phase. The parts
+        are kept up to date as the game changes, so this is a few XORs.
+        """
+        key = self.board.hash ^ SEAT_KEYS[self.current_turn_index] ^ PHASE_KEYS[self.turn_phase]
+        for corp in self.corporations.values():
+            key ^= corp.hash
+        for seat, player in enumerate(self.players):
+            key ^= seat_mix(player.hash, seat)
+        if self.merger_state:
+            key ^= MERGER_KEYS[self.merger_state['current_chain_idx']][
+                self.merger_state['current_player_idx']]
+        return key
+
+    def sync_chain_size(self, chain_name):
+        """Set a corporation's size from its tiles on the board."""
+        self.corporations[chain_name].size = self.board.chain_size(chain_name)
+
     def process_turn(self, log_messages):
         current_player = self.get_current_player()
 
         if self.merger_state:
-            # Always show UI if ANY human has stocks in ANY dissolving chain
-            all_losing_chains = [chain for chain, _ in self.merger_state['losing_chains']]
-            human_players = [p for p in self.players if p.is_human]
-            
-            if any(p.stocks.get(chain, 0) > 0 
-            for p in human_players 
-            for chain in all_losing_chains):
-                return  # Force UI rendering in main.py
-            else:
-                # Auto-resolve for AI-only mergers
-                while self.merger_state:
-                    self._process_merger_resolution(log_messages)
-                return  # Exit to continue normal turn flow
-        
+            # Settles every AI shareholder; a human's choice comes from the UI
+            self._process_merger_resolution(log_messages)
+            return
+
         # Handle human tile placement (main.py will manage this)
         if current_player.is_human and self.turn_phase == "tile_placement":
             return  # Let main.py handle human input
 
         # AI PLAYER LOGIC
         if self.turn_phase == "tile_placement" and not current_player.is_human:
-            tile_coord = current_player.decide_move(self.board, self.corporations)
+            # Classify the hand once for the move, dead tiles and placement
+            plays = self.board.classify_hand(current_player.tiles_in_hand, self.corporations)
+            tile_coord = current_player.decide_move(self.board, self.corporations, plays)
+            if self.recorder is not None:
+                self.recorder.move(PlaceTile(tuple(tile_coord) if tile_coord else None))
             
             if not tile_coord:
                 # Handle dead tiles
-                dead_tiles = current_player.get_dead_tiles(self.board, self.corporations)
+                dead_tiles = current_player.get_dead_tiles(self.board, self.corporations, plays)
                 if dead_tiles:
                     for tile in dead_tiles:
                         current_player.remove_tile(tile)
@@ -51,18 +426,17 @@ class GameLogic:
                     new_tiles = self.tile_deck.draw_tiles(len(dead_tiles))
                     for t in new_tiles:
                         current_player.add_tile(t)
-                    log_messages.append(
-                        f"{current_player.name} discarded {len(dead_tiles)} dead tiles"
-                    )
+                    log_messages.add("{} discarded {} dead tiles", current_player.name, len(dead_tiles))
                 self.turn_phase = "buy_stock"
                 return
 
             col, row = tile_coord
-            result = self.board.place_tile(col, row, current_player.name, self.corporations)
+            play = next((p for p in plays if p.tile == tuple(tile_coord)), None)
+            result = self.board.place_tile(col, row, current_player.name, self.corporations, play)
 
             if result == "blocked":
-                log_messages.append(
-                    f"{current_player.name} skipped tile {col+1}{chr(65+row)} (no available chains)"
+                log_messages.add(
+                    "{} skipped tile {}{} (no available chains)", current_player.name, col+1, chr(65+row)
                 )
                 return  # Keep tile in hand
 
@@ -70,48 +444,51 @@ class GameLogic:
                 available_chains = [c for c in self.corporations.values() 
                                   if c.size == 0 and c.stocks_remaining > 0]
                 if available_chains:
-                    chosen_chain = available_chains[0]
-                    absorbed = self.board.found_chain(col, row, chosen_chain.name)
-                    chosen_chain.size = absorbed
+                    chosen_chain = current_player.choose_chain_to_found(available_chains)
+                    if self.recorder is not None:
+                        self.recorder.move(FoundChain(chosen_chain.name))
+                    self.board.found_chain(col, row, chosen_chain.name)
+                    self.sync_chain_size(chosen_chain.name)
                     chosen_chain.place_headquarters(col, row)
 
                     # Deduct founder stock
                     chosen_chain.stocks_remaining -= 1
-                    current_player.stocks[chosen_chain.name] += 1
+                    current_player.add_stocks(chosen_chain.name, 1)
 
                     current_player.remove_tile(tile_coord)
-                    log_messages.append(
-                        f"{current_player.name} founded {chosen_chain.name} "
-                        f"at {col+1}{chr(65+row)} (size: {chosen_chain.size})"
+                    log_messages.add(
+                        "{} founded {} at {}{} (size: {})",
+                        current_player.name, chosen_chain.name, col+1, chr(65+row), chosen_chain.size
                     )
                 self.turn_phase = "buy_stock"
 
             elif result == "merge":
-                self._initiate_merge(col, row, log_messages)
+                self._initiate_merge(col, row, log_messages, play and play.chains)
                 current_player.remove_tile(tile_coord)  # Remove the tile that initiated the merger
+                self._process_merger_resolution(log_messages)
                 
             elif isinstance(result, str):  # Joined existing chain
                 chain_name = result
                 # Absorb independents and update size
-                absorbed_count = absorb_independents(self.board, col, row, chain_name)
-                self.corporations[chain_name].size += 1 + absorbed_count
+                absorbed_count = self.board.absorb_independents(col, row, chain_name)
+                self.sync_chain_size(chain_name)
                 current_player.remove_tile(tile_coord)
-                log_messages.append(
-                    f"{current_player.name} expanded {chain_name} at {col+1}{chr(65+row)} "
-                    f"(+{absorbed_count} tiles)"
+                log_messages.add(
+                    "{} expanded {} at {}{} (+{} tiles)",
+                    current_player.name, chain_name, col+1, chr(65+row), absorbed_count
                 )
                 self.turn_phase = "buy_stock"
 
             elif result is True:  # Independent placement (no absorption)
                 current_player.remove_tile(tile_coord)
-                log_messages.append(
-                    f"{current_player.name} placed independent tile at {col+1}{chr(65+row)}"
+                log_messages.add(
+                    "{} placed independent tile at {}{}", current_player.name, col+1, chr(65+row)
                 )
                 self.turn_phase = "buy_stock"
 
             else:  # Invalid placement
-                log_messages.append(
-                    f"{current_player.name} failed to place tile at {col+1}{chr(65+row)}"
+                log_messages.add(
+                    "{} failed to place tile at {}{}", current_player.name, col+1, chr(65+row)
                 )
                 self.turn_phase = "tile_placement"
 
@@ -123,13 +500,16 @@ class GameLogic:
                 purchases = current_player.decide_stock_purchases(
                     self.corporations, current_player.money
                 )
+                if self.recorder is not None:
+                    self.recorder.move(BuyStocks(tuple(purchases[:3])))
                 for chain_name in purchases[:3]:  # Enforce max 3 purchases
                     corp = self.corporations[chain_name]
-                    if corp.stocks_remaining > 0 and current_player.money >= corp.get_stock_price():
-                        current_player.buy_stock(chain_name, 1, corp.get_stock_price())
+                    price = corp.get_stock_price()
+                    if corp.stocks_remaining > 0 and current_player.money >= price:
+                        current_player.buy_stock(chain_name, 1, price)
                         corp.stocks_remaining -= 1
                         self.stocks_to_buy -= 1
-                        log_messages.append(f"{current_player.name} bought 1 {chain_name} stock")
+                        log_messages.add("{} bought 1 {} stock", current_player.name, chain_name)
                         
                 # Force exit after processing
                 self.stocks_to_buy = 0
@@ -139,11 +519,13 @@ class GameLogic:
             new_tile = self.tile_deck.draw_tile()
             if new_tile:
                 current_player.add_tile(new_tile)
-                log_messages.append(f"{current_player.name} drew a tile")
+                log_messages.add("{} drew a tile", current_player.name)
             self.turn_phase = "end_turn"
 
         elif self.turn_phase == "end_turn":
-            print(current_player)
+            if self.verbose:
+                print(current_player)
+            self.turn_count += 1
             if self.check_end_game():
                 self.turn_phase = "end_game"
             else:
@@ -152,28 +534,35 @@ class GameLogic:
                 self.turn_phase = "tile_placement"
 
         elif self.turn_phase == "end_game":
-            self.final_scoring()
-
-    def _initiate_merge(self, col, row, log_messages):
-        current_player = self.get_current_player()
-        neighbors = self.board.get_neighbors(col, row)
-        adjacent_chains = {self.board.state[nc][nr]["chain"] for (nc, nr) in neighbors 
-                        if self.board.state[nc][nr] and self.board.state[nc][nr]["chain"]}
+            self.final_scoring(log_messages)
+
+    def _initiate_merge(self, col, row, log_messages, adjacent_chains=None):
+        """
+        Merge the chains around (col, row). adjacent_chains lists them in
+        neighbour order, as classify_hand() gives them, if already known.
+        """
+        if adjacent_chains is None:
+            neighbors = self.board.get_neighbors(col, row)
+            # In neighbour order, not a set, so ties go the same way in every process
+            adjacent_chains = list(dict.fromkeys(
+                self.board.state[nc][nr]["chain"] for (nc, nr) in neighbors
+                if self.board.state[nc][nr] and self.board.state[nc][nr]["chain"]))
 
         dominant, absorbed_count, losing_chains = self.board.merge_chains(
             col, row, adjacent_chains, self.corporations
         )
 
-        merged_absorption = absorb_independents(self.board, col, row, dominant)
-        self.corporations[dominant].size += absorbed_count + merged_absorption
+        self.board.absorb_independents(col, row, dominant)
+        self.sync_chain_size(dominant)
 
         # Store original sizes for bonus calculation
         chain_sizes = {}
         for chain in losing_chains:
             chain_sizes[chain] = self.corporations[chain].size
             # Don't reset size yet - we'll do this after bonuses are calculated
-        print(f"Merger initiated: {dominant} is dominant. {chain} is absorbed.")
-        log_messages.append(f"Merger initiated with {dominant} as dominant chain")
+        if self.verbose:
+            print(f"Merger initiated: {dominant} is dominant. {', '.join(losing_chains)} absorbed.")
+        log_messages.add("Merger initiated with {} as dominant chain", dominant)
         
         # Set merger state with critical information
         self.merger_state = {
@@ -188,193 +577,167 @@ class GameLogic:
         }
         
         self.turn_phase = "merger_resolution"
+        self._pay_merger_bonuses(log_messages)
 
     def _process_merger_resolution(self, log_messages):
-        if not self.merger_state:
-            return
-        
+        """
+        Settle the merger as far as it can go without a human: every AI
+        shareholder's choice is made here, in one call, and it stops at the
+        first human with stock to decide on (see handle_human_stock_choice).
+        """
+        if self.merger_state:
+            self._advance_merger(log_messages, settle_ai=True)
+
+    def _pay_merger_bonuses(self, log_messages):
+        """
+        Pay the shareholder bonuses of every defunct chain in the merger at
+        once, from each chain's pre-merger size. Trades only ever add stock
+        in the surviving chain, so no choice made later in the merger could
+        change who is owed what.
+        """
+        for chain_name, original_size in self.merger_state['losing_chains']:
+            chain = self.corporations[chain_name]
+            self._award_bonuses(chain_name, chain.bonus_at(original_size), log_messages)
+            self.sync_chain_size(chain_name)
+
+    def _advance_merger(self, log_messages, settle_ai):
+        """
+        Walk the merger's queue of (defunct chain, shareholder) decisions in
+        order, skipping players with no stock in the chain. With settle_ai,
+        AI players' choices are made on the spot (default_merger_choice);
+        it waits for anyone else, whose choice arrives as a MergerChoice
+        move or through handle_human_stock_choice. Ends the merger (to the
+        buying phase) once every defunct chain is settled.
+        """
         state = self.merger_state
-        current_player = state['players_to_process'][state['current_player_idx']]
-        
-        # Get current chain info
-        chain_name, original_size = state['losing_chains'][state['current_chain_idx']]
-        chain = self.corporations[chain_name]
-        dominant = self.corporations[state['dominant']]
-        
-        if state['phase'] == 'bonuses':
-            # Calculate bonuses using original pre-merger size
-            chain.size = original_size  # Temporary restore for bonus calculation
-            
-            shareholders = sorted(self.players, 
-                                key=lambda p: p.stocks[chain_name], 
-                                reverse=True)
-            
-            # Award bonuses
-            majority_shares = 0
-            minority_shares = 0
-            
-            if shareholders:
-                majority_shares = shareholders[0].stocks[chain_name]
-            
-            # Check for ties in majority
-            majority_holders = [p for p in shareholders if p.stocks[chain_name] == majority_shares and majority_shares > 0]
-            
-            if len(majority_holders) > 1:
-                # Split majority bonus among tied players
-                majority_bonus = chain.current_bonus
-                split_bonus = majority_bonus // len(majority_holders)
-                for player in majority_holders:
-                    player.money += split_bonus
-                    log_messages.append(f"{player.name} received ${split_bonus} split majority bonus")
-            elif majority_shares > 0:
-                # Normal majority/minority
-                majority_holder = shareholders[0]
-                majority_bonus = chain.current_bonus
-                majority_holder.money += majority_bonus
-                log_messages.append(f"{majority_holder.name} received ${majority_bonus} majority bonus")
-                
-                # Find minority holders (exclude majority holder)
-                remaining = [p for p in shareholders if p != majority_holder]
-                if remaining:
-                    minority_shares = remaining[0].stocks[chain_name]
-                    minority_holders = [p for p in remaining if p.stocks[chain_name] == minority_shares and minority_shares > 0]
-                    
-                    if minority_holders:
-                        minority_bonus = majority_bonus // 2
-                        if len(minority_holders) > 1:
-                            # Split minority bonus
-                            split_bonus = minority_bonus // len(minority_holders)
-                            for player in minority_holders:
-                                player.money += split_bonus
-                                log_messages.append(f"{player.name} received ${split_bonus} split minority bonus")
-                        else:
-                            minority_holders[0].money += minority_bonus
-                            log_messages.append(f"{minority_holders[0].name} received ${minority_bonus} minority bonus")
-            
-            # Permanently reset chain size now that bonuses are calculated
-            chain.size = 0
-            
-            # Move to stock conversion phase
-            state['phase'] = 'stock_conversion'
-            
-            # If the current player is human, let main.py handle it
-            if current_player.is_human:
+        players = state['players_to_process']
+        losing_chains = state['losing_chains']
+        while True:
+            chain_name = losing_chains[state['current_chain_idx']][0]
+            while state['current_player_idx'] < len(players):
+                player = players[state['current_player_idx']]
+                if player.stocks[chain_name]:
+                    if player.is_human or not settle_ai:
+                        return  # Wait for this shareholder's choice
+                    self._apply_merger_choice(player, self.default_merger_choice(), log_messages)
+                state['current_player_idx'] += 1
+
+            state['current_chain_idx'] += 1
+            state['current_player_idx'] = 0
+            if state['current_chain_idx'] >= len(losing_chains):
+                self.merger_state = None
+                self.turn_phase = "buy_stock"
+                log_messages.add("Merger completed. {} is now size {}",
+                                 state['dominant'], self.corporations[state['dominant']].size)
                 return
-            
-            # Otherwise, proceed with AI stock conversion
-            self._process_merger_resolution(log_messages)
-            
-        elif state['phase'] == 'stock_conversion':
-            if not current_player.is_human:
-                # AI stock conversion logic
-                absorbed_stocks = current_player.stocks.get(chain_name, 0)
-                
-                if absorbed_stocks > 0:
-                    # AI strategy: Convert 2:1 if possible, sell the rest
-                    if dominant.stocks_remaining > 0 and absorbed_stocks >= 2:
-                        converted = min(absorbed_stocks // 2, dominant.stocks_remaining)
-                        current_player.stocks[state['dominant']] += converted
-                        current_player.stocks[chain_name] -= converted * 2
-                        dominant.stocks_remaining -= converted
-                        chain.stocks_remaining += converted * 2
-                        
-                        log_messages.append(
-                            f"{current_player.name} converted {converted * 2} {chain_name} stocks to "
-                            f"{converted} {state['dominant']} stocks"
-                        )
-                    
-                    # Sell remaining stocks
-                    remaining = current_player.stocks.get(chain_name, 0)
-                    if remaining > 0:
-                        total = remaining * (chain.get_stock_price() // 2)
-                        current_player.money += total
-                        current_player.stocks[chain_name] = 0
-                        chain.stocks_remaining += remaining
-                        
-                        log_messages.append(
-                            f"{current_player.name} sold {remaining} {chain_name} stocks for ${total}"
-                        )
-                    print(current_player)  # Debugging: Print current player
-            
-            # Move to next player
-            state['current_player_idx'] += 1
-            
-            # Check if all players have processed this chain
-            if state['current_player_idx'] >= len(state['players_to_process']):
-                # Reset player index for the next chain
-                state['current_player_idx'] = 0
-                state['current_chain_idx'] += 1
-                
-                # Check if all chains have been processed
-                if state['current_chain_idx'] >= len(state['losing_chains']):
-                    # Merger resolution complete
-                    self.merger_state = None
-                    self.turn_phase = "buy_stock"
-                    log_messages.append(f"Merger completed. {state['dominant']} is now size {dominant.size}")
-                else:
-                    # Move to the next chain's bonuses phase
-                    state['phase'] = 'bonuses'
-            
-            # Continue processing if next is AI
-            if not current_player.is_human:
-                self._process_merger_resolution(log_messages)
+            state['phase'] = 'bonuses'
 
-        #chain.headquarters_placed = False
-        #chain.hq_position = None
+    def default_merger_choice(self):
+        """AIPlayer's choice for the shareholder to decide: trade 2:1 as far as it can, sell the rest."""
+        state = self.merger_state
+        player = state['players_to_process'][state['current_player_idx']]
+        held = player.stocks[state['losing_chains'][state['current_chain_idx']][0]]
+        dominant = self.corporations[state['dominant']]
+        trade = 2 * min(held // 2, dominant.stocks_remaining)
+        return MergerChoice(held - trade, trade)
 
-    def handle_human_stock_choice(self, convert):
-        if not self.merger_state:
-            return
-            
+    def _apply_merger_choice(self, player, choice, log_messages):
+        """Sell and trade player's stock in the defunct chain being settled, as choice says."""
         state = self.merger_state
         chain_name, original_size = state['losing_chains'][state['current_chain_idx']]
         chain = self.corporations[chain_name]
         dominant = self.corporations[state['dominant']]
-        player = self.get_current_player()
-        
-        absorbed_stocks = player.stocks.get(chain_name, 0)
-        if convert:
-            # Convert stocks 2:1 to dominant chain
-            converted = min(absorbed_stocks // 2, dominant.stocks_remaining)
-            player.stocks[state['dominant']] = player.stocks.get(state['dominant'], 0) + converted
-            player.stocks[chain_name] -= converted * 2
-            dominant.stocks_remaining -= converted
-            chain.stocks_remaining += converted * 2
-            
-            # Log the conversion
-            message = f"{player.name} converted {converted * 2} {chain_name} stocks to {converted} {state['dominant']} stocks"
-            print(message)  # Useful for debugging
-        else:
-            # Sell stocks for cash at half price
-            stock_price = chain.get_stock_price()
-            total = (absorbed_stocks * stock_price) // 2
+        sell, trade = choice
+
+        if trade:
+            player.remove_stocks(chain_name, trade)
+            player.add_stocks(state['dominant'], trade // 2)
+            chain.stocks_remaining += trade
+            dominant.stocks_remaining -= trade // 2
+            log_messages.add("{} converted {} {} stocks to {} {} stocks",
+                             player.name, trade, chain_name, trade // 2, state['dominant'])
+        if sell:
+            # Defunct stock sells at half the chain's pre-merger price
+            total = sell * (chain.price_at(original_size) // 2)
+            player.remove_stocks(chain_name, sell)
             player.money += total
-            player.stocks[chain_name] = 0
-            chain.stocks_remaining += absorbed_stocks
-            
-            # Log the sale
-            message = f"{player.name} sold {absorbed_stocks} {chain_name} stocks for ${total}"
-            print(message)  # Useful for debugging
-        
-        # Move to next chain or complete merger resolution
-        state['current_chain_idx'] += 1
-        if state['current_chain_idx'] >= len(state['losing_chains']):
-            self.merger_state = None
-            self.turn_phase = "buy_stock"
+            chain.stocks_remaining += sell
+            log_messages.add("{} sold {} {} stocks for ${}", player.name, sell, chain_name, total)
+        if self.verbose:
+            print(player)
+
+    def _award_bonuses(self, chain_name, majority_bonus, log_messages):
+        """Pay the majority/minority shareholder bonuses for a chain."""
+        shareholders = self.corporations[chain_name].shareholders
+        for seat, amount, kind in bonus_payouts(shareholders, majority_bonus):
+            player = self.players[seat]
+            player.money += amount
+            log_messages.add("{} received ${} {} bonus", player.name, amount, kind)
+
+    def handle_human_stock_choice(self, convert=False, keep=False, log_messages=DISCARD_LOG):
+        """
+        The human shareholder's answer in the merger dialog: convert trades
+        2:1 as far as possible (keeping any odd share), keep holds on to
+        everything, and otherwise all of it is sold. The merger then carries
+        on as far as it can.
+        """
+        state = self.merger_state
+        if not state:
+            return
+        player = state['players_to_process'][state['current_player_idx']]
+        held = player.stocks[state['losing_chains'][state['current_chain_idx']][0]]
+        if keep:
+            choice = MergerChoice(0, 0)
+        elif convert:
+            choice = MergerChoice(0, self.default_merger_choice().trade)
         else:
-            state['phase'] = 'bonuses'
+            choice = MergerChoice(held, 0)
+
+        self._apply_merger_choice(player, choice, log_messages)
+        state['current_player_idx'] += 1
+        state['phase'] = 'stock_conversion'
+        self._advance_merger(log_messages, settle_ai=True)
 
     def check_end_game(self):
+        # One pass: a chain of 41 ends the game, and so does every chain
+        # on the board being safe.
+        any_active = False
+        all_safe = True
         for corp in self.corporations.values():
-            if corp.size >= 41:
+            size = corp.size
+            if size >= 41:
                 return True
-        for _ in self.corporations.values():
-            if corp.size > 0 and not corp.is_safe():
-                return False
+            if size > 0:
+                any_active = True
+                if all_safe and not corp.is_safe():
+                    all_safe = False
+        return any_active and all_safe
+
+    def final_scoring(self, log_messages=None):
+        """
+        Pay out bonuses for every active chain and sell all stock at the
+        current price. Runs once; returns players sorted by final money.
+        """
+        if self.final_scores is not None:
+            return self.final_scores
+        if log_messages is None:
+            log_messages = DISCARD_LOG
 
-    def final_scoring(self):
-        #Create a dialog with final scores for each player.
-        print("game over")
+        for corp in self.corporations.values():
+            if corp.size < 2:
+                continue
+            self._award_bonuses(corp.name, corp.current_bonus, log_messages)
+            price = corp.get_stock_price()
+            for player in self.players:
+                held = player.stocks.get(corp.name, 0)
+                if held > 0:
+                    player.sell_stock(corp.name, held, price)
+                    corp.add_stocks(held)
+
+        self.final_scores = sorted(self.players, key=lambda p: p.money, reverse=True)
+        if self.verbose:
+            print("game over")
+        return self.final_scores
 
     def can_afford_stock(self, player, corp):
         return player.money >= corp.get_stock_price()
@@ -383,70 +746,24 @@ class GameLogic:
         col, row = founding_tile_pos
 
         # Remove the placed tile from hand
-        if founding_tile_pos in current_player.tiles_in_hand:
+        if current_player.has_tile(founding_tile_pos):
             current_player.remove_tile(founding_tile_pos)
 
         # Absorb all connected independents (including the placed tile)
-        absorbed_count = self.board.found_chain(col, row, chosen_chain.name)
-        chosen_chain.size = absorbed_count  # No +1 needed
+        self.board.found_chain(col, row, chosen_chain.name)
+        self.sync_chain_size(chosen_chain.name)
 
         # Set headquarters
         chosen_chain.place_headquarters(col, row)
 
         # Deduct stock for founder's bonus
         chosen_chain.stocks_remaining -= 1
-        current_player.stocks[chosen_chain.name] += 1
+        current_player.add_stocks(chosen_chain.name, 1)
 
-        msg = f"Founded {chosen_chain.name} at {col+1}{chr(65+row)}"
-        log_messages.append(msg)
+        log_messages.add("Founded {} at {}{}", chosen_chain.name, col+1, chr(65+row))
         
         # Cleanup
         self.founding_phase = False
         self.founding_tile_pos = None
         self.selected_tile_index = None
         self.logic.turn_phase = "buy_stock"
-    
-    def process_stock_conversion(self, convert=True):
-        """Process stock conversion choice"""
-        chain_name = self.merger_resolution_data['losing_chains'][
-            self.merger_resolution_data['current_chain_index']
-        ]
-        dominant = self.merger_resolution_data['dominant']
-        
-        player = self.players[0]  # Human player
-        stocks = player.stocks.get(chain_name, 0)
-        
-        if convert:
-            # Convert 2:1
-            converted = min(stocks // 2, self.corporations[dominant].stocks_remaining)
-            player.stocks[dominant] = player.stocks.get(dominant, 0) + converted
-            player.stocks[chain_name] = max(0, player.stocks.get(chain_name, 0) - converted * 2)
-            self.corporations[dominant].stocks_remaining -= converted
-            
-            # Log the conversion
-            self.log_messages.append(
-                f"{player.name} converted {converted * 2} {chain_name} stocks "
-                f"to {converted} {dominant} stocks"
-            )
-        else:
-            # Sell for half price
-            sell_price = self.corporations[chain_name].get_stock_price() // 2
-            total = stocks * sell_price
-            player.money += total
-            player.stocks[chain_name] = 0
-            
-            # Log the sale
-            self.log_messages.append(
-                f"{player.name} sold {stocks} {chain_name} stocks for ${total}"
-            )
-        
-        # Move to next chain or complete
-        self.merger_resolution_data['current_chain_index'] += 1
-        if self.merger_resolution_data['current_chain_index'] >= len(
-            self.merger_resolution_data['losing_chains']):
-            # Merger complete
-            del self.merger_resolution_data
-            self.merger_phase = None
-        else:
-            # Show next chain's bonuses
-            self.merger_phase = "show_bonuses"
\ No newline at end of file
@@ -0,0 +1,234 @@
+"""
+Compact binary records of played games.
+
+A record holds what it takes to play a game again: the seed (which fixes
+the deck and so every hand), the class of AI in each seat, the hash of
+the final position, and the moves. Everything is a varint, and most moves
+take a single byte:
+
+    0..107     PlaceTile(tile) with tile = col * BOARD_HEIGHT + row
+    108        PlaceTile(None)
+    109..115   FoundChain, by chain index
+    116 s t    MergerChoice(sell=s, trade=t)
+    117+n ...  BuyStocks of n chains (n <= 3), then n chain indices
+
+A file is the magic bytes and a version, then one record after another,
+each prefixed with its length.
+
+How the moves are meant depends on how the game was driven. Games run
+through GameLogic.make_move() (the MOVES driver, e.g. HeadlessGame with
+driver=MOVES) record every move made, merger choices included.
+Games run through process_turn() (the TURNS driver) record what the
+players decided: the tile from decide_move(), the chain from
+choose_chain_to_found() and the purchases from decide_stock_purchases().
+Their merger sales and trades follow from GameLogic's fixed policy, so
+these records contain no MergerChoice moves. Input from human players in
+the GUI skips GameLogic and is not recorded.
+"""
+from game.moves import BuyStocks, FoundChain, MergerChoice, PlaceTile
+from utils.constants import BOARD_HEIGHT, BOARD_WIDTH, CORPORATION_COLORS
+
+MAGIC = b"AQGR"
+# Raised whenever the format, or how GameLogic replays a record, changes
+VERSION = 2
+
+# How a recorded game was driven (see above)
+TURNS = 0
+MOVES = 1
+
+CHAINS = tuple(CORPORATION_COLORS)
+CHAIN_INDEX = {name: i for i, name in enumerate(CHAINS)}
+
+CELLS = BOARD_WIDTH * BOARD_HEIGHT
+PASS = CELLS
+FOUND = PASS + 1
+MERGER = FOUND + len(CHAINS)
+BUY = MERGER + 1
+
+
+def _put_varint(out, value):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(data, pos):
+    """Decode the varint at data[pos]. Returns (value, next position)."""
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class GameRecordWriter:
+    """
+    Streams game records to a binary file. Moves are packed into a
+    bytearray as they are made; finished records collect in a buffer that
+    is written out once it holds buffer_size bytes, and on flush() or
+    close().
+
+    Usage: start_game(), then move() for every move (GameLogic does this
+    when its recorder is set), then end_game().
+    """
+
+    def __init__(self, file, buffer_size=1 << 16, write_header=True):
+        self.file = file
+        self.buffer_size = buffer_size
+        self.buffer = bytearray()
+        self.moves = None
+        self.header = None
+        self.games = 0
+        if write_header:
+            self.buffer += MAGIC
+            self.buffer.append(VERSION)
+
+    def start_game(self, seed, seats, driver=TURNS):
+        """Begin a record. seats are the class names of the players, in order."""
+        if seed is not None and (type(seed) is not int or seed < 0):
+            raise ValueError(f"only a non-negative int seed can be recorded, not {seed!r}")
+        header = bytearray()
+        _put_varint(header, 0 if seed is None else seed + 1)
+        header.append(driver)
+        _put_varint(header, len(seats))
+        for seat in seats:
+            name = seat.encode("ascii")
+            _put_varint(header, len(name))
+            header += name
+        self.header = header
+        self.moves = bytearray()
+
+    def move(self, move):
+        out = self.moves
+        if type(move) is PlaceTile:
+            tile = move.tile
+            out.append(PASS if tile is None else tile[0] * BOARD_HEIGHT + tile[1])
+        elif type(move) is BuyStocks:
+            out.append(BUY + len(move.chains))
+            for name in move.chains:
+                out.append(CHAIN_INDEX[name])
+        elif type(move) is FoundChain:
+            out.append(FOUND + CHAIN_INDEX[move.chain])
+        else:
+            out.append(MERGER)
+            _put_varint(out, move.sell)
+            _put_varint(out, move.trade)
+
+    def end_game(self, final_hash=0):
+        """Finish the record, with the final position's hash to check replays against."""
+        body = self.header
+        _put_varint(body, final_hash)
+        body += self.moves
+        _put_varint(self.buffer, len(body))
+        self.buffer += body
+        self.header = self.moves = None
+        self.games += 1
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def write_records(self, data):
+        """Add finished records, e.g. from a writer made with write_header=False."""
+        self.buffer += data
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer = bytearray()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class GameRecord:
+    """One recorded game. The moves are decoded on first use."""
+
+    def __init__(self, data):
+        self.data = data
+        seed, pos = _get_varint(data, 0)
+        self.seed = None if seed == 0 else seed - 1
+        self.driver = data[pos]
+        count, pos = _get_varint(data, pos + 1)
+        seats = []
+        for _ in range(count):
+            length, pos = _get_varint(data, pos)
+            seats.append(data[pos:pos + length].decode("ascii"))
+            pos += length
+        self.seats = tuple(seats)
+        self.final_hash, self._moves_at = _get_varint(data, pos)
+        self._moves = None
+
+    @property
+    def moves(self):
+        if self._moves is None:
+            self._moves = tuple(self.iter_moves())
+        return self._moves
+
+    def iter_moves(self):
+        data = self.data
+        pos = self._moves_at
+        end = len(data)
+        while pos < end:
+            code = data[pos]
+            pos += 1
+            if code < PASS:
+                yield PlaceTile(divmod(code, BOARD_HEIGHT))
+            elif code == PASS:
+                yield PlaceTile(None)
+            elif code < MERGER:
+                yield FoundChain(CHAINS[code - FOUND])
+            elif code == MERGER:
+                sell, pos = _get_varint(data, pos)
+                trade, pos = _get_varint(data, pos)
+                yield MergerChoice(sell, trade)
+            else:
+                count = code - BUY
+                yield BuyStocks(tuple(CHAINS[i] for i in data[pos:pos + count]))
+                pos += count
+
+    def __repr__(self):
+        return (f"GameRecord(seed={self.seed}, seats={self.seats}, "
+                f"{len(self.moves)} moves)")
+
+
+def _read_varint(file):
+    value = shift = 0
+    while True:
+        byte = file.read(1)
+        if not byte:
+            return None
+        value |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+
+def read_records(source):
+    """
+    Iterate the GameRecords in a file (a path or a binary file object),
+    reading one record at a time.
+    """
+    file = source if hasattr(source, "read") else open(source, "rb")
+    try:
+        if file.read(len(MAGIC) + 1) != MAGIC + bytes((VERSION,)):
+            raise ValueError(f"not a version {VERSION} game record file")
+        while True:
+            length = _read_varint(file)
+            if length is None:
+                return
+            yield GameRecord(file.read(length))
+    finally:
+        if file is not source:
+            file.close()
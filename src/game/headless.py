@@ -0,0 +1,155 @@
+from game.board import Board
+from game.tile_deck import TileDeck, derive_seed, rng_stream
+from game.corporation import Corporation
+from game.ai_player import AIPlayer
+from game.game_log import DISCARD_LOG
+from game.game_logic import GameLogic
+from game.game_record import MOVES, TURNS
+from game.mcts_player import MCTSPlayer
+from game.moves import BuyStocks, FoundChain, PlaceTile
+from utils.constants import CORPORATION_COLORS
+
+# Hard stop for games that stall (e.g. every remaining tile is blocked).
+MAX_TURNS = 500
+
+# AI classes selectable by name from the command line tools.
+AI_TYPES = {
+    "basic": AIPlayer,
+    "mcts": MCTSPlayer,
+}
+
+
+class GameResult:
+    """Outcome of one headless game."""
+
+    def __init__(self, seed, players, turns, completed):
+        self.seed = seed
+        self.turns = turns
+        # False if the game hit the turn cap or ran out of playable tiles
+        # before a chain reached 41 tiles or every chain became safe.
+        self.completed = completed
+        self.player_names = [p.name for p in players]
+        self.player_types = [type(p).__name__ for p in players]
+        self.final_cash = {p.name: p.money for p in players}
+        # Search throughput of any searching AIs, by player name.
+        self.search_rates = {p.name: p.iterations_per_second for p in players
+                             if hasattr(p, "iterations_per_second")}
+        best = max(self.final_cash.values())
+        self.winners = [name for name, cash in self.final_cash.items() if cash == best]
+
+    def __repr__(self):
+        return (f"GameResult(seed={self.seed}, turns={self.turns}, "
+                f"completed={self.completed}, winners={self.winners})")
+
+
+class HeadlessGame:
+    """
+    Plays a full AI-only game through GameLogic without pygame: no window,
+    no clock and no per-frame delay.
+
+    driver picks how the game is driven (see game/game_record.py): TURNS
+    runs GameLogic.process_turn, MOVES asks each player for its decisions
+    and makes them with GameLogic.make_move.
+
+    Nothing reads a simulated game's log, so it is discarded unless a
+    GameLog is passed as log_messages.
+    """
+
+    def __init__(self, num_players=3, seed=None, player_classes=None, max_turns=MAX_TURNS,
+                 recorder=None, driver=TURNS, log_messages=DISCARD_LOG):
+        self.seed = seed
+        self.max_turns = max_turns
+        # GameRecordWriter to record the game to, if any
+        self.recorder = recorder
+        self.driver = driver
+        # The game's own random stream, so games never share random state
+        self.rng = rng_stream(seed)
+
+        if player_classes is None:
+            player_classes = [AIPlayer] * num_players
+        self.players = [cls(f"AI Player {i + 1}") for i, cls in enumerate(player_classes)]
+        if seed is not None:
+            # Seats that search get their own stream, derived from the game's
+            for seat, player in enumerate(self.players):
+                if hasattr(player, "rng"):
+                    player.rng.seed(derive_seed(seed, "seat", seat))
+
+        self.board = Board()
+        self.tile_deck = TileDeck(self.rng)
+        for player in self.players:
+            for tile_coord in self.tile_deck.draw_tiles(6):
+                player.add_tile(tile_coord)
+
+        self.corporations = {name: Corporation(name) for name in CORPORATION_COLORS.keys()}
+        self.log_messages = log_messages
+        self.logic = GameLogic(self.players, self.tile_deck, self.board, self.corporations,
+                               verbose=False)
+
+    def run(self):
+        """Play until the game ends and return a GameResult."""
+        logic = self.logic
+        log_messages = self.log_messages
+        if self.recorder is not None:
+            self.recorder.start_game(self.seed, [type(p).__name__ for p in self.players],
+                                     self.driver)
+            logic.recorder = self.recorder
+        completed = True
+        stalled_turns = 0
+        last_turn = logic.turn_count
+        tiles_held = self._tiles_held()
+
+        while logic.turn_phase != "end_game":
+            if self.driver == MOVES:
+                self._make_next_move()
+            else:
+                logic.process_turn(log_messages)
+            if logic.turn_count == last_turn:
+                continue
+            last_turn = logic.turn_count
+
+            if logic.turn_count >= self.max_turns:
+                completed = False
+                break
+            # Once the deck is empty, a full round without anyone placing a
+            # tile means nobody can play any more.
+            held = self._tiles_held()
+            if self.tile_deck.remaining() == 0 and held == tiles_held:
+                stalled_turns += 1
+                if stalled_turns >= len(self.players):
+                    completed = False
+                    break
+            else:
+                stalled_turns = 0
+            tiles_held = held
+
+        logic.final_scoring(log_messages)
+        if self.recorder is not None:
+            logic.recorder = None
+            self.recorder.end_game(logic.position_hash())
+        return GameResult(self.seed, self.players, logic.turn_count, completed)
+
+    def _make_next_move(self):
+        """Make the move the player to act decides on, or the first legal one if it can't be made."""
+        logic = self.logic
+        player = logic.get_current_player()
+        if logic.turn_phase == "merger_resolution":
+            move = logic.default_merger_choice()
+        elif logic.turn_phase == "chain_founding":
+            available = [logic.corporations[m.chain] for m in logic.legal_moves()]
+            move = FoundChain(player.choose_chain_to_found(available).name)
+        elif logic.turn_phase == "buy_stock":
+            purchases = player.decide_stock_purchases(logic.corporations, player.money)
+            move = BuyStocks(tuple(purchases[:3]))
+        else:
+            tile = player.decide_move(logic.board, logic.corporations)
+            move = PlaceTile(tuple(tile) if tile else None)
+        if logic.make_move(move) is None:
+            logic.make_move(logic.legal_moves()[0])
+
+    def _tiles_held(self):
+        return sum(len(p.hand) for p in self.players)
+
+
+def run_game(num_players=3, seed=None, player_classes=None):
+    """Convenience wrapper: play one headless game and return its result."""
+    return HeadlessGame(num_players, seed, player_classes).run()
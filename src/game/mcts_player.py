@@ -0,0 +1,253 @@
+import math
+import random
+import time
+
+from game.ai_player import AIPlayer
+from game.game_log import DISCARD_LOG
+from game.moves import BuyStocks, FoundChain, PlaceTile
+from game.transposition import TranspositionTable
+
+
+class _Node:
+    def __init__(self, parent=None, action=None, key=None):
+        self.parent = parent
+        self.action = action
+        self.key = key  # Position hash after action
+        self.children = []
+        self.untried = None  # Actions not expanded yet; filled on first visit
+        self.visits = 0
+        self.total = 0.0
+
+    def ucb_child(self, exploration):
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda c: c.total / c.visits
+                   + exploration * math.sqrt(log_visits / c.visits))
+
+    def most_visited(self):
+        return max(self.children, key=lambda c: c.visits) if self.children else None
+
+
+class MCTSPlayer(AIPlayer):
+    """
+    AI that searches its whole turn - tile, chain to found and stock
+    purchases - with Monte Carlo Tree Search.
+
+    Each iteration deals the unseen tiles (the deck and the other players'
+    hands) at random, walks the tree with UCB1 making moves with
+    GameLogic.make_move, expands one new move, then plays the game out with
+    AIPlayer for every seat. The reward is the player's final money
+    relative to the richest player.
+
+    Node statistics are also kept in a transposition table keyed by
+    position hash, so a position reached again - by another move order, or
+    in a later search - starts from the visits it already has.
+
+    The search stops at time_budget seconds or max_iterations, whichever
+    comes first (at least one must be given), and always has a best move
+    ready.
+    """
+
+    def __init__(self, name, time_budget=0.25, max_iterations=None,
+                 exploration=1.0, rollout_turns=None, seed=None, table_bits=16):
+        super().__init__(name)
+        if time_budget is None and max_iterations is None:
+            raise ValueError("MCTSPlayer needs a time_budget or max_iterations to end its search")
+        self.time_budget = time_budget
+        self.max_iterations = max_iterations
+        self.exploration = exploration
+        self.rollout_turns = rollout_turns  # None plays rollouts to the end
+        self.rng = random.Random(seed)
+        self.table = TranspositionTable(table_bits)
+        self.game = None
+
+        self.planned_chain = None
+        self.planned_purchases = None
+
+        # Search throughput, accumulated over every move.
+        self.total_iterations = 0
+        self.total_search_time = 0.0
+        self.last_search = None
+
+    def bind_game(self, game_logic):
+        self.game = game_logic
+
+    @property
+    def iterations_per_second(self):
+        if not self.total_search_time:
+            return 0.0
+        return self.total_iterations / self.total_search_time
+
+    # --- Player interface used by GameLogic --------------------------------
+
+    def decide_move(self, board, corporations, plays=None):
+        tile, self.planned_chain, self.planned_purchases = self.search()
+        return tile
+
+    def choose_chain_to_found(self, available_chains):
+        for chain in available_chains:
+            if chain.name == self.planned_chain:
+                return chain
+        return available_chains[0]
+
+    def decide_stock_purchases(self, corporations, available_money):
+        if self.planned_purchases is None:
+            return super().decide_stock_purchases(corporations, available_money)
+        purchases, self.planned_purchases = list(self.planned_purchases), None
+        return purchases
+
+    # --- search ------------------------------------------------------------
+
+    def search(self):
+        """Run MCTS from the current position. Returns (tile, chain, purchases)."""
+        seat = self.game.players.index(self)
+        # One rollout game per search, reset from a snapshot every iteration.
+        # Every seat is played by AIPlayer, humans included.
+        sim = self.game.clone([AIPlayer(p.name) for p in self.game.players])
+        sim.verbose = False
+        position = sim.snapshot()
+        root = _Node(key=sim.position_hash())
+        self.table.new_search()
+
+        start = time.perf_counter()
+        deadline = start + self.time_budget if self.time_budget is not None else None
+        iterations = 0
+
+        while True:
+            if self.max_iterations is not None and iterations >= self.max_iterations:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            self._iterate(root, sim, position, seat)
+            iterations += 1
+
+        elapsed = time.perf_counter() - start
+        self.total_iterations += iterations
+        self.total_search_time += elapsed
+        self.last_search = {
+            "iterations": iterations,
+            "seconds": elapsed,
+            "iterations_per_second": iterations / elapsed if elapsed else 0.0,
+        }
+
+        # Follow the most visited path; undecided moves fall back to AIPlayer,
+        # as does passing, so the real game plays its usual dead-tile rules.
+        tile = chain = purchases = None
+        node = root.most_visited()
+        while node is not None:
+            move = node.action
+            if isinstance(move, PlaceTile):
+                tile = move.tile
+            elif isinstance(move, FoundChain):
+                chain = move.chain
+            elif isinstance(move, BuyStocks):
+                purchases = move.chains
+            node = node.most_visited()
+        if tile is None:
+            tile = super().decide_move(self.game.board, self.game.corporations)
+        return tile, chain, purchases
+
+    def _iterate(self, root, sim, position, seat):
+        self._determinize(sim, position, seat)
+        me = sim.players[seat]
+        turn = sim.turn_count
+        node = root
+        path = [root]
+
+        # Tree policy: this player's own moves, up to the end of the turn.
+        while sim.turn_count == turn and sim.turn_phase != "end_game":
+            self._settle_merger(sim)
+            if node.untried is None:
+                node.untried = sim.legal_moves()
+            if node.untried:
+                move = node.untried.pop(self.rng.randrange(len(node.untried)))
+                sim.make_move(move)
+                node = self._expand(node, move, sim)
+                path.append(node)
+                break  # Rest of the turn follows the default policy
+            if not node.children:
+                break
+            node = node.ucb_child(self.exploration)
+            sim.make_move(node.action)
+            path.append(node)
+
+        self._finish_turn(sim, me, turn)
+        reward = self._rollout(sim, me)
+        for visited in path:
+            visited.visits += 1
+            visited.total += reward
+            self.table.store(visited.key, visited.visits, visited.total)
+
+    def _expand(self, parent, move, sim):
+        child = _Node(parent, move, sim.position_hash())
+        known = self.table.lookup(child.key)
+        if known is not None:
+            child.visits, child.total = known
+        parent.children.append(child)
+        return child
+
+    def _settle_merger(self, sim):
+        """Answer every pending merger choice the way AIPlayer does: trade 2:1, sell the rest."""
+        while sim.turn_phase == "merger_resolution" and sim.merger_state:
+            sim.make_move(sim.default_merger_choice())
+
+    def _finish_turn(self, sim, me, turn):
+        """Play the rest of the current turn with AIPlayer's choices."""
+        while sim.turn_count == turn and sim.turn_phase != "end_game":
+            self._settle_merger(sim)
+            if sim.turn_phase == "chain_founding":
+                sim.make_move(sim.legal_moves()[0])
+            elif sim.turn_phase == "buy_stock":
+                purchases = me.decide_stock_purchases(sim.corporations, me.money)
+                if sim.make_move(BuyStocks(tuple(purchases[:3]))) is None:
+                    sim.make_move(BuyStocks(()))
+            else:
+                break
+
+    def _rollout(self, sim, me):
+        """
+        Play the game out with AIPlayer, stopping where the headless runner
+        would: at its turn cap, or once the deck is empty and a full round
+        passes without the tiles held changing.
+        """
+        from game.headless import MAX_TURNS  # headless imports this module
+
+        limit = MAX_TURNS
+        if self.rollout_turns is not None:
+            limit = min(limit, sim.turn_count + self.rollout_turns)
+        stalled_turns = 0
+        last_turn = sim.turn_count
+        tiles_held = sum(len(p.hand) for p in sim.players)
+        while sim.turn_phase != "end_game" and sim.turn_count < limit:
+            sim.process_turn(DISCARD_LOG)
+            if sim.turn_count == last_turn:
+                continue
+            last_turn = sim.turn_count
+            held = sum(len(p.hand) for p in sim.players)
+            if sim.tile_deck.remaining() == 0 and held == tiles_held:
+                stalled_turns += 1
+                if stalled_turns >= len(sim.players):
+                    break
+            else:
+                stalled_turns = 0
+            tiles_held = held
+        sim.final_scoring(DISCARD_LOG)
+        best = max(p.money for p in sim.players)
+        return me.money / best if best > 0 else 0.0
+
+    def _determinize(self, sim, position, seat):
+        """
+        Reset the rollout game to the search position and deal the tiles
+        this player can't see (the deck and the other hands) at random.
+        """
+        sim.restore(position)
+        hidden = sim.tile_deck.remaining_tiles()
+        for i, player in enumerate(sim.players):
+            if i != seat:
+                hidden.extend(player.tiles_in_hand)
+        self.rng.shuffle(hidden)
+        for i, player in enumerate(sim.players):
+            if i != seat:
+                count = len(player.tiles_in_hand)
+                player.tiles_in_hand = hidden[:count]
+                del hidden[:count]
+        sim.tile_deck.set_tiles(hidden)
@@ -0,0 +1,21 @@
+"""
+Moves for GameLogic.make_move / unmake_move. Each is a small immutable
+tuple, so moves can be compared, hashed and stored in search trees.
+"""
+from collections import namedtuple
+
+# Play tile (col, row) from the current player's hand. tile=None passes
+# when no tile in hand can be played.
+PlaceTile = namedtuple("PlaceTile", "tile")
+
+# Name the chain founded by the tile just placed.
+FoundChain = namedtuple("FoundChain", "chain")
+
+# How the shareholder being asked disposes of the defunct chain's stock:
+# sell is sold at half price, trade is swapped 2:1 for dominant stock,
+# and whatever is left over is kept.
+MergerChoice = namedtuple("MergerChoice", "sell trade")
+
+# Buy one share of each listed chain (up to three), then draw a tile and
+# end the turn.
+BuyStocks = namedtuple("BuyStocks", "chains")
@@ -1,55 +1,206 @@
-from utils.constants import CORPORATION_COLORS
+from array import array
+
+from game.board import DEAD
+from game.tile_deck import TILES
+from game.zobrist import HOLDING_KEYS, MAX_SHARES, money_key
+from utils.constants import BOARD_HEIGHT, CORPORATION_COLORS
+
+# Chain id (the order of CORPORATION_COLORS) by name, and the reverse
+CHAIN_NAMES = tuple(CORPORATION_COLORS)
+CHAIN_IDS = {name: chain_id for chain_id, name in enumerate(CHAIN_NAMES)}
+_HOLDING_KEYS = [HOLDING_KEYS[name] for name in CHAIN_NAMES]
+
+
+class Holdings:
+    """
+    A player's shares: one count per chain in a 7-byte array indexed by
+    chain id, read like the {chain name: count} dict it replaces. Only
+    Player changes it, so the hash and shareholder indexes keep up, and it
+    keeps every count within 0..MAX_SHARES - 1.
+    """
+    __slots__ = ("counts",)
+
+    def __init__(self, counts=None):
+        self.counts = array("B", counts if counts is not None else bytes(len(CHAIN_NAMES)))
+
+    def __getitem__(self, chain):
+        return self.counts[CHAIN_IDS[chain]]
+
+    def get(self, chain, default=None):
+        chain_id = CHAIN_IDS.get(chain)
+        return default if chain_id is None else self.counts[chain_id]
+
+    def __contains__(self, chain):
+        return chain in CHAIN_IDS
+
+    def __iter__(self):
+        return iter(CHAIN_NAMES)
+
+    def __len__(self):
+        return len(CHAIN_NAMES)
+
+    def keys(self):
+        return CHAIN_NAMES
+
+    def values(self):
+        return self.counts.tolist()
+
+    def items(self):
+        return zip(CHAIN_NAMES, self.counts)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
 
 class Player:
+    # No per-instance dict: search clones players by the thousand
+    __slots__ = ("name", "is_human", "_money", "hash", "stocks", "hand", "seat", "shareholders")
+
     def __init__(self, name, is_human=True):
         self.name = name
         self.is_human = is_human
         # As per Acquire rules, each player starts with $6,000.
-        self.money = 6000
-        # List of tile IDs or actual Tile objects that the player holds.
-        self.tiles_in_hand = []
-        self.stocks = {chain: 0 for chain in CORPORATION_COLORS.keys()}
+        self._money = 6000
+        # Cell indices (col * BOARD_HEIGHT + row) of the tiles in hand, in the
+        # order they were drawn; tiles_in_hand gives them as (col, row).
+        self.hand = array("B")
+        # Change holdings through add_stocks/remove_stocks so hash keeps up.
+        self.stocks = Holdings()
+        self._rehash()
+        # Seat and each chain's ShareholderIndex (by chain id), once seated by GameLogic
+        self.seat = None
+        self.shareholders = None
+
+    def bind_shareholders(self, seat, corporations):
+        """Keep the corporations' shareholder indexes up to date with this player's holdings."""
+        self.seat = seat
+        self.shareholders = [corporations[name].shareholders for name in CHAIN_NAMES]
+        for index, count in zip(self.shareholders, self.stocks.counts):
+            index.set(seat, count)
+
+    def _rehash(self):
+        """Zobrist hash of this player's cash and holdings (see game.zobrist)."""
+        self.hash = money_key(self._money)
+        for keys, count in zip(_HOLDING_KEYS, self.stocks.counts):
+            self.hash ^= keys[count]
+
+    @property
+    def money(self):
+        return self._money
+
+    @money.setter
+    def money(self, value):
+        self.hash ^= money_key(self._money) ^ money_key(value)
+        self._money = value
 
     def get_money(self):
         return self.money
 
+    @property
+    def tiles_in_hand(self):
+        """
+        The hand as a new list of (col, row), in the order drawn. Change the
+        hand with add_tile/remove_tile, or by assigning a whole list.
+        """
+        return [TILES[cell] for cell in self.hand]
+
+    @tiles_in_hand.setter
+    def tiles_in_hand(self, tiles):
+        self.hand = array("B", [col * BOARD_HEIGHT + row for col, row in tiles])
+
+    def has_tile(self, tile):
+        col, row = tile
+        return col * BOARD_HEIGHT + row in self.hand
+
     def add_tile(self, tile):
         """Add a tile to the player's hand."""
-        self.tiles_in_hand.append(tuple(tile))
+        col, row = tile
+        self.hand.append(col * BOARD_HEIGHT + row)
 
     def remove_tile(self, tile):
         """Remove a tile from the player's hand."""
-        tile = tuple(tile)
-        if tile in self.tiles_in_hand:
-            self.tiles_in_hand.remove(tile)
+        col, row = tile
+        try:
+            self.hand.remove(col * BOARD_HEIGHT + row)
+        except ValueError:
+            pass
+
+    def add_stocks(self, chain, quantity):
+        """Give the player shares without paying for them (founding, trades)."""
+        chain_id = CHAIN_IDS[chain]
+        keys = _HOLDING_KEYS[chain_id]
+        counts = self.stocks.counts
+        held = counts[chain_id]
+        if not 0 <= held + quantity < MAX_SHARES:
+            raise ValueError(f"{self.name} holds {held} {chain} shares, "
+                             f"cannot change that by {quantity}")
+        counts[chain_id] = held + quantity
+        self.hash ^= keys[held] ^ keys[held + quantity]
+        if self.shareholders is not None:
+            self.shareholders[chain_id].set(self.seat, held + quantity)
+
+    def remove_stocks(self, chain, quantity):
+        """Take shares away from the player without paying for them."""
+        self.add_stocks(chain, -quantity)
 
     def buy_stock(self, chain, quantity, price_per_stock):
         """Attempt to buy a given quantity of stock in a hotel chain."""
+        if quantity < 0:
+            raise ValueError(f"cannot buy {quantity} {chain} shares")
         total_cost = quantity * price_per_stock
         if self.money >= total_cost:
+            self.add_stocks(chain, quantity)
             self.money -= total_cost
-            self.stocks[chain] = self.stocks.get(chain, 0) + quantity
             return True
         return False
 
     def sell_stock(self, chain, quantity, price_per_stock):
         """Sell a given quantity of stock, returning the money gained."""
+        if quantity < 0:
+            raise ValueError(f"cannot sell {quantity} {chain} shares")
         current_stocks = self.stocks.get(chain, 0)
         if current_stocks >= quantity:
-            self.stocks[chain] = current_stocks - quantity
+            self.remove_stocks(chain, quantity)
             self.money += quantity * price_per_stock
             return True
         return False
-    
-    def get_dead_tiles(self, board, corporations):
-        dead_tiles = []
-        for tile in self.tiles_in_hand:
-            col, row = tile
-            if board.would_cause_merger_of_safe_chains(col, row, corporations):
-                dead_tiles.append(tile)
-        return dead_tiles
-    
+
+    def get_dead_tiles(self, board, corporations, plays=None):
+        """Tiles in hand that can never be played (see Board.classify_hand)."""
+        if plays is None:
+            plays = board.classify_hand(self.tiles_in_hand, corporations)
+        return [play.tile for play in plays if play.kind == DEAD]
+
+    def snapshot(self):
+        return self.money, self.stocks.counts.tobytes(), self.hand.tobytes()
+
+    def restore(self, snapshot):
+        money, stocks, hand = snapshot
+        self._money = money
+        self.stocks = Holdings(stocks)
+        self.hand = array("B", hand)
+        self._rehash()
+        if self.shareholders is not None:
+            for index, count in zip(self.shareholders, self.stocks.counts):
+                index.set(self.seat, count)
+
+    def __copy__(self):
+        # Holdings and hand are copied, not shared, so the copy can play on
+        cls = type(self)
+        player = cls.__new__(cls)
+        player.name = self.name
+        player.is_human = self.is_human
+        player._money = self._money
+        player.hash = self.hash
+        player.stocks = Holdings(self.stocks.counts)
+        player.hand = array("B", self.hand)
+        player.seat = self.seat
+        # Not the original game's indexes: the copy's game binds its own
+        player.shareholders = None
+        if hasattr(self, "__dict__"):  # Subclasses with settings of their own
+            player.__dict__.update(self.__dict__)
+        return player
+
     def __str__(self):
         return(f"Player {self.name} | Money: ${self.money} | "
                f"Tiles in hand: {len(self.tiles_in_hand)} | Stocks: {self.stocks}")
-    
@@ -0,0 +1,152 @@
+"""
+Replays recorded games (see game/game_record.py).
+
+Replay rebuilds a game from its record's seed and plays the recorded
+moves back through GameLogic. On the way it keeps a snapshot every
+keyframe_interval turns, so seeking to any turn restores the nearest
+earlier keyframe and plays forward from there instead of from the start.
+"""
+from game.ai_player import AIPlayer
+from game.game_log import DISCARD_LOG
+from game.game_record import MOVES, read_records
+from game.headless import HeadlessGame
+from game.moves import BuyStocks, FoundChain, PlaceTile
+
+
+class _Script:
+    """A record's moves, with a cursor shared by the seats replaying them."""
+
+    def __init__(self, moves):
+        self.moves = moves
+        self.pos = 0
+
+    def next(self, kind):
+        if self.pos >= len(self.moves):
+            raise ValueError(f"record ended where the game needed a {kind.__name__}")
+        move = self.moves[self.pos]
+        if type(move) is not kind:
+            raise ValueError(f"record has {move} where the game needed a {kind.__name__}")
+        self.pos += 1
+        return move
+
+    def take(self):
+        """The next move, whatever it is."""
+        if self.pos >= len(self.moves):
+            raise ValueError("record ended in the middle of a turn")
+        move = self.moves[self.pos]
+        self.pos += 1
+        return move
+
+
+class ReplayPlayer(AIPlayer):
+    """Stands in for a recorded seat, making the decisions the record holds."""
+
+    def __init__(self, name, script):
+        super().__init__(name)
+        self.script = script
+
+    def decide_move(self, board, corporations, plays=None):
+        return self.script.next(PlaceTile).tile
+
+    def choose_chain_to_found(self, available_chains):
+        chain = self.script.next(FoundChain).chain
+        return next((c for c in available_chains if c.name == chain), available_chains[0])
+
+    def decide_stock_purchases(self, corporations, available_money):
+        return list(self.script.next(BuyStocks).chains)
+
+
+class Replay:
+    """
+    A recorded game that can be set to the start of any turn with seek().
+    `turn` is the turn the game is at; `turns` is how many the record holds.
+    """
+
+    def __init__(self, record, keyframe_interval=10):
+        if record.seed is None:
+            raise ValueError("only games played from a seed can be replayed")
+        self.record = record
+        self.keyframe_interval = keyframe_interval
+        self.script = _Script(record.moves)
+        self.turns = sum(type(move) is BuyStocks for move in record.moves)
+
+        game = HeadlessGame(
+            len(record.seats), record.seed,
+            [lambda name: ReplayPlayer(name, self.script)] * len(record.seats),
+        )
+        self.players = game.players
+        self.board = game.board
+        self.tile_deck = game.tile_deck
+        self.corporations = game.corporations
+        self.logic = game.logic
+
+        # Keyframe for every keyframe_interval-th turn reached so far:
+        # turn -> (position snapshot, script position)
+        self.keyframes = {}
+        self._keyframe()
+
+    @property
+    def turn(self):
+        return self.logic.turn_count
+
+    def seek(self, turn, log_messages=DISCARD_LOG):
+        """Set the game to the start of turn (clamped to the record). Returns the turn."""
+        turn = max(0, min(turn, self.turns))
+        # Play on from here, unless a keyframe is closer (or the turn is behind us)
+        start = max(t for t in self.keyframes if t <= turn)
+        if turn < self.turn or start > self.turn:
+            position, self.script.pos = self.keyframes[start]
+            self.logic.restore(position)
+        while self.turn < turn and self.logic.turn_phase != "end_game":
+            self._step(log_messages)
+            if self.turn % self.keyframe_interval == 0 and self.turn not in self.keyframes:
+                self._keyframe()
+        return self.turn
+
+    def final_hash(self):
+        """Position hash after the last recorded turn and final scoring."""
+        self.seek(self.turns)
+        position = self.logic.snapshot()
+        self.logic.final_scoring(DISCARD_LOG)
+        key = self.logic.position_hash()
+        self.logic.restore(position)
+        return key
+
+    def verify(self):
+        """True if replaying the record ends where the recorded game did."""
+        try:
+            return self.final_hash() == self.record.final_hash
+        except ValueError:
+            return False
+
+    def _step(self, log_messages):
+        """Play one turn from the record."""
+        turn = self.turn
+        if self.record.driver == MOVES:
+            while self.turn == turn and self.logic.turn_phase != "end_game":
+                move = self.script.take()
+                if self.logic.make_move(move) is None:
+                    raise ValueError(f"recorded move {move} is not legal here")
+        else:
+            while self.turn == turn and self.logic.turn_phase != "end_game":
+                self.logic.process_turn(log_messages)
+
+    def _keyframe(self):
+        self.keyframes[self.turn] = (self.logic.snapshot(), self.script.pos)
+
+
+def verify_records(source):
+    """
+    Replay every game in a record file headlessly. Returns (games checked,
+    list of (index, seed) for those that did not replay to their recorded
+    final position).
+    """
+    checked = 0
+    failed = []
+    for index, record in enumerate(read_records(source)):
+        checked += 1
+        # Nothing seeks backwards here, so one keyframe at the start is enough
+        replay = Replay(record, keyframe_interval=1 << 30)
+        if not replay.verify():
+            failed.append((index, record.seed))
+    return checked, failed
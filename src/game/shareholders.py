@@ -0,0 +1,85 @@
+"""
+Shareholder ranking for one hotel chain, kept up to date as holdings change.
+
+Seats are bucketed by how many shares they hold: levels[n] is a bitmask of
+the seats holding exactly n, and `occupied` has bit n set while anyone
+holds n (n > 0). The largest and second-largest holdings are then the top
+two bits of `occupied`, so every question about the ranking (majority,
+minority, ties, margins) is a few integer operations, and a change of
+holding only moves one seat between two buckets.
+"""
+from game.zobrist import MAX_SEATS, MAX_SHARES
+
+# Seats in every seat bitmask, in seat order
+SEATS = tuple(tuple(seat for seat in range(MAX_SEATS) if mask >> seat & 1)
+              for mask in range(1 << MAX_SEATS))
+
+
+class ShareholderIndex:
+    def __init__(self):
+        self.counts = [0] * MAX_SEATS
+        self.levels = [0] * MAX_SHARES
+        self.occupied = 0
+
+    def set(self, seat, count):
+        """Record that seat now holds count shares."""
+        old = self.counts[seat]
+        if old == count:
+            return
+        self.counts[seat] = count
+        bit = 1 << seat
+        levels = self.levels
+        if old:
+            levels[old] &= ~bit
+            if not levels[old]:
+                self.occupied &= ~(1 << old)
+        if count:
+            levels[count] |= bit
+            self.occupied |= 1 << count
+
+    def clear(self):
+        self.counts = [0] * MAX_SEATS
+        self.levels = [0] * MAX_SHARES
+        self.occupied = 0
+
+    def held(self, seat):
+        return self.counts[seat]
+
+    def majority_shares(self):
+        """Largest holding (0 if nobody holds any)."""
+        return max(self.occupied.bit_length() - 1, 0)
+
+    def minority_shares(self):
+        """Second-largest distinct holding (0 if there is none)."""
+        top = self.occupied.bit_length() - 1
+        if top <= 0:
+            return 0
+        return max((self.occupied ^ (1 << top)).bit_length() - 1, 0)
+
+    def majority(self):
+        """Seats with the largest holding, in seat order (none if nobody holds any)."""
+        return SEATS[self.levels[self.majority_shares()]] if self.occupied else ()
+
+    def minority(self):
+        """Seats with the second-largest distinct holding, in seat order."""
+        second = self.minority_shares()
+        return SEATS[self.levels[second]] if second else ()
+
+    def tied(self):
+        """True if two or more seats share the largest holding."""
+        mask = self.levels[self.majority_shares()] if self.occupied else 0
+        return mask & (mask - 1) != 0
+
+    def margin(self):
+        """How many shares the sole majority holder is ahead of the next rank (0 if tied)."""
+        if self.tied():
+            return 0
+        return self.majority_shares() - self.minority_shares()
+
+    def shares_to_lead(self, seat):
+        """Shares seat would need to add to hold the majority alone (0 if it already does)."""
+        top = self.majority_shares()
+        held = self.counts[seat]
+        if held == top and held and not self.tied():
+            return 0
+        return top - held + 1
@@ -0,0 +1,70 @@
+"""Tests for BatchSimulator against headless games. Run from src/ with pytest."""
+import pytest
+
+from game.batch_simulator import HAND_SIZE, BatchSimulator
+from game.game_log import DISCARD_LOG
+from game.headless import HeadlessGame
+from utils.constants import BOARD_HEIGHT
+
+
+def dealt_alike(games):
+    """A BatchSimulator dealt, and drawing, the same tiles as each HeadlessGame."""
+    seats = len(games[0].players)
+    sim = BatchSimulator(len(games), seats)
+    for g, game in enumerate(games):
+        hands = [tile for player in game.players for tile in player.tiles_in_hand]
+        # remaining_tiles() lists the next tile to be drawn last
+        order = hands + game.tile_deck.remaining_tiles()[::-1]
+        sim.deck[g] = [col * BOARD_HEIGHT + row for col, row in order]
+    sim.hands[:] = sim.deck[:, :seats * HAND_SIZE].reshape(len(games), seats, HAND_SIZE)
+    return sim
+
+
+@pytest.mark.parametrize("seats", [2, 3, 4, 6])
+def test_batch_plays_the_same_games_as_headless(seats):
+    games = [HeadlessGame(seats, seed) for seed in range(40)]
+    batch = dealt_alike(games).run()
+    for g, game in enumerate(games):
+        result = game.run()
+        assert batch.turns[g] == result.turns
+        assert batch.completed[g] == result.completed
+        assert list(batch.money[g]) == [result.final_cash[name] for name in result.player_names]
+        assert [name for seat, name in enumerate(result.player_names)
+                if batch.winners[g, seat]] == result.winners
+
+
+def test_hands_grow_past_six_as_in_headless():
+    """A seat that plays no tile still draws one, in both simulators."""
+    games = [HeadlessGame(2, seed) for seed in range(40)]
+    sim = dealt_alike(games)
+    largest = 0
+    while not sim.done.all():
+        sim.step()
+        for game in games:
+            logic = game.logic
+            end = logic.turn_count + 1
+            while logic.turn_count < end and logic.turn_phase != "end_game":
+                logic.process_turn(DISCARD_LOG)
+        for g, game in enumerate(games):
+            if sim.done[g] and game.logic.turn_count != sim.turns[g]:
+                continue  # Stopped by the stall rule, which only the batch applies here
+            hands = [[tile for tile in hand if tile >= 0] for hand in sim.hands[g].tolist()]
+            assert hands == [list(player.hand) for player in game.players]
+            largest = max(largest, max(map(len, hands)))
+    assert largest > HAND_SIZE
+    assert sim.hands.shape[2] >= largest
+
+
+def test_from_game_logic_copies_the_position():
+    game = HeadlessGame(3, 4)
+    logic = game.logic
+    while logic.turn_count < 30:
+        logic.process_turn(DISCARD_LOG)
+    sim = BatchSimulator.from_game_logic(logic, 8, seed=0)
+    assert (sim.money == [p.money for p in game.players]).all()
+    for g in (0, 7):
+        hands = [[tile for tile in hand if tile >= 0] for hand in sim.hands[g].tolist()]
+        assert hands == [list(player.hand) for player in game.players]
+    assert (sim.cursor == 108 - logic.tile_deck.remaining()).all()
+    result = sim.run()
+    assert result.turns.min() > 0
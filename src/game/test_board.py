@@ -0,0 +1,102 @@
+"""Tests for classifying tiles against the board, dead tiles included. Run from src/ with pytest."""
+import pytest
+
+from game.board import (BLOCKED, DEAD, FOUND, INDEPENDENT, JOIN, MERGE, OCCUPIED, Board,
+                        TilePlay)
+from game.corporation import Corporation
+from game.game_log import DISCARD_LOG
+from game.headless import HeadlessGame
+from game.player import Player
+from utils.constants import CORPORATION_COLORS
+
+def lay_chain(board, corporations, name, tiles):
+    """Put tiles on the board as one chain called name."""
+    for col, row in tiles:
+        board.place_tile(col, row, "test", corporations)
+    board.found_chain(*tiles[0], name)
+    corporations[name].size = board.chain_size(name)
+
+
+def column(col, rows):
+    return [(col, row) for row in rows]
+
+
+@pytest.fixture
+def position():
+    """
+    A board with two safe chains, Tower (columns 0-1) and American
+    (columns 3-4), a small Festival chain at column 6 and an independent
+    tile at (9, 4):
+
+        (2, 0), (2, 1)  touch Tower and American: dead
+        (5, 0)          touches American and Festival: a merger
+    """
+    board = Board()
+    corporations = {name: Corporation(name) for name in CORPORATION_COLORS}
+    lay_chain(board, corporations, "Tower", column(0, range(9)) + column(1, range(2)))
+    lay_chain(board, corporations, "American", column(3, range(9)) + column(4, range(2)))
+    lay_chain(board, corporations, "Festival", column(6, range(2)))
+    board.place_tile(9, 4, "test", corporations)
+    return board, corporations
+
+
+def test_classify_hand_kinds(position):
+    board, corporations = position
+    assert corporations["Tower"].is_safe() and corporations["American"].is_safe()
+    hand = [(0, 0), (11, 8), (1, 5), (9, 5), (2, 0), (5, 0)]
+    plays = board.classify_hand(hand, corporations)
+    assert plays == [
+        TilePlay((0, 0), OCCUPIED, ()),
+        TilePlay((11, 8), INDEPENDENT, ()),
+        TilePlay((1, 5), JOIN, ("Tower",)),
+        TilePlay((9, 5), FOUND, ()),
+        TilePlay((2, 0), DEAD, ("Tower", "American")),
+        TilePlay((5, 0), MERGE, ("American", "Festival")),
+    ]
+
+
+def test_founding_blocked_once_every_chain_is_active(position):
+    board, corporations = position
+    for corp in corporations.values():
+        corp.size = max(corp.size, 2)
+    assert board.classify_hand([(9, 5)], corporations)[0].kind == BLOCKED
+
+
+def test_merging_chains_listed_in_neighbour_order(position):
+    board, corporations = position
+    # (2, 0)'s neighbours are checked left, right, up, down
+    assert board.classify_hand([(2, 0)], corporations)[0].chains == ("Tower", "American")
+    assert board.classify_hand([(5, 0)], corporations)[0].chains == ("American", "Festival")
+
+
+def test_dead_needs_two_safe_chains(position):
+    board, corporations = position
+    corporations["American"].size = 10
+    assert board.classify_hand([(2, 0)], corporations)[0].kind == MERGE
+
+
+def test_dead_tiles_from_player(position):
+    board, corporations = position
+    player = Player("test")
+    player.tiles_in_hand = [(2, 1), (2, 2), (11, 8), (2, 0)]
+    assert player.get_dead_tiles(board, corporations) == [(2, 1), (2, 0)]
+
+
+def test_dead_tiles_are_exchanged():
+    """An AI with nothing but dead tiles discards them and draws as many new ones."""
+    game = HeadlessGame(3, 0)
+    lay_chain(game.board, game.corporations, "Tower", column(0, range(9)) + column(1, range(2)))
+    lay_chain(game.board, game.corporations, "American", column(3, range(9)) + column(4, range(2)))
+    logic = game.logic
+    player = logic.get_current_player()
+    dead = [(2, 0), (2, 1)]
+    deck = [tile for tile in logic.tile_deck.remaining_tiles() if tile[0] not in (0, 1, 2, 3, 4)]
+    logic.tile_deck.set_tiles(deck)
+    player.tiles_in_hand = dead
+
+    logic.process_turn(DISCARD_LOG)
+    assert logic.turn_phase == "buy_stock"
+    assert logic.tile_deck.discarded[-2:] == dead
+    assert len(player.tiles_in_hand) == 2
+    assert not set(player.tiles_in_hand) & set(dead)
+    assert logic.tile_deck.remaining() == len(deck) - 2
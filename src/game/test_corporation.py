@@ -0,0 +1,56 @@
+"""Tests for the stock price and bonus tables. Run from src/ with pytest."""
+import pytest
+
+from game.batch_simulator import BONUS_TABLE, PRICE_TABLE
+from game.corporation import BONUS_TABLES, CHAIN_DATA, PRICE_TABLES, Corporation
+from utils.constants import BOARD_HEIGHT, BOARD_WIDTH, CORPORATION_COLORS
+
+SIZES = range(BOARD_WIDTH * BOARD_HEIGHT + 1)
+
+
+def bracket_value(brackets, size):
+    """Value for size from (min_size, value) brackets: the lookup the tables replaced."""
+    if size < 2:
+        return 0
+    for min_size, value in reversed(brackets):
+        if size >= min_size:
+            return value
+    return 0
+
+
+@pytest.mark.parametrize("name", list(CORPORATION_COLORS))
+def test_tables_match_the_brackets(name):
+    corp = Corporation(name)
+    prices, bonuses = CHAIN_DATA[name]["price"], CHAIN_DATA[name]["bonus"]
+    for size in SIZES:
+        price, bonus = bracket_value(prices, size), bracket_value(bonuses, size)
+        corp.size = size
+        assert corp.get_stock_price() == corp.current_value == corp.price_at(size) == price
+        assert corp.get_majority_bonus() == corp.current_bonus == corp.bonus_at(size) == bonus
+        assert PRICE_TABLES[name][size] == price and BONUS_TABLES[name][size] == bonus
+
+
+def test_tiers():
+    # (chain, size) -> (price, majority bonus): each tier at its bracket edges
+    expected = {
+        ("Worldwide", 1): (0, 0), ("Sackson", 2): (200, 2000), ("Worldwide", 6): (600, 6000),
+        ("Sackson", 10): (600, 6000), ("Worldwide", 11): (700, 7000), ("Sackson", 40): (900, 9000),
+        ("Festival", 2): (300, 3000), ("Imperial", 5): (600, 6000), ("American", 20): (800, 8000),
+        ("Festival", 41): (1100, 11000), ("Continental", 0): (0, 0), ("Tower", 3): (500, 5000),
+        ("Continental", 31): (1100, 11000), ("Tower", 41): (1200, 12000),
+        ("Tower", 108): (1200, 12000),
+    }
+    for (name, size), (price, bonus) in expected.items():
+        assert (PRICE_TABLES[name][size], BONUS_TABLES[name][size]) == (price, bonus)
+
+
+def test_chains_of_a_tier_share_tables():
+    assert PRICE_TABLES["Worldwide"] is PRICE_TABLES["Sackson"]
+    assert BONUS_TABLES["Festival"] is BONUS_TABLES["Imperial"] is BONUS_TABLES["American"]
+    assert PRICE_TABLES["Continental"] is PRICE_TABLES["Tower"]
+
+
+def test_batch_tables_match():
+    for chain_id, name in enumerate(CORPORATION_COLORS):
+        assert PRICE_TABLE[chain_id].tolist() == list(PRICE_TABLES[name])
+        assert BONUS_TABLE[chain_id].tolist() == list(BONUS_TABLES[name])
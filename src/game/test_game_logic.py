@@ -0,0 +1,240 @@
+"""
+Tests for GameLogic: positions, moves and mergers. Run from src/:
+
+    python -m pytest game
+"""
+import random
+
+import pytest
+
+from game.board import MERGE
+from game.game_log import DISCARD_LOG
+from game.game_logic import bonus_payouts
+from game.headless import HeadlessGame
+from game.moves import BuyStocks, FoundChain, PlaceTile
+from game.shareholders import ShareholderIndex
+
+def position(logic):
+    """Everything a snapshot holds, in a form that compares equal for equal positions."""
+    snapshot = logic.snapshot()
+    turn = list(snapshot.turn)
+    if turn[4] is not None:
+        turn[4] = dict(turn[4])  # Merger state
+    return (snapshot.board[0], snapshot.corporations, snapshot.players,
+            snapshot.tile_deck, tuple(turn), logic.position_hash())
+
+
+def play_turns(logic, turns):
+    """Run process_turn until turns more turns are played (or the game ends)."""
+    end = logic.turn_count + turns
+    while logic.turn_count < end and logic.turn_phase != "end_game":
+        logic.process_turn(DISCARD_LOG)
+
+
+# --- snapshot, restore and clone ----------------------------------------------
+
+def test_restore_returns_to_snapshot():
+    logic = HeadlessGame(3, 7).logic
+    play_turns(logic, 20)
+    before = position(logic)
+    snapshot = logic.snapshot()
+
+    play_turns(logic, 15)
+    assert position(logic) != before
+    logic.restore(snapshot)
+    assert position(logic) == before
+
+
+def test_restore_then_play_repeats_the_game():
+    logic = HeadlessGame(3, 3).logic
+    play_turns(logic, 10)
+    snapshot = logic.snapshot()
+    play_turns(logic, 30)
+    after = position(logic)
+
+    logic.restore(snapshot)
+    play_turns(logic, 30)
+    assert position(logic) == after
+
+
+def test_clone_is_independent():
+    game = HeadlessGame(3, 11)
+    logic = game.logic
+    play_turns(logic, 25)
+    before = position(logic)
+
+    clone = logic.clone()
+    assert position(clone) == before
+    play_turns(clone, 200)
+    assert position(logic) == before
+
+    # The clone's players keep its own shareholder indexes up to date
+    for name, corp in clone.corporations.items():
+        assert corp.shareholders is not game.corporations[name].shareholders
+        for seat, player in enumerate(clone.players):
+            assert corp.shareholders.held(seat) == player.stocks[name]
+
+
+# --- make and unmake ----------------------------------------------------------
+
+def random_walk(logic, rng, max_moves):
+    """Make random legal moves, now and then unmaking a few, and check each unmake."""
+    records = []
+    positions = []
+    while logic.turn_phase != "end_game" and len(records) < max_moves:
+        positions.append(position(logic))
+        record = logic.make_move(rng.choice(logic.legal_moves()))
+        assert record is not None
+        records.append(record)
+        if rng.random() < 0.1:
+            for _ in range(rng.randint(1, min(5, len(records)))):
+                logic.unmake_move(records.pop())
+                assert position(logic) == positions.pop()
+    return records, positions
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_unmake_reverts_every_move(seed):
+    logic = HeadlessGame(3, seed).logic
+    records, positions = random_walk(logic, random.Random(seed), 300)
+    while records:
+        logic.unmake_move(records.pop())
+        assert position(logic) == positions.pop()
+
+
+def test_illegal_move_changes_nothing():
+    logic = HeadlessGame(3, 2).logic
+    before = position(logic)
+    not_in_hand = logic.tile_deck.remaining_tiles()[0]
+    assert logic.make_move(PlaceTile(not_in_hand)) is None
+    assert logic.make_move(FoundChain("Tower")) is None  # Not the founding phase
+    assert logic.make_move(BuyStocks(())) is None        # Nor the buying phase
+    assert position(logic) == before
+
+
+# --- mergers ------------------------------------------------------------------
+
+def first_mergers(seeds):
+    """(game, tile) at the first merger the AI makes in each seeded game that has one."""
+    found = []
+    for seed in seeds:
+        game = HeadlessGame(3, seed)
+        logic = game.logic
+        while logic.turn_phase != "end_game":
+            if logic.turn_phase == "tile_placement":
+                player = logic.get_current_player()
+                plays = logic.board.classify_hand(player.tiles_in_hand, logic.corporations)
+                tile = player.decide_move(logic.board, logic.corporations, plays)
+                if any(p.tile == tile and p.kind == MERGE for p in plays):
+                    found.append((game, tile))
+                    break
+            logic.process_turn(DISCARD_LOG)
+    return found
+
+
+MERGERS = first_mergers(range(12))
+
+
+def expected_merger(logic, tile):
+    """Cash and holdings after an all-AI merger at tile, worked out from the rules."""
+    corporations = logic.corporations
+    chains = logic.board.classify_hand([tile], corporations)[0].chains
+    dominant = max(chains, key=lambda c: (corporations[c].size, corporations[c].current_value))
+    money = [p.money for p in logic.players]
+    stocks = [dict(p.stocks.items()) for p in logic.players]
+    dominant_left = corporations[dominant].stocks_remaining
+
+    for chain in chains:  # Defunct chains in neighbour order
+        if chain == dominant:
+            continue
+        corp = corporations[chain]
+        for seat, amount, _ in bonus_payouts(corp.shareholders, corp.bonus_at(corp.size)):
+            money[seat] += amount
+    for chain in chains:
+        if chain == dominant:
+            continue
+        corp = corporations[chain]
+        for seat in range(len(logic.players)):  # Shareholders in seat order
+            held = stocks[seat][chain]
+            traded = min(held // 2, dominant_left)
+            dominant_left -= traded
+            stocks[seat][dominant] += traded
+            money[seat] += (held - 2 * traded) * (corp.price_at(corp.size) // 2)
+            stocks[seat][chain] = 0
+    return dominant, [c for c in chains if c != dominant], money, stocks
+
+
+def test_mergers_found():
+    assert len(MERGERS) >= 5
+
+
+@pytest.mark.parametrize("game, tile", MERGERS)
+def test_ai_merger_settles_every_defunct_chain(game, tile):
+    logic = game.logic.clone()
+    dominant, defunct, money, stocks = expected_merger(logic, tile)
+
+    logic.process_turn(DISCARD_LOG)
+    assert logic.merger_state is None
+    assert logic.turn_phase == "buy_stock"
+    assert [p.money for p in logic.players] == money
+    assert [dict(p.stocks.items()) for p in logic.players] == stocks
+    for chain in defunct:
+        assert logic.corporations[chain].size == 0
+    for name, corp in logic.corporations.items():
+        held = sum(p.stocks[name] for p in logic.players)
+        assert corp.stocks_remaining + held == 25
+        for seat, player in enumerate(logic.players):
+            assert corp.shareholders.held(seat) == player.stocks[name]
+
+
+@pytest.mark.parametrize("game, tile", MERGERS)
+def test_merger_by_moves_matches_process_turn(game, tile):
+    by_turn = game.logic.clone()
+    by_turn.process_turn(DISCARD_LOG)
+
+    by_moves = game.logic.clone()
+    assert by_moves.make_move(PlaceTile(tile)) is not None
+    while by_moves.turn_phase == "merger_resolution":
+        assert by_moves.make_move(by_moves.default_merger_choice()) is not None
+    assert position(by_moves) == position(by_turn)
+
+
+def test_merger_waits_for_a_human_shareholder():
+    for game, tile in MERGERS:
+        logic = game.logic.clone()
+        chains = logic.board.classify_hand([tile], logic.corporations)[0].chains
+        current = logic.current_turn_index
+        human = next((seat for seat, p in enumerate(logic.players) if seat != current
+                      and any(p.stocks[c] for c in chains)), None)
+        if human is not None:
+            break
+    else:
+        pytest.fail("no merger with another shareholder")
+
+    player = logic.players[human]
+    player.is_human = True
+    logic.process_turn(DISCARD_LOG)
+    state = logic.merger_state
+    assert logic.turn_phase == "merger_resolution"
+    assert state['players_to_process'][state['current_player_idx']] is player
+
+    while logic.merger_state:
+        chain = logic.merger_state['losing_chains'][logic.merger_state['current_chain_idx']][0]
+        held = player.stocks[chain]
+        logic.handle_human_stock_choice(keep=True)
+        assert player.stocks[chain] == held
+    assert logic.turn_phase == "buy_stock"
+
+
+def test_bonus_payouts():
+    index = ShareholderIndex()
+    index.set(0, 5)
+    index.set(1, 3)
+    index.set(2, 3)
+    assert bonus_payouts(index, 3000) == [
+        (0, 3000, "majority"), (1, 750, "split minority"), (2, 750, "split minority")]
+    index.set(1, 5)
+    assert bonus_payouts(index, 3000) == [(0, 1500, "split majority"), (1, 1500, "split majority")]
+    index.set(1, 0)
+    assert bonus_payouts(index, 3000) == [(0, 3000, "majority"), (2, 1500, "minority")]
+    assert bonus_payouts(ShareholderIndex(), 3000) == []
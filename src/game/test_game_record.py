@@ -0,0 +1,90 @@
+"""Tests for the binary game record format. Run from src/ with pytest."""
+import io
+
+import pytest
+
+from game.game_record import MOVES, TURNS, GameRecord, GameRecordWriter, read_records
+from game.headless import HeadlessGame
+from game.moves import BuyStocks, FoundChain, MergerChoice, PlaceTile
+
+MOVE_SAMPLES = [
+    PlaceTile((0, 0)), PlaceTile((11, 8)), PlaceTile(None),
+    FoundChain("Worldwide"), FoundChain("Imperial"),
+    MergerChoice(0, 0), MergerChoice(3, 200),
+    BuyStocks(()), BuyStocks(("Tower",)), BuyStocks(("Sackson", "Sackson", "Continental")),
+]
+
+
+def write(games):
+    """A record file holding games, each (seed, seats, driver, moves, final hash)."""
+    file = io.BytesIO()
+    writer = GameRecordWriter(file, buffer_size=16)
+    for seed, seats, driver, moves, final_hash in games:
+        writer.start_game(seed, seats, driver)
+        for move in moves:
+            writer.move(move)
+        writer.end_game(final_hash)
+    writer.flush()
+    file.seek(0)
+    return file
+
+
+def test_round_trip():
+    games = [
+        (0, ("AIPlayer", "MCTSPlayer"), TURNS, MOVE_SAMPLES, (1 << 64) - 1),
+        (None, ("AIPlayer",) * 6, MOVES, [], 0),
+        (2 ** 40, ("AIPlayer",) * 3, TURNS, MOVE_SAMPLES[::-1], 12345),
+    ]
+    records = list(read_records(write(games)))
+    assert len(records) == len(games)
+    for record, (seed, seats, driver, moves, final_hash) in zip(records, games):
+        assert (record.seed, record.seats, record.driver) == (seed, seats, driver)
+        assert record.moves == tuple(moves)
+        assert record.final_hash == final_hash
+
+
+@pytest.mark.parametrize("seed", [-1, 1.5, "7"])
+def test_seed_must_be_a_non_negative_int(seed):
+    with pytest.raises(ValueError):
+        GameRecordWriter(io.BytesIO()).start_game(seed, ["AIPlayer"])
+
+
+def test_rejects_other_files():
+    with pytest.raises(ValueError):
+        list(read_records(io.BytesIO(b"AQGR\x01")))
+    with pytest.raises(ValueError):
+        list(read_records(io.BytesIO(b"not a record")))
+
+
+def test_records_from_workers_join_one_file():
+    part = GameRecordWriter(io.BytesIO(), write_header=False)
+    part.start_game(5, ["AIPlayer"])
+    part.move(PlaceTile((3, 3)))
+    part.end_game(9)
+    part.flush()
+
+    file = io.BytesIO()
+    archive = GameRecordWriter(file)
+    archive.write_records(part.file.getvalue())
+    archive.write_records(part.file.getvalue())
+    archive.flush()
+    file.seek(0)
+    assert [r.seed for r in read_records(file)] == [5, 5]
+
+
+@pytest.mark.parametrize("driver", [TURNS, MOVES])
+def test_headless_games_are_recorded(driver):
+    file = io.BytesIO()
+    writer = GameRecordWriter(file)
+    result = HeadlessGame(3, 21, recorder=writer, driver=driver).run()
+    writer.flush()
+    file.seek(0)
+    (record,) = read_records(file)
+
+    assert isinstance(record, GameRecord)
+    assert (record.seed, record.driver) == (21, driver)
+    assert record.seats == ("AIPlayer",) * 3
+    assert sum(type(move) is BuyStocks for move in record.moves) == result.turns
+    # Only games driven through make_move record the merger choices
+    has_choices = any(type(move) is MergerChoice for move in record.moves)
+    assert has_choices == (driver == MOVES)
@@ -0,0 +1,37 @@
+"""Tests for headless games and their results. Run from src/ with pytest."""
+import pytest
+
+from game.headless import MAX_TURNS, HeadlessGame, run_game
+
+
+@pytest.mark.parametrize("seats", [2, 3, 4, 6])
+def test_seeded_game_plays_to_the_end(seats):
+    game = HeadlessGame(seats, 5)
+    result = game.run()
+    logic = game.logic
+
+    assert logic.turn_phase == "end_game"
+    assert logic.final_scores is not None
+    assert result.seed == 5
+    assert result.turns == logic.turn_count
+    assert 0 < result.turns < MAX_TURNS
+    assert result.completed == logic.check_end_game()
+
+    assert result.player_names == [p.name for p in game.players]
+    assert len(set(result.player_names)) == seats
+    assert result.player_types == ["AIPlayer"] * seats
+    assert result.search_rates == {}
+    # Every share was sold back at the end, so cash is all that is left
+    assert result.final_cash == {p.name: p.money for p in game.players}
+    assert all(not any(p.stocks.values()) for p in game.players)
+
+    best = max(result.final_cash.values())
+    assert result.winners == [name for name in result.player_names
+                              if result.final_cash[name] == best]
+    assert result.winners[0] == logic.final_scores[0].name
+
+
+def test_same_seed_same_game():
+    first, second = run_game(3, 17), run_game(3, 17)
+    assert (first.turns, first.final_cash) == (second.turns, second.final_cash)
+    assert run_game(3, 18).final_cash != first.final_cash
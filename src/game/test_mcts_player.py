@@ -0,0 +1,109 @@
+"""Tests for MCTSPlayer's search. Run from src/ with pytest."""
+from collections import Counter
+from functools import partial
+
+import pytest
+
+from game.ai_player import AIPlayer
+from game.game_log import DISCARD_LOG
+from game.headless import HeadlessGame
+from game.mcts_player import MCTSPlayer
+from game.moves import BuyStocks, FoundChain, PlaceTile
+
+
+def searching_game(seed, iterations=10):
+    """A seeded 3-seat game with an MCTSPlayer, limited to iterations, in the first seat."""
+    mcts = partial(MCTSPlayer, time_budget=None, max_iterations=iterations, seed=seed)
+    return HeadlessGame(3, seed, [mcts, AIPlayer, AIPlayer])
+
+
+def my_turns(game, turns):
+    """Play the game on, yielding at the first seat's next turns (up to turns of them)."""
+    logic = game.logic
+    for _ in range(turns):
+        while not (logic.current_turn_index == 0 and logic.turn_phase == "tile_placement"):
+            if logic.turn_phase == "end_game":
+                return
+            logic.process_turn(DISCARD_LOG)
+        yield
+        logic.process_turn(DISCARD_LOG)
+
+
+def all_tiles(logic):
+    return Counter(logic.tile_deck.remaining_tiles()
+                   + [tile for p in logic.players for tile in p.tiles_in_hand])
+
+
+def test_needs_a_limit():
+    with pytest.raises(ValueError):
+        MCTSPlayer("MCTS", time_budget=None, max_iterations=None)
+    MCTSPlayer("MCTS", time_budget=None, max_iterations=1)
+    MCTSPlayer("MCTS", time_budget=0.01)
+
+
+@pytest.mark.parametrize("iterations", [1, 7, 25])
+def test_max_iterations_caps_the_search(iterations):
+    game = searching_game(2, iterations)
+    player = game.players[0]
+    player.time_budget = 60.0  # max_iterations has to be what stops it
+    for _ in my_turns(game, 3):
+        player.search()
+        assert player.last_search["iterations"] == iterations
+
+
+def test_search_returns_a_legal_turn():
+    checked = Counter()
+    for seed in range(2):
+        game = searching_game(seed, 30)
+        player = game.players[0]
+        for _ in my_turns(game, 6):
+            hand = player.tiles_in_hand
+            tile, chain, purchases = player.search()
+            legal = game.logic.legal_moves()
+            if PlaceTile(None) in legal:
+                # No playable tile: the search falls back to AIPlayer's dead-tile rules
+                assert tile is None
+                continue
+            assert tile in hand
+            assert PlaceTile(tile) in legal
+
+            # Play the turn the search planned on a copy of the game
+            sim = game.logic.clone()
+            assert sim.make_move(PlaceTile(tile)) is not None
+            if sim.turn_phase == "chain_founding":
+                available = [move.chain for move in sim.legal_moves()]
+                assert chain is None or chain in available
+                assert sim.make_move(FoundChain(chain or available[0])) is not None
+                checked["chain"] += chain is not None
+            while sim.turn_phase == "merger_resolution":
+                sim.make_move(sim.default_merger_choice())
+            assert sim.turn_phase == "buy_stock"
+            if purchases is not None:
+                assert len(purchases) <= 3
+                assert sim.make_move(BuyStocks(tuple(purchases))) is not None
+                checked["purchases"] += len(purchases) > 0
+    # The searches got far enough to plan a founding and some purchases
+    assert checked["chain"] and checked["purchases"]
+
+
+def test_determinize_deals_only_the_hidden_tiles():
+    game = searching_game(4)
+    player = game.players[0]
+    logic = game.logic
+    while logic.turn_count < 15:
+        logic.process_turn(DISCARD_LOG)
+    sim = logic.clone([AIPlayer(p.name) for p in game.players])
+    position = sim.snapshot()
+    tiles = all_tiles(sim)
+    others = [len(p.hand) for p in sim.players[1:]]
+    deck = sim.tile_deck.remaining()
+
+    dealt = set()
+    for _ in range(20):
+        player._determinize(sim, position, 0)
+        assert sim.players[0].tiles_in_hand == player.tiles_in_hand
+        assert all_tiles(sim) == tiles
+        assert [len(p.hand) for p in sim.players[1:]] == others
+        assert sim.tile_deck.remaining() == deck
+        dealt.add(tuple(sim.players[1].tiles_in_hand))
+    assert len(dealt) > 1  # The other hands really are dealt at random
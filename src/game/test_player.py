@@ -0,0 +1,121 @@
+"""Tests for Player and its share Holdings. Run from src/ with pytest."""
+import copy
+
+import pytest
+
+from game.ai_player import AIPlayer
+from game.headless import HeadlessGame
+from game.player import CHAIN_NAMES, Player
+from game.zobrist import MAX_SHARES
+
+
+def state(player):
+    return player.money, dict(player.stocks.items()), player.tiles_in_hand, player.hash
+
+
+def holding_player():
+    player = Player("test")
+    for count, chain in enumerate(CHAIN_NAMES, 1):
+        player.add_stocks(chain, count)
+    player.add_tile((0, 0))
+    player.add_tile((5, 3))
+    return player
+
+
+def test_stocks_read_like_a_dict():
+    player = holding_player()
+    for count, chain in enumerate(CHAIN_NAMES, 1):
+        assert player.stocks.get(chain) == count
+        assert player.stocks.get(chain, 0) == count
+        assert player.stocks[chain] == count
+    assert player.stocks.get("Nowhere") is None
+    assert player.stocks.get("Nowhere", 0) == 0
+    assert list(player.stocks) == list(CHAIN_NAMES)
+    assert player.stocks.values() == list(range(1, len(CHAIN_NAMES) + 1))
+    assert dict(player.stocks.items()) == {c: n for n, c in enumerate(CHAIN_NAMES, 1)}
+    with pytest.raises(KeyError):
+        player.stocks["Nowhere"]
+
+
+def test_copy_is_independent():
+    player = holding_player()
+    before = state(player)
+    clone = copy.copy(player)
+    assert state(clone) == before
+
+    clone.money -= 500
+    clone.add_stocks(CHAIN_NAMES[0], 4)
+    clone.remove_tile((0, 0))
+    clone.add_tile((11, 8))
+    assert state(player) == before
+    assert clone.stocks[CHAIN_NAMES[0]] == 5
+    assert clone.hash != player.hash
+
+
+def test_copy_keeps_subclass_settings():
+    player = AIPlayer("AI")
+    clone = copy.copy(player)
+    assert type(clone) is AIPlayer and not clone.is_human
+
+
+def test_snapshot_restores_an_independent_state():
+    player = holding_player()
+    before = state(player)
+    snapshot = player.snapshot()
+
+    player.buy_stock(CHAIN_NAMES[2], 2, 300)
+    player.remove_tile((5, 3))
+    assert state(player) != before
+    player.restore(snapshot)
+    assert state(player) == before
+
+    # The restored arrays are the player's own, not the snapshot's
+    player.add_stocks(CHAIN_NAMES[1], 1)
+    player.add_tile((9, 2))
+    other = Player("other")
+    other.restore(snapshot)
+    assert (other.money, dict(other.stocks.items()), other.tiles_in_hand) == before[:3]
+
+
+def test_restore_updates_bound_shareholder_indexes():
+    game = HeadlessGame(3, 1)
+    player = game.players[1]
+    snapshot = player.snapshot()
+    player.add_stocks("Tower", 6)
+    assert game.corporations["Tower"].shareholders.held(1) == 6
+    player.restore(snapshot)
+    assert game.corporations["Tower"].shareholders.held(1) == 0
+
+
+def test_holdings_stay_within_a_byte():
+    player = Player("test")
+    chain = CHAIN_NAMES[3]
+    player.money = 10 ** 6
+    assert player.buy_stock(chain, MAX_SHARES - 1, 100)
+    before = state(player)
+
+    with pytest.raises(ValueError):
+        player.buy_stock(chain, 1, 100)
+    with pytest.raises(ValueError):
+        player.add_stocks(chain, 200)
+    with pytest.raises(ValueError):
+        player.remove_stocks(chain, MAX_SHARES)
+    with pytest.raises(ValueError):
+        player.buy_stock(chain, -1, 100)
+    with pytest.raises(ValueError):
+        player.sell_stock(chain, -1, 100)
+    assert state(player) == before
+
+    # Selling more than is held is refused, not an error
+    assert not player.sell_stock(chain, MAX_SHARES, 100)
+    assert player.sell_stock(chain, MAX_SHARES - 1, 100)
+    assert player.stocks[chain] == 0
+    assert player.money == 10 ** 6
+
+
+def test_buy_stock_needs_the_money():
+    player = Player("test")
+    assert not player.buy_stock(CHAIN_NAMES[0], 3, 2500)
+    assert player.stocks[CHAIN_NAMES[0]] == 0 and player.money == 6000
+    assert player.buy_stock(CHAIN_NAMES[0], 2, 3000)
+    assert player.money == 0
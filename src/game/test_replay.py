@@ -0,0 +1,83 @@
+"""Tests for replaying recorded games. Run from src/ with pytest."""
+import io
+
+import pytest
+
+from game.game_record import MOVES, TURNS, GameRecordWriter, read_records
+from game.headless import HeadlessGame
+from game.replay import Replay, verify_records
+
+
+def record_games(seeds, driver):
+    """A record file of one headless game per seed, and the games' results."""
+    file = io.BytesIO()
+    writer = GameRecordWriter(file)
+    results = [HeadlessGame(3, seed, recorder=writer, driver=driver).run() for seed in seeds]
+    writer.flush()
+    file.seek(0)
+    return file, results
+
+
+def rewrite(record, moves):
+    """record with its moves replaced."""
+    file = io.BytesIO()
+    writer = GameRecordWriter(file)
+    writer.start_game(record.seed, record.seats, record.driver)
+    for move in moves:
+        writer.move(move)
+    writer.end_game(record.final_hash)
+    writer.flush()
+    file.seek(0)
+    return next(read_records(file))
+
+
+@pytest.mark.parametrize("driver", [TURNS, MOVES])
+def test_recorded_games_verify(driver):
+    file, _ = record_games(range(10), driver)
+    checked, failed = verify_records(file)
+    assert (checked, failed) == (10, [])
+
+
+@pytest.mark.parametrize("driver", [TURNS, MOVES])
+def test_replay_ends_where_the_game_did(driver):
+    file, (result,) = record_games([8], driver)
+    (record,) = read_records(file)
+    replay = Replay(record)
+    assert replay.turns == result.turns
+    assert replay.seek(replay.turns) == result.turns
+    replay.logic.final_scoring()
+    assert {p.name: p.money for p in replay.players} == result.final_cash
+
+
+@pytest.mark.parametrize("driver", [TURNS, MOVES])
+def test_seek_back_and_forth(driver):
+    file, _ = record_games([13], driver)
+    (record,) = read_records(file)
+    replay = Replay(record, keyframe_interval=5)
+    hashes = {}
+    for turn in range(replay.turns + 1):
+        replay.seek(turn)
+        hashes[turn] = replay.logic.position_hash()
+    for turn in (40, 3, 27, 0, replay.turns, 11, 11):
+        replay.seek(turn)
+        assert replay.logic.position_hash() == hashes[min(turn, replay.turns)]
+    assert replay.verify()
+
+
+@pytest.mark.parametrize("driver", [TURNS, MOVES])
+def test_truncated_record_fails_to_verify(driver):
+    file, _ = record_games([4], driver)
+    (record,) = read_records(file)
+    moves = record.moves
+    # Drop moves from the middle of the game, keeping its count of turns
+    cut = len(moves) // 2
+    short = rewrite(record, moves[:cut] + moves[cut + 3:])
+    assert not Replay(short).verify()
+
+
+def test_record_that_ends_mid_turn_fails_to_verify():
+    file, _ = record_games([4], MOVES)
+    (record,) = read_records(file)
+    replay = Replay(rewrite(record, record.moves[:-1]))
+    replay.turns += 1  # Ask for the turn the record no longer finishes
+    assert not replay.verify()
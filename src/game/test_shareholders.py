@@ -0,0 +1,80 @@
+"""Tests for ShareholderIndex against plain holdings. Run from src/ with pytest."""
+import random
+
+import pytest
+
+from game.headless import HeadlessGame
+from game.shareholders import ShareholderIndex
+from game.zobrist import MAX_SEATS
+
+
+def ranking(counts):
+    """(majority seats, minority seats) worked out directly from per-seat counts."""
+    top = max(counts)
+    if not top:
+        return (), ()
+    majority = tuple(seat for seat, n in enumerate(counts) if n == top)
+    second = max((n for n in counts if n != top), default=0)
+    minority = tuple(seat for seat, n in enumerate(counts) if n == second) if second else ()
+    return majority, minority
+
+
+def check(index, counts):
+    majority, minority = ranking(counts)
+    assert index.majority() == majority
+    assert index.minority() == minority
+    assert index.tied() == (len(majority) > 1)
+    assert index.majority_shares() == max(counts)
+    assert index.minority_shares() == (counts[minority[0]] if minority else 0)
+    assert [index.held(seat) for seat in range(MAX_SEATS)] == counts
+    for seat in range(MAX_SEATS):
+        others = max(n for s, n in enumerate(counts) if s != seat)
+        assert index.shares_to_lead(seat) == max(others - counts[seat] + 1, 0)
+
+
+def test_random_changes_match_counts():
+    rng = random.Random(1)
+    index = ShareholderIndex()
+    counts = [0] * MAX_SEATS
+    check(index, counts)
+    for _ in range(3000):
+        seat = rng.randrange(MAX_SEATS)
+        counts[seat] = rng.choice([0, rng.randint(0, 4), rng.randint(0, 25)])
+        index.set(seat, counts[seat])
+        check(index, counts)
+    index.clear()
+    check(index, [0] * MAX_SEATS)
+
+
+def test_margin():
+    index = ShareholderIndex()
+    assert index.margin() == 0
+    index.set(2, 7)
+    assert index.margin() == 7
+    index.set(4, 3)
+    assert index.margin() == 4
+    index.set(4, 7)
+    assert index.margin() == 0
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_index_follows_holdings_through_a_game(seed):
+    game = HeadlessGame(3, seed)
+    logic = game.logic
+    rng = random.Random(seed)
+    records = []
+
+    def check_game():
+        for name, corp in game.corporations.items():
+            counts = [p.stocks[name] for p in game.players] + [0] * (MAX_SEATS - 3)
+            check(corp.shareholders, counts)
+
+    while logic.turn_phase != "end_game" and len(records) < 300:
+        if records and rng.random() < 0.2:
+            logic.unmake_move(records.pop())
+        else:
+            records.append(logic.make_move(rng.choice(logic.legal_moves())))
+        check_game()
+
+    logic.restore(HeadlessGame(3, seed).logic.snapshot())
+    check_game()
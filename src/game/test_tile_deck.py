@@ -0,0 +1,89 @@
+"""Tests for TileDeck and the seeded random streams. Run from src/ with pytest."""
+import copy
+
+from game.game_log import DISCARD_LOG
+from game.headless import HeadlessGame
+from game.tile_deck import TILES, TileDeck, derive_seed, rng_stream
+
+
+def draw_all(deck):
+    tiles = []
+    while deck.remaining():
+        tiles.append(deck.draw_tile())
+    assert deck.draw_tile() is None
+    return tiles
+
+
+def test_same_seed_same_order():
+    first = draw_all(TileDeck(rng_stream(42)))
+    assert first == draw_all(TileDeck(rng_stream(42)))
+    assert sorted(first) == sorted(TILES)
+    assert first != draw_all(TileDeck(rng_stream(43)))
+    assert draw_all(TileDeck(rng_stream(42, "seat", 1))) != first
+    assert derive_seed(42, "seat", 1) == derive_seed(42, "seat", 1) != derive_seed(42, "seat", 2)
+
+
+def test_draw_then_undraw_restores_the_deck():
+    deck = TileDeck(rng_stream(7))
+    deck.draw_tiles(10)
+    before = deck.remaining_tiles()
+    tile = deck.draw_tile()
+    assert tile == before[-1]
+    deck.undraw()
+    assert deck.remaining_tiles() == before
+    assert deck.draw_tile() == tile
+
+
+def test_draw_tiles_matches_single_draws():
+    single, batch = TileDeck(rng_stream(3)), TileDeck(rng_stream(3))
+    assert batch.draw_tiles(6) == [single.draw_tile() for _ in range(6)]
+    assert batch.remaining_tiles() == single.remaining_tiles()
+    assert len(batch.draw_tiles(500)) == 102
+    assert batch.draw_tiles(1) == []
+
+
+def test_remaining_counts_agree():
+    deck = TileDeck(rng_stream(11))
+    drawn = []
+    while True:
+        remaining = deck.remaining_tiles()
+        assert deck.remaining() == len(remaining)
+        assert sorted(remaining + drawn) == sorted(TILES)
+        if not remaining:
+            break
+        drawn.extend(deck.draw_tiles(1 + len(drawn) % 4))
+
+    deck.set_tiles(TILES[:5])
+    assert deck.remaining() == 5
+    assert deck.draw_tile() == TILES[4]
+
+
+def test_discarded_tiles_never_come_back():
+    deck = TileDeck(rng_stream(5))
+    discarded = deck.draw_tiles(12)
+    for tile in discarded:
+        deck.discard(tile)
+    copied = copy.copy(deck)
+    snapshot = deck.snapshot()
+    for later in (draw_all(deck), draw_all(copied)):
+        assert not set(later) & set(discarded)
+        assert len(later) == len(TILES) - 12
+
+    deck.restore(snapshot)
+    assert deck.discarded == discarded
+    assert not set(deck.remaining_tiles()) & set(discarded)
+
+
+def test_dead_tiles_leave_the_game():
+    """In played games, no tile a player discards is ever drawn or held again."""
+    exchanges = 0
+    for seed in range(60):
+        game = HeadlessGame(2, seed)
+        logic = game.logic
+        while logic.turn_phase != "end_game" and logic.turn_count < 300:
+            logic.process_turn(DISCARD_LOG)
+            gone = set(logic.tile_deck.discarded)
+            assert not gone & set(logic.tile_deck.remaining_tiles())
+            assert not any(gone & set(p.tiles_in_hand) for p in game.players)
+        exchanges += bool(logic.tile_deck.discarded)
+    assert exchanges
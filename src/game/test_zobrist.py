@@ -0,0 +1,102 @@
+"""Tests for Zobrist position hashing and the transposition table. Run from src/ with pytest."""
+import random
+
+import pytest
+
+from game.game_log import DISCARD_LOG
+from game.headless import HeadlessGame
+from game.transposition import TranspositionTable
+from game.zobrist import (CELL_KEYS, HOLDING_KEYS, LABELS, MERGER_KEYS, PHASE_KEYS, POOL_KEYS,
+                          SEAT_KEYS, money_key, seat_mix)
+from utils.constants import BOARD_HEIGHT
+
+def scratch_hash(logic):
+    """position_hash() worked out from the whole position rather than kept up to date."""
+    key = SEAT_KEYS[logic.current_turn_index] ^ PHASE_KEYS[logic.turn_phase]
+    for col, column in enumerate(logic.board.state):
+        for row, cell in enumerate(column):
+            if cell is not None:
+                key ^= CELL_KEYS[col * BOARD_HEIGHT + row][LABELS[cell["chain"]]]
+    for corp in logic.corporations.values():
+        key ^= POOL_KEYS[corp.name][corp.stocks_remaining]
+    for seat, player in enumerate(logic.players):
+        player_key = money_key(player.money)
+        for chain, count in player.stocks.items():
+            player_key ^= HOLDING_KEYS[chain][count]
+        key ^= seat_mix(player_key, seat)
+    if logic.merger_state:
+        key ^= MERGER_KEYS[logic.merger_state['current_chain_idx']][
+            logic.merger_state['current_player_idx']]
+    return key
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_hash_kept_up_by_moves(seed):
+    logic = HeadlessGame(3, seed).logic
+    rng = random.Random(seed)
+    records = []
+    hashes = []
+    while logic.turn_phase != "end_game" and len(records) < 300:
+        hashes.append(logic.position_hash())
+        assert hashes[-1] == scratch_hash(logic)
+        records.append(logic.make_move(rng.choice(logic.legal_moves())))
+    assert logic.position_hash() == scratch_hash(logic)
+    while records:
+        logic.unmake_move(records.pop())
+        assert logic.position_hash() == hashes.pop()
+
+
+def test_hash_kept_up_by_process_turn():
+    logic = HeadlessGame(3, 9).logic
+    while logic.turn_phase != "end_game" and logic.turn_count < 300:
+        logic.process_turn(DISCARD_LOG)
+        assert logic.position_hash() == scratch_hash(logic)
+
+
+def test_hash_survives_restore_and_clone():
+    logic = HeadlessGame(3, 5).logic
+    while logic.turn_count < 30:
+        logic.process_turn(DISCARD_LOG)
+    key = logic.position_hash()
+    snapshot = logic.snapshot()
+    assert logic.clone().position_hash() == key
+
+    while logic.turn_count < 45:
+        logic.process_turn(DISCARD_LOG)
+    assert logic.position_hash() != key
+    logic.restore(snapshot)
+    assert logic.position_hash() == key
+
+
+def test_hidden_tiles_do_not_change_the_hash():
+    game = HeadlessGame(3, 6)
+    logic = game.logic
+    key = logic.position_hash()
+    first, second = game.players[0], game.players[1]
+    first.tiles_in_hand, second.tiles_in_hand = second.tiles_in_hand, first.tiles_in_hand
+    assert logic.position_hash() == key
+
+
+def test_seats_are_told_apart():
+    game = HeadlessGame(3, 6)
+    logic = game.logic
+    game.players[0].money += 100
+    key = logic.position_hash()
+    game.players[0].money -= 100
+    game.players[1].money += 100
+    assert logic.position_hash() != key
+
+
+def test_transposition_table_keeps_busier_entry_within_a_search():
+    table = TranspositionTable(size_bits=4)
+    assert table.lookup(3) is None
+    assert table.store(3, 10, 5.0)
+    assert table.lookup(3) == (10, 5.0)
+
+    # 19 shares slot 3: it only displaces a busier entry from an older search
+    assert not table.store(19, 2, 1.0)
+    assert table.lookup(3) == (10, 5.0)
+    table.new_search()
+    assert table.store(19, 2, 1.0)
+    assert table.lookup(19) == (2, 1.0)
+    assert table.lookup(3) is None
@@ -1,28 +1,90 @@
 import random
+from array import array
+
 from utils.constants import BOARD_HEIGHT, BOARD_WIDTH
 
+# Tile (col, row) for each cell index col * BOARD_HEIGHT + row
+TILES = tuple((col, row) for col in range(BOARD_WIDTH) for row in range(BOARD_HEIGHT))
+
+
+def derive_seed(seed, *keys):
+    """
+    Seed for an independent random stream under seed, named by keys (for
+    example a worker number or a seat). The same seed and keys always give
+    the same stream, in any process.
+    """
+    return random.Random(repr((seed,) + keys)).getrandbits(64)
+
+
+def rng_stream(seed=None, *keys):
+    """random.Random for seed (or the stream derive_seed names under it)."""
+    if seed is None:
+        return random.Random()
+    return random.Random(derive_seed(seed, *keys) if keys else seed)
+
+
 class TileDeck:
-    def __init__(self):
-        # Create a list of all building tile coordinates (each represented as a tuple)
-        self.tiles = [(col, row) for col in range(BOARD_WIDTH) for row in range(BOARD_HEIGHT)]
-        random.shuffle(self.tiles)
+    """
+    The draw pile as a permutation of cell indices, shuffled once by the
+    game's own RNG. order[:cursor] are the tiles still in the deck and the
+    next draw is order[cursor - 1], so drawing only moves the cursor and a
+    copy is a 108-byte array.
+    """
+
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random.Random()
+        self.order = array("B", range(len(TILES)))
+        self.rng.shuffle(self.order)
+        self.cursor = len(self.order)
+        self.discarded = []  # Dead tiles taken out of the game
 
     def draw_tile(self):
         """Draw a single tile from the deck (or return None if empty)"""
-        if self.tiles:
-            return self.tiles.pop()
+        if self.cursor:
+            self.cursor -= 1
+            return TILES[self.order[self.cursor]]
         return None
-    
+
     def draw_tiles(self, count):
         """Draw up to 'count' tiles from the deck."""
-        drawn = []
-        for _ in range(count):
-            tile = self.draw_tile()
-            if tile is None:
-                break
-            drawn.append(tile)
+        count = min(count, self.cursor)
+        drawn = [TILES[cell] for cell in reversed(self.order[self.cursor - count:self.cursor])]
+        self.cursor -= count
         return drawn
-    
+
+    def undraw(self):
+        """Put the last tile drawn back on top of the deck."""
+        self.cursor += 1
+
+    def discard(self, tile):
+        """Take a dead tile out of the game."""
+        self.discarded.append(tile)
+
+    def remaining_tiles(self):
+        """The tiles still in the deck, next draw last."""
+        return [TILES[cell] for cell in self.order[:self.cursor]]
+
+    def set_tiles(self, tiles):
+        """Make the deck exactly these tiles, drawn from the end of the list."""
+        self.order = array("B", [col * BOARD_HEIGHT + row for col, row in tiles])
+        self.cursor = len(self.order)
+
+    def snapshot(self):
+        return self.order.tobytes(), self.cursor, tuple(self.discarded)
+
+    def restore(self, snapshot):
+        order, self.cursor, discarded = snapshot
+        self.order = array("B", order)
+        self.discarded = list(discarded)
+
+    def __copy__(self):
+        deck = TileDeck.__new__(TileDeck)
+        deck.rng = self.rng
+        deck.order = array("B", self.order)
+        deck.cursor = self.cursor
+        deck.discarded = list(self.discarded)
+        return deck
+
     def remaining(self):
         """Return the number of tiles left in the deck."""
-        return len(self.tiles)
\ No newline at end of file
+        return self.cursor
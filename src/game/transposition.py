@@ -0,0 +1,54 @@
+class TranspositionTable:
+    """
+    Fixed-size table of search statistics (visits, total reward) keyed by
+    position hash, so a search that reaches one position by different move
+    orders, or searches it again later, starts from what it already knows.
+
+    The table is direct-mapped: a hash lives in slot hash & (size - 1).
+    When two positions want the same slot, the resident stays if it was
+    stored during the current search and has more visits than the
+    newcomer; entries left over from earlier searches are always replaced.
+    """
+
+    def __init__(self, size_bits=16):
+        self.size = 1 << size_bits
+        self.mask = self.size - 1
+        self.keys = [None] * self.size
+        self.visits = [0] * self.size
+        self.totals = [0.0] * self.size
+        self.ages = [0] * self.size
+        self.generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.replacements = 0
+
+    def new_search(self):
+        """Mark every stored entry as stale (still readable, but replaceable)."""
+        self.generation += 1
+
+    def lookup(self, key):
+        """Return (visits, total) stored for key, or None."""
+        slot = key & self.mask
+        if self.keys[slot] == key:
+            self.hits += 1
+            return self.visits[slot], self.totals[slot]
+        self.misses += 1
+        return None
+
+    def store(self, key, visits, total):
+        """Record statistics for key. Returns False if the slot was kept."""
+        slot = key & self.mask
+        resident = self.keys[slot]
+        if resident is not None and resident != key:
+            if self.ages[slot] == self.generation and self.visits[slot] > visits:
+                return False
+            self.replacements += 1
+        self.keys[slot] = key
+        self.visits[slot] = visits
+        self.totals[slot] = total
+        self.ages[slot] = self.generation
+        return True
+
+    def __len__(self):
+        return self.size - self.keys.count(None)
@@ -0,0 +1,61 @@
+"""
+Zobrist keys for hashing game positions.
+
+A position's hash is the XOR of one random 64-bit key per feature: each
+placed tile with its chain label, each corporation's stock pool, each
+player's holdings and cash, whose turn it is and the turn phase. Board,
+Corporation and Player keep their part up to date as they change, and
+GameLogic.position_hash() combines them. Tiles in hand and the deck are
+left out, so positions that differ only in hidden tiles hash the same.
+
+Keys come from a fixed seed, so hashes agree across processes and runs.
+"""
+import random
+from functools import lru_cache
+
+from utils.constants import BOARD_WIDTH, BOARD_HEIGHT, CORPORATION_COLORS
+
+MASK = (1 << 64) - 1
+MAX_SEATS = 6
+MAX_SHARES = 64  # Comfortably above the 25 shares of each chain
+
+# Cell label -> column of CELL_KEYS; 0 is an independent tile.
+LABELS = {None: 0}
+for _i, _name in enumerate(CORPORATION_COLORS):
+    LABELS[_name] = _i + 1
+
+_rng = random.Random(0x2B7E151628AED2A6)
+
+
+def _keys(count):
+    return [_rng.getrandbits(64) for _ in range(count)]
+
+
+CELL_KEYS = [_keys(len(LABELS)) for _ in range(BOARD_WIDTH * BOARD_HEIGHT)]
+POOL_KEYS = {name: _keys(MAX_SHARES) for name in CORPORATION_COLORS}
+HOLDING_KEYS = {name: _keys(MAX_SHARES) for name in CORPORATION_COLORS}
+SEAT_KEYS = _keys(MAX_SEATS)
+PHASE_KEYS = dict(zip(
+    ("tile_placement", "chain_founding", "merger_resolution", "buy_stock",
+     "draw_tile", "end_turn", "end_game"),
+    _keys(7)))
+# Progress through a merger: [defunct chain index][shareholder index]
+MERGER_KEYS = [_keys(MAX_SEATS + 1) for _ in range(4)]
+
+
+@lru_cache(maxsize=None)
+def money_key(money):
+    """
+    Scatter an amount of cash over 64 bits (the splitmix64 finaliser).
+    Cached: games only ever see a few thousand distinct amounts.
+    """
+    x = (money * 0x9E3779B97F4A7C15) & MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK
+    return x ^ (x >> 31)
+
+
+def seat_mix(key, seat):
+    """Rotate a player's hash by seat, so swapping two players changes it."""
+    shift = seat * 11
+    return ((key << shift) | (key >> (64 - shift))) & MASK if shift else key
@@ -1,3 +1,5 @@
+import os
+
 import pygame
 from pygame.locals import *
 from utils.constants import *
@@ -6,6 +8,7 @@ from utils.helpers import *
 import ui.board_renderer as br
 from ui.board_renderer import BoardRenderer
 from utils.handle_events import EventHandler
+from utils.profiler import FrameProfiler
 
 #TODO: Allow choice when merged chains are equal in size.
 #TODO: The game doesn't seem to be iterating through players properly during a merge. (Maybe add a print(player) statement before and after each player's convert/sell action to verify)
@@ -14,16 +17,22 @@ from utils.handle_events import EventHandler
 #TODO: When a merger happens, no players are gaining money for bonuses. (or sales)
 #TODO: It doesn't seem to be recognizing the correct amount of held stocks for the human player when the AI initiates a merger.
 #TODO: It is not selling stocks properly when player ineracts with merger dialog
-#TODO: AI seems to buy too many stocks at once? It shows they're only adding 3 to their holdings, but more than 3 are removed from chain.
 #TODO: Technically, when merging you can Keep/Sell/Trade, need to implement the "Keep" option as well as how many of each for each function.
 #TODO: If all tiles would cause a new chain but no chains are avaiable (i.e. no playable tiles), reset hand.
 #TODO: Make the AI Smarter.
 #TODO: Endgame & Scoring Not Yet Implemented.
 
 
+# The only events the UI reacts to; everything else is dropped by SDL.
+HANDLED_EVENTS = [QUIT, VIDEORESIZE, MOUSEBUTTONDOWN, MOUSEWHEEL, KEYDOWN, WINDOWEXPOSED, VIDEOEXPOSE]
+
+
 class Game:
-    def __init__(self):
+    def __init__(self, event_driven=True):
         pygame.init()
+        # Block on input instead of polling while nothing is happening
+        self.event_driven = event_driven
+        self.idle_timeout_ms = 500
         self.window_width = 1200
         self.window_height = 800
         self.right_sidebar_width = 300
@@ -43,6 +52,8 @@ class Game:
             vsync=1
         )
         pygame.display.set_caption("Acquire")
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(HANDLED_EVENTS)
         self.clock = pygame.time.Clock()
         self.running = True
 
@@ -78,7 +89,8 @@ class Game:
         self.corporations = {name: Corporation(name) for name in CORPORATION_COLORS.keys()}
 
         # Initialize game log.
-        self.log_messages = []
+        from game.game_log import GameLog
+        self.log_messages = GameLog()
         self.log_messages.append("Game started.")
 
         # Initialize game logic.
@@ -88,6 +100,15 @@ class Game:
         # For UI: selected tile index (for human player)
         self.selected_tile_index = None
 
+        # Frame-time profiler: F3 toggles it and its overlay. ACQUIRE_PROFILE=1
+        # starts it on and prints the table at exit; any other value is a path
+        # to dump the numbers to as JSON.
+        self.profile_output = os.environ.get("ACQUIRE_PROFILE")
+        self.profiler = FrameProfiler()
+        self._instrument()
+        if self.profile_output:
+            self.profiler.enable()
+
     def initialize_players(self, num_players):
         from game.player import Player
         from game.ai_player import AIPlayer
@@ -97,19 +118,89 @@ class Game:
         for player in self.players:
             print(player)
 
+    def _instrument(self):
+        profiler = self.profiler
+        logic = self.logic
+        profiler.instrument(self.event_handler, "handle_events", "events")
+        profiler.instrument(logic, "process_turn", lambda: "logic." + logic.turn_phase)
+        profiler.instrument(logic, "_process_merger_resolution", "logic.merger_step")
+        profiler.instrument(self.renderer, "draw", "draw")
+        for panel in ("background", "grid", "status", "log", "player_info", "modal"):
+            profiler.instrument(self.renderer, "_draw_" + panel, "draw." + panel)
+        profiler.instrument(self, "_present", "present")
+
+    def toggle_profiler(self):
+        self.profiler.toggle()
+        self.renderer.invalidate()  # Paint over the overlay when it goes away
+
     def run(self):
         try:
-            while self.running:
-                self.clock.tick(60)
-                self.event_handler.handle_events()
-                # Process AI turns and human draw/end phases.
-                self.logic.process_turn(self.log_messages)
-                self.renderer.draw()
-                pygame.display.flip()
+            if self.event_driven:
+                self._run_event_driven()
+            else:
+                self._run_polling()
         except Exception as e:
             print(f"An error occurred: {e}")
         finally:
             pygame.quit()
+            self._dump_profile()
+
+    def _dump_profile(self):
+        if not self.profiler.samples:
+            return
+        if self.profile_output and self.profile_output != "1":
+            self.profiler.dump(self.profile_output)
+        else:
+            print(self.profiler.report())
+
+    def _present(self):
+        """Draw what changed (and the profiler overlay, when on) and show it."""
+        dirty = self.renderer.draw()
+        if self.profiler.enabled:
+            dirty = dirty + [self.profiler.draw_overlay(self.screen, self.renderer.text)]
+        if dirty:
+            pygame.display.update(dirty)
+
+    def _run_polling(self):
+        while self.running:
+            self.clock.tick(60)
+            self.event_handler.handle_events()
+            # Process AI turns and human draw/end phases.
+            self.logic.process_turn(self.log_messages)
+            # Present only the parts of the screen that changed
+            self._present()
+
+    def _run_event_driven(self):
+        """
+        Step the game at up to 60 frames a second while AI turns are being
+        played, and sleep in pygame.event.wait() while the game is waiting
+        on the human: then nothing runs until input arrives (or the timeout
+        passes, as a safety net).
+        """
+        self.renderer.draw()
+        pygame.display.flip()
+        busy = True
+        while self.running:
+            if busy:
+                self.clock.tick(60)
+                handled = self.event_handler.handle_events()
+            else:
+                event = pygame.event.wait(self.idle_timeout_ms)
+                handled = self.event_handler.handle_events([event] + pygame.event.get()) \
+                    if event.type != NOEVENT else 0
+
+            before = self._logic_signature()
+            self.logic.process_turn(self.log_messages)
+            busy = self._logic_signature() != before
+
+            if busy or handled:
+                self._present()
+
+    def _logic_signature(self):
+        """Changes whenever a step of the game logic did something."""
+        logic = self.logic
+        return (logic.position_hash(), logic.turn_phase, logic.current_turn_index,
+                self.log_messages.total, self.founding_phase)
 
 if __name__ == "__main__":
     game = Game()
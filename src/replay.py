@@ -0,0 +1,52 @@
+"""
+Check or view recorded games (see game/game_record.py and game/replay.py).
+
+Examples (from src/):
+
+    python replay.py games.aqgr --verify
+    python replay.py games.aqgr --game 12 --turn 30
+"""
+import argparse
+import itertools
+import time
+
+from game.game_record import read_records
+from game.replay import Replay, verify_records
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Verify or view recorded Acquire games.")
+    parser.add_argument("file", help="game record file")
+    parser.add_argument("--verify", action="store_true",
+                        help="replay every game headlessly and check its final position")
+    parser.add_argument("--game", type=int, default=0, help="index of the game to view")
+    parser.add_argument("--turn", type=int, default=0, help="turn to open the viewer at")
+    parser.add_argument("--keyframes", type=int, default=10,
+                        help="turns between keyframe snapshots in the viewer")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.verify:
+        start = time.perf_counter()
+        checked, failed = verify_records(args.file)
+        elapsed = time.perf_counter() - start
+        for index, seed in failed:
+            print(f"game {index} (seed {seed}) did not replay to its recorded result")
+        print(f"{checked - len(failed)}/{checked} games verified in {elapsed:.2f}s "
+              f"({checked / max(elapsed, 1e-9):.1f} games/s)")
+        return
+
+    record = next(itertools.islice(read_records(args.file), args.game, None), None)
+    if record is None:
+        print(f"{args.file} has no game {args.game}")
+        return
+    from ui.replay_viewer import ReplayViewer
+    viewer = ReplayViewer(Replay(record, args.keyframes))
+    viewer.seek(args.turn)
+    viewer.run()
+
+
+if __name__ == "__main__":
+    main()
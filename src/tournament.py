@@ -0,0 +1,143 @@
+"""
+Run many seeded AI-vs-AI games across all cores and report aggregate stats.
+
+Example (from src/):
+
+    python tournament.py --games 1000 --players 4 --ai basic
+
+With --record FILE every game is also saved as a binary game record
+(see game/game_record.py). --moves drives each game move by move through
+GameLogic.make_move, so the records hold every merger choice too.
+"""
+import argparse
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from game.game_record import MOVES, TURNS, GameRecordWriter
+from game.headless import AI_TYPES, HeadlessGame
+
+
+def play_games(seeds, ai_types, record=False, driver=TURNS):
+    """
+    Worker entry point: play one game per seed. Returns the GameResults,
+    and the games' records as bytes (None unless record is set).
+    """
+    player_classes = [AI_TYPES[name] for name in ai_types]
+    recorder = GameRecordWriter(io.BytesIO(), write_header=False) if record else None
+    results = [HeadlessGame(len(player_classes), seed, player_classes, recorder=recorder,
+                            driver=driver).run()
+               for seed in seeds]
+    if recorder is None:
+        return results, None
+    recorder.flush()
+    return results, recorder.file.getvalue()
+
+
+class TournamentStats:
+    """Running totals per seat, updated as results come back."""
+
+    def __init__(self, ai_types):
+        self.ai_types = ai_types
+        self.games = 0
+        self.completed = 0
+        self.total_turns = 0
+        self.wins = [0.0] * len(ai_types)
+        self.cash = [0] * len(ai_types)
+        self.search_rates = [[] for _ in ai_types]
+
+    def add(self, result):
+        self.games += 1
+        self.completed += result.completed
+        self.total_turns += result.turns
+        for seat, name in enumerate(result.player_names):
+            self.cash[seat] += result.final_cash[name]
+            if name in result.search_rates:
+                self.search_rates[seat].append(result.search_rates[name])
+            if name in result.winners:
+                # Shared wins are split between the tied players.
+                self.wins[seat] += 1 / len(result.winners)
+
+    def report(self, elapsed):
+        games = max(self.games, 1)
+        print(f"\n{self.games} games in {elapsed:.2f}s "
+              f"({self.games / elapsed:.1f} games/s), "
+              f"average length {self.total_turns / games:.1f} turns, "
+              f"{self.completed} finished normally")
+        print(f"{'Seat':<6}{'AI':<10}{'Win rate':>10}{'Avg cash':>12}{'Iter/s':>10}")
+        for seat, ai_type in enumerate(self.ai_types):
+            rates = self.search_rates[seat]
+            rate = f"{sum(rates) / len(rates):.0f}" if rates else "-"
+            print(f"{seat + 1:<6}{ai_type:<10}{self.wins[seat] / games:>10.1%}"
+                  f"{self.cash[seat] / games:>12.0f}{rate:>10}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run seeded AI-vs-AI Acquire games.")
+    parser.add_argument("--games", type=int, default=100, help="number of games to play")
+    parser.add_argument("--players", type=int, default=3, help="seats per game (2-6)")
+    parser.add_argument("--ai", default="basic",
+                        help="comma-separated AI type per seat; one type fills every seat "
+                             f"(available: {', '.join(AI_TYPES)})")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--chunk", type=int, default=None,
+                        help="games per worker task (default: sized from --games and --workers)")
+    parser.add_argument("--quiet", action="store_true", help="don't print a line per game")
+    parser.add_argument("--record", metavar="FILE", help="save every game to a game record file")
+    parser.add_argument("--moves", action="store_true",
+                        help="drive games through GameLogic.make_move, recording every move")
+    args = parser.parse_args(argv)
+
+    if not 2 <= args.players <= 6:
+        parser.error("--players must be between 2 and 6")
+    ai_types = args.ai.split(",")
+    if len(ai_types) == 1:
+        ai_types = ai_types * args.players
+    if len(ai_types) != args.players:
+        parser.error(f"--ai lists {len(ai_types)} seats but --players is {args.players}")
+    unknown = [name for name in ai_types if name not in AI_TYPES]
+    if unknown:
+        parser.error(f"unknown AI type(s): {', '.join(unknown)}")
+    if args.record and args.seed < 0:
+        parser.error("--seed must not be negative when recording")
+    args.ai_types = ai_types
+    if args.chunk is None:
+        # Small enough to keep every worker busy to the end, big enough that
+        # pickling results doesn't dominate.
+        args.chunk = max(1, min(50, args.games // (args.workers * 8)))
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    stats = TournamentStats(args.ai_types)
+    # Workers send back their games' records; only this process writes the file
+    archive = GameRecordWriter(open(args.record, "wb")) if args.record else None
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = []
+        for first in range(0, args.games, args.chunk):
+            seeds = range(args.seed + first, args.seed + min(first + args.chunk, args.games))
+            futures.append(executor.submit(play_games, seeds, args.ai_types, archive is not None,
+                                           MOVES if args.moves else TURNS))
+        for future in as_completed(futures):
+            results, records = future.result()
+            if records:
+                archive.write_records(records)
+            for result in results:
+                stats.add(result)
+                if not args.quiet:
+                    print(f"[{stats.games}/{args.games}] seed {result.seed}: "
+                          f"{', '.join(result.winners)} won in {result.turns} turns")
+
+    if archive is not None:
+        archive.close()
+    stats.report(time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
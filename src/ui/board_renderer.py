@@ -2,219 +2,340 @@ import pygame
 from pygame.locals import *
 from utils.constants import *
 from utils.helpers import *
+from utils.text_cache import TextCache
+from ui.tile_atlas import TileAtlas
+from ui.log_view import LogView
+from game.game_logic import bonus_payouts
 
 class BoardRenderer:
+    """
+    Draws the game with dirty rectangles: each panel (board cells, hotel
+    status, log, player info) is redrawn only when the state it shows has
+    changed, and draw() returns the screen areas that were touched so the
+    main loop can present just those with pygame.display.update(rects).
+
+    Modal dialogs (chain selection, merger resolution, final scores) dim
+    the whole window, so while one is up any change redraws everything.
+    """
+
     def __init__(self, game):
         self.game = game
         self.stock_buy_buttons = None
         self.pass_button_rect = None
-        self.pass_button_rect = None
         self.merger_ui_buttons = None
         self.chain_options = []
         self.tile_rects = []
+        # Fonts and rendered strings, shared by every panel and dialog
+        self.text = TextCache()
+        # Pre-rendered board cells and hand icons
+        self.atlas = TileAtlas(self.text)
+        self._log_view = None
 
-        
+        # What was on screen after the last draw(), to find what changed
+        self._layout = None
+        self._full_redraw = True
+        self._board_hash = None
+        self._cell_colors = None
+        self._signatures = {}
+        self._modal = None
+
+    def invalidate(self):
+        """Redraw everything on the next draw(), e.g. after the window changes."""
+        self._full_redraw = True
 
     def draw(self):
-            self.game.screen.fill((30, 30, 30))
-            
-            # --- Define Sidebar Areas ---
-            right_sidebar = pygame.Rect(
-                self.game.window_width - self.game.right_sidebar_width, 0,
-                self.game.right_sidebar_width, self.game.window_height
-            )
-            pygame.draw.rect(self.game.screen, (70, 70, 70), right_sidebar)
-            
-            # Hotel Status Area (top of right sidebar)
-            status_area = pygame.Rect(
-                self.game.window_width - self.game.right_sidebar_width, 0,
-                self.game.right_sidebar_width, self.game.status_area_height
-            )
-            pygame.draw.rect(self.game.screen, (100, 100, 100), status_area)
-            
-            # Log Area (remaining part of right sidebar)
-            log_area = pygame.Rect(
-                self.game.window_width - self.game.right_sidebar_width, self.game.status_area_height,
-                self.game.right_sidebar_width, self.game.window_height - self.game.status_area_height
-            )
-            pygame.draw.rect(self.game.screen, (90, 90, 90), log_area)
-            
-            # --- Left Main Area (Grid and Player Info) ---
-            left_area = pygame.Rect(
-                0, 0,
-                self.game.window_width - self.game.right_sidebar_width, self.game.window_height
-            )
-            
-            # Grid Area: the upper part of left_area (above the player info area)
-            grid_area = pygame.Rect(
-                0, 0,
-                left_area.width, left_area.height - self.game.bottom_info_height
-            )
-            pygame.draw.rect(self.game.screen, (30, 30, 30), grid_area)
-            
-            # Player Info Area: at the bottom of left_area
-            player_info_area = pygame.Rect(
-                0, left_area.height - self.game.bottom_info_height,
-                left_area.width, self.game.bottom_info_height
-            )
-            pygame.draw.rect(self.game.screen, (60, 60, 60), player_info_area)
-            
-            # --- Calculate Scale and Offsets for the Grid ---
-            grid_native_width = BOARD_WIDTH * TILE_SIZE
-            grid_native_height = BOARD_HEIGHT * TILE_SIZE
-            scale_x = grid_area.width / grid_native_width
-            scale_y = grid_area.height / grid_native_height
-            scale = min(scale_x, scale_y)
-            
-            scaled_grid_width = grid_native_width * scale
-            scaled_grid_height = grid_native_height * scale
-            offset_x = grid_area.x + (grid_area.width - scaled_grid_width) / 2
-            offset_y = grid_area.y + (grid_area.height - scaled_grid_height) / 2
-            
-            grid_font = pygame.font.SysFont(None, int(24 * scale))
-            
-            # --- Draw the Grid using the Tile objects ---
-            for col in range(BOARD_WIDTH):
-                for row in range(BOARD_HEIGHT):
-                    tile = self.game.grid_tiles[col][row]
-                    cell = self.game.board.state[col][row]
-                    if cell is None:
-                        # Draw the empty grid background (or skip drawing a tile)
-                        tile.color = BOARD_BACKGROUND_COLOR
-                    else:
-                        if cell["chain"] is not None:
-                            # Get the color of the corresponding hotel chain
-                            chain_name = cell["chain"]
-                            tile.color = self.game.corporations[chain_name].color  # Use the corporation's assigned color
-                        else:
-                            tile.color = (TILE_COLOR_INDEPENDENT)  # Default color for independent tiles
-                    tile.draw(self.game.screen, offset_x, offset_y, scale, grid_font)
-            
-            # --- Draw Hotel Status from Corporations ---
-            sidebar_font = pygame.font.SysFont(None, 20)
-            line_height = 22
-            for i, corp in enumerate(self.game.corporations.values()):
-                # Render corporation name in its color
-                name_surface = sidebar_font.render(corp.name, True, corp.color)
-                # Render other details in white
-                details_text = f": Size {corp.size}, Value ${corp.current_value}, Stocks {corp.stocks_remaining}"
-                details_surface = sidebar_font.render(details_text, True, (255, 255, 255))
-                
-                # Combine surfaces horizontally
-                total_width = name_surface.get_width() + details_surface.get_width()
-                combined_surface = pygame.Surface((total_width, line_height), pygame.SRCALPHA)
-                combined_surface.blit(name_surface, (0, 0))
-                combined_surface.blit(details_surface, (name_surface.get_width(), 0))
-                
-                self.game.screen.blit(combined_surface, (status_area.x + 5, status_area.y + 5 + i * line_height))
+        """Bring the screen up to date. Returns the list of rects that changed."""
+        layout = self._get_layout()
+        signatures = {
+            "status": self._status_signature(),
+            "log": self._log_signature(),
+            "player": self._player_signature(),
+        }
+        board_hash = self.game.board.hash
+        modal = self._modal_signature()
 
-            
-            # --- Draw Log Messages in the Log Area ---
-            log_font = pygame.font.SysFont(None, 20)
-            max_log_lines = (log_area.height - 10) // line_height
-            log_to_display = self.game.log_messages[-max_log_lines:]
-            for i, msg in enumerate(log_to_display):
-                text_surface = log_font.render(msg, True, (255, 255, 255))
-                self.game.screen.blit(text_surface, (log_area.x + 5, log_area.y + 5 + i * line_height))
-            
-            # --- Draw Human Player Status ---
-            human_player = self.game.players[0]
-            player_font = pygame.font.SysFont(None, 20)
-            line_height = 22
-
-            # Left half: text info
-            info_lines = [
-                f"Player: {human_player.name}",
-                f"Money: ${human_player.money}",
-                "Stocks:"
-            ]
-            for i, line in enumerate(info_lines):
-                text_surface = player_font.render(line, True, (255, 255, 255))
-                self.game.screen.blit(text_surface, (player_info_area.x + 5, player_info_area.y + 5 + i * line_height))
-
-            # Stocks with colored names
-            stock_start_y = player_info_area.y + 5 + (len(info_lines)) * line_height
-            current_y = stock_start_y
-
-            for corp in self.game.corporations.values():
-                if human_player.stocks[corp.name] == 0:
+        changed = [name for name, sig in signatures.items() if self._signatures.get(name) != sig]
+        board_changed = board_hash != self._board_hash
+        full = (self._full_redraw or layout is not self._layout or modal != self._modal
+                or (modal[0] and (changed or board_changed)))
+
+        self._layout = layout
+        self._signatures = signatures
+        self._board_hash = board_hash
+        self._modal = modal
+        self._full_redraw = False
+
+        if full:
+            self._draw_background(layout)
+            self._draw_grid(layout, full=True)
+            self._draw_status(layout)
+            self._draw_log(layout)
+            self._draw_player_info(layout)
+            self._draw_modal()
+            return [self.game.screen.get_rect()]
+
+        dirty = []
+        if board_changed:
+            dirty.extend(self._draw_grid(layout, full=False))
+        if "status" in changed:
+            dirty.append(self._draw_status(layout))
+        if "log" in changed:
+            dirty.append(self._draw_log(layout))
+        if "player" in changed:
+            dirty.append(self._draw_player_info(layout))
+        return dirty
+
+    # --- change detection ---------------------------------------------------
+
+    def _status_signature(self):
+        return tuple((corp.size, corp.stocks_remaining) for corp in self.game.corporations.values())
+
+    def _market_open(self):
+        return (self.game.logic.turn_phase == "buy_stock"
+                and any(corp.size >= 2 for corp in self.game.corporations.values()))
+
+    def _log_signature(self):
+        # The stock market is drawn over the log area, so it counts as part of it
+        market = self._status_signature() if self._market_open() else None
+        return self.log_view.signature(), market
+
+    @property
+    def log_view(self):
+        """The scrollable view of the game's log."""
+        if self._log_view is None or self._log_view.log is not self.game.log_messages:
+            self._log_view = LogView(self.game.log_messages, self.text.font(20))
+        return self._log_view
+
+    def _player_signature(self):
+        human = self.game.players[0]
+        return human.money, tuple(human.stocks.values()), tuple(human.tiles_in_hand)
+
+    def _merger_dialog_open(self):
+        state = self.game.logic.merger_state
+        if not state:
+            return False
+        current_chain = state['losing_chains'][state['current_chain_idx']][0]
+        return any(p.is_human and p.stocks.get(current_chain, 0) > 0 for p in self.game.players)
+
+    def _modal_signature(self):
+        """(whether a modal dialog is up, what it shows)."""
+        founding = self.game.founding_phase
+        merger = self._merger_dialog_open()
+        end_game = self.game.logic.turn_phase == "end_game"
+        details = None
+        if founding:
+            details = tuple(chain.name for chain in self.game.available_chains)
+        elif merger:
+            state = self.game.logic.merger_state
+            details = (state['current_chain_idx'], state['current_player_idx'], state['phase'])
+        return founding or merger or end_game, founding, merger, end_game, details
+
+    # --- layout -------------------------------------------------------------
+
+    def _get_layout(self):
+        """Screen areas and grid scale, recomputed only when the window size changes."""
+        game = self.game
+        size = (game.window_width, game.window_height)
+        if self._layout is not None and self._layout["size"] == size:
+            return self._layout
+
+        right_sidebar = pygame.Rect(
+            game.window_width - game.right_sidebar_width, 0,
+            game.right_sidebar_width, game.window_height
+        )
+        # Hotel Status Area (top of right sidebar)
+        status_area = pygame.Rect(
+            game.window_width - game.right_sidebar_width, 0,
+            game.right_sidebar_width, game.status_area_height
+        )
+        # Log Area (remaining part of right sidebar)
+        log_area = pygame.Rect(
+            game.window_width - game.right_sidebar_width, game.status_area_height,
+            game.right_sidebar_width, game.window_height - game.status_area_height
+        )
+        # --- Left Main Area (Grid and Player Info) ---
+        left_area = pygame.Rect(0, 0, game.window_width - game.right_sidebar_width, game.window_height)
+        # Grid Area: the upper part of left_area (above the player info area)
+        grid_area = pygame.Rect(0, 0, left_area.width, left_area.height - game.bottom_info_height)
+        # Player Info Area: at the bottom of left_area
+        player_info_area = pygame.Rect(
+            0, left_area.height - game.bottom_info_height,
+            left_area.width, game.bottom_info_height
+        )
+        # Right half of the player info: hand area
+        hand_area = pygame.Rect(
+            player_info_area.x + player_info_area.width / 2,
+            player_info_area.y,
+            player_info_area.width / 2,
+            player_info_area.height
+        )
+
+        # --- Calculate Scale and Offsets for the Grid ---
+        grid_native_width = BOARD_WIDTH * TILE_SIZE
+        grid_native_height = BOARD_HEIGHT * TILE_SIZE
+        scale = min(grid_area.width / grid_native_width, grid_area.height / grid_native_height)
+        offset_x = grid_area.x + (grid_area.width - grid_native_width * scale) / 2
+        offset_y = grid_area.y + (grid_area.height - grid_native_height * scale) / 2
+
+        return {
+            "size": size,
+            "right_sidebar": right_sidebar,
+            "status_area": status_area,
+            "log_area": log_area,
+            "grid_area": grid_area,
+            "player_info_area": player_info_area,
+            "hand_area": hand_area,
+            "scale": scale,
+            "offset": (offset_x, offset_y),
+        }
+
+    # --- panels -------------------------------------------------------------
+
+    def _draw_background(self, layout):
+        self.game.screen.fill((30, 30, 30))
+        pygame.draw.rect(self.game.screen, (70, 70, 70), layout["right_sidebar"])
+
+    def _cell_color(self, cell):
+        if cell is None:
+            return BOARD_BACKGROUND_COLOR  # Empty grid background
+        if cell["chain"] is not None:
+            return self.game.corporations[cell["chain"]].color  # The chain's assigned color
+        return TILE_COLOR_INDEPENDENT  # Default color for independent tiles
+
+    def _draw_grid(self, layout, full):
+        """Draw the board cells; all of them, or only those whose colour changed."""
+        screen = self.game.screen
+        if full:
+            pygame.draw.rect(screen, (30, 30, 30), layout["grid_area"])
+            self._cell_colors = [[None] * BOARD_HEIGHT for _ in range(BOARD_WIDTH)]
+
+        scale = layout["scale"]
+        offset_x, offset_y = layout["offset"]
+        self.atlas.set_scale(scale)
+        sprites = []
+        dirty = []
+        for col in range(BOARD_WIDTH):
+            drawn = self._cell_colors[col]
+            column = self.game.board.state[col]
+            for row in range(BOARD_HEIGHT):
+                color = self._cell_color(column[row])
+                if color == drawn[row]:
                     continue
-                
-                # Render corporation name in its color
-                name_surface = player_font.render(f"{corp.name}: ", True, corp.color)
-                # Render stock count in white
-                count_surface = player_font.render(str(human_player.stocks[corp.name]), True, (255, 255, 255))
-                
-                # Combine and blit
-                total_width = name_surface.get_width() + count_surface.get_width()
-                combined_surface = pygame.Surface((total_width, line_height), pygame.SRCALPHA)
-                combined_surface.blit(name_surface, (0, 0))
-                combined_surface.blit(count_surface, (name_surface.get_width(), 0))
-                
-                self.game.screen.blit(combined_surface, (player_info_area.x + 5, current_y))
-                current_y += line_height
-            
-            # Right half: hand area
-            hand_area = pygame.Rect(
-                player_info_area.x + player_info_area.width / 2,
-                player_info_area.y,
-                player_info_area.width / 2,
-                player_info_area.height
-            )
-            pygame.draw.rect(self.game.screen, (0, 0, 0), hand_area, 2)
-
-            # Calculate tile rendering parameters
-            num_tiles = len(human_player.tiles_in_hand)
-            spacing = 5
-            max_icon_size = hand_area.height - 10  # This is the vertical limit
-            hand_font = pygame.font.SysFont(None, 16)  # Define the font here
-
-            if num_tiles > 0:
-                total_spacing = spacing * (num_tiles - 1)
-                available_width = hand_area.width - total_spacing
-                icon_size = min(available_width / num_tiles, max_icon_size)
-                start_x = hand_area.x + (hand_area.width - (num_tiles * icon_size + total_spacing)) / 2
-            else:
-                icon_size = max_icon_size
-                start_x = hand_area.x
-
-            self.tile_rects = []
-
-            # Draw each tile icon
-            for i, tile_coord in enumerate(human_player.tiles_in_hand):
-                icon_x = start_x + i * (icon_size + spacing)
-                icon_rect = pygame.Rect(icon_x, hand_area.y + 5, icon_size, icon_size)
-                self.tile_rects.append((icon_rect, tile_coord))
-                draw_tile_icon(self.game.screen, tile_coord, icon_rect, hand_font)
-
-            if self.game.founding_phase:
-                self._draw_chain_selection()
-
-            # --- Draw Stock Market UI if in Buy Stock Phase and at least 1 chain is founded ---
-            if self.game.logic.turn_phase == "buy_stock" and any(corp.size >= 2 for corp in self.game.corporations.values()):
-                # Darken the log area
-                overlay = pygame.Surface((log_area.width, log_area.height), pygame.SRCALPHA)
-                overlay.fill((0, 0, 0, 128))  # Semi-transparent black
-                self.game.screen.blit(overlay, (log_area.x, log_area.y))
-                
-                # Draw the stock market UI
-                stock_market_rect = pygame.Rect(
-                    self.game.window_width - self.game.right_sidebar_width, self.game.status_area_height,
-                    self.game.right_sidebar_width, self.game.window_height - self.game.status_area_height
-                )
-                self.draw_stock_market(self.game.screen, stock_market_rect)
+                drawn[row] = color
+                tile = self.game.grid_tiles[col][row]
+                tile.color = color
+                rect = tile.get_rect(offset_x, offset_y, scale)
+                sprites.append((self.atlas.cell(tile.label, color), rect))
+                dirty.append(rect)
+        # One batched blit for every changed cell
+        screen.blits(sprites, doreturn=False)
+        return dirty
 
-            if self.game.logic.merger_state:
-                # Check if ANY human player has stocks in the current dissolving chain
-                current_chain = self.game.logic.merger_state['losing_chains'][self.game.logic.merger_state['current_chain_idx']][0]
-                human_has_stocks = any(p.is_human and p.stocks.get(current_chain, 0) > 0 
-                                    for p in self.game.players)
-                
-                if human_has_stocks:
-                    self._draw_merger_resolution()
+    def _draw_status(self, layout):
+        """Hotel status from the corporations."""
+        status_area = layout["status_area"]
+        pygame.draw.rect(self.game.screen, (100, 100, 100), status_area)
+        line_height = 22
+        for i, corp in enumerate(self.game.corporations.values()):
+            # Render corporation name in its color
+            name_surface = self.text.render(corp.name, 20, corp.color)
+            # Render other details in white
+            details_text = f": Size {corp.size}, Value ${corp.current_value}, Stocks {corp.stocks_remaining}"
+            details_surface = self.text.render(details_text, 20, (255, 255, 255))
+
+            # Blit the two side by side
+            x = status_area.x + 5
+            y = status_area.y + 5 + i * line_height
+            self.game.screen.blit(name_surface, (x, y))
+            self.game.screen.blit(details_surface, (x + name_surface.get_width(), y))
+        return status_area
+
+    def _draw_log(self, layout):
+        """Log messages, with the stock market over them during the buy phase."""
+        log_area = layout["log_area"]
+        pygame.draw.rect(self.game.screen, (90, 90, 90), log_area)
+        self.log_view.draw(self.game.screen, log_area)
+
+        # --- Stock Market UI if in Buy Stock Phase and at least 1 chain is founded ---
+        if self._market_open():
+            # Darken the log area
+            overlay = pygame.Surface((log_area.width, log_area.height), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 128))  # Semi-transparent black
+            self.game.screen.blit(overlay, (log_area.x, log_area.y))
+            self.draw_stock_market(self.game.screen, log_area)
+        return log_area
+
+    def _draw_player_info(self, layout):
+        """The human player's money, stocks and hand."""
+        player_info_area = layout["player_info_area"]
+        pygame.draw.rect(self.game.screen, (60, 60, 60), player_info_area)
+        human_player = self.game.players[0]
+        line_height = 22
+
+        # Left half: text info
+        info_lines = [
+            f"Player: {human_player.name}",
+            f"Money: ${human_player.money}",
+            "Stocks:"
+        ]
+        for i, line in enumerate(info_lines):
+            text_surface = self.text.render(line, 20, (255, 255, 255))
+            self.game.screen.blit(text_surface, (player_info_area.x + 5, player_info_area.y + 5 + i * line_height))
+
+        # Stocks with colored names
+        current_y = player_info_area.y + 5 + (len(info_lines)) * line_height
+        for corp in self.game.corporations.values():
+            if human_player.stocks[corp.name] == 0:
+                continue
+
+            # Render corporation name in its color
+            name_surface = self.text.render(f"{corp.name}: ", 20, corp.color)
+            # Render stock count in white
+            count_surface = self.text.render(str(human_player.stocks[corp.name]), 20, (255, 255, 255))
+
+            # Blit the two side by side
+            x = player_info_area.x + 5
+            self.game.screen.blit(name_surface, (x, current_y))
+            self.game.screen.blit(count_surface, (x + name_surface.get_width(), current_y))
+            current_y += line_height
+
+        # Right half: hand area
+        hand_area = layout["hand_area"]
+        pygame.draw.rect(self.game.screen, (0, 0, 0), hand_area, 2)
+
+        # Calculate tile rendering parameters
+        num_tiles = len(human_player.tiles_in_hand)
+        spacing = 5
+        max_icon_size = hand_area.height - 10  # This is the vertical limit
+
+        if num_tiles > 0:
+            total_spacing = spacing * (num_tiles - 1)
+            available_width = hand_area.width - total_spacing
+            icon_size = min(available_width / num_tiles, max_icon_size)
+            start_x = hand_area.x + (hand_area.width - (num_tiles * icon_size + total_spacing)) / 2
+        else:
+            icon_size = max_icon_size
+            start_x = hand_area.x
 
-            if self.game.logic.turn_phase == "end_game":
-                self._draw_final_scores()
+        self.tile_rects = []
+
+        # Draw each tile icon
+        for i, tile_coord in enumerate(human_player.tiles_in_hand):
+            icon_x = start_x + i * (icon_size + spacing)
+            icon_rect = pygame.Rect(icon_x, hand_area.y + 5, icon_size, icon_size)
+            self.tile_rects.append((icon_rect, tile_coord))
+            draw_tile_icon(self.game.screen, tile_coord, icon_rect, self.atlas)
+        return player_info_area
+
+    def _draw_modal(self):
+        if self.game.founding_phase:
+            self._draw_chain_selection()
+
+        if self._merger_dialog_open():
+            self._draw_merger_resolution()
+
+        if self.game.logic.turn_phase == "end_game":
+            self._draw_final_scores()
 
     def _draw_chain_selection(self):
         # Darken background
@@ -232,8 +353,7 @@ class BoardRenderer:
         pygame.draw.rect(self.game.screen, (200, 200, 200), box_rect, 2)
         
         # Draw prompt text
-        font = pygame.font.SysFont(None, 32)
-        text = font.render("Choose hotel chain to found:", True, (255, 255, 255))
+        text = self.text.render("Choose hotel chain to found:", 32, (255, 255, 255))
         self.game.screen.blit(text, (box_x + 20, box_y + 20))
         
         # Draw chain options
@@ -250,15 +370,47 @@ class BoardRenderer:
             pygame.draw.rect(self.game.screen, (255, 255, 255), btn_rect, 2)
             
             # Draw chain name
-            label = font.render(chain.name, True, (255, 255, 255))
+            label = self.text.render(chain.name, 32, (255, 255, 255))
             self.game.screen.blit(label, (x + 5, y + 5))
             
             self.chain_options.append((btn_rect, chain))
             x += btn_width + 20
 
+    def _draw_final_scores(self):
+        """Draw the final standings once GameLogic has scored the game."""
+        final_scores = self.game.logic.final_scores
+        if not final_scores:
+            return
+
+        # Darken background
+        overlay = pygame.Surface((self.game.window_width, self.game.window_height), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 128))
+        self.game.screen.blit(overlay, (0, 0))
+
+        # Draw scores box, one row per player
+        box_width = 400
+        box_height = 80 + 35 * len(final_scores)
+        box_x = (self.game.window_width - box_width) // 2
+        box_y = (self.game.window_height - box_height) // 2
+        box_rect = pygame.Rect(box_x, box_y, box_width, box_height)
+        pygame.draw.rect(self.game.screen, (50, 50, 50), box_rect)
+        pygame.draw.rect(self.game.screen, (200, 200, 200), box_rect, 2)
+
+        title = self.text.render("Final Scores", 32, (255, 255, 255))
+        self.game.screen.blit(title, (box_x + 20, box_y + 20))
+
+        # Players sharing the top cash all win
+        y = box_y + 60
+        for rank, player in enumerate(final_scores, 1):
+            color = (255, 215, 0) if player.money == final_scores[0].money else (255, 255, 255)
+            name = self.text.render(f"{rank}. {player.name}", 24, color)
+            money = self.text.render(f"${player.money}", 24, color)
+            self.game.screen.blit(name, (box_x + 20, y))
+            self.game.screen.blit(money, (box_x + box_width - 20 - money.get_width(), y))
+            y += 35
+
     def draw_stock_market(self, surface, rect):
-        font = pygame.font.SysFont(None, 24)
-        header = font.render("Stock Market", True, (255, 255, 255))
+        header = self.text.render("Stock Market", 24, (255, 255, 255))
         surface.blit(header, (rect.x + 10, rect.y + 10))
         
         y = rect.y + 40
@@ -270,9 +422,9 @@ class BoardRenderer:
                 continue
             
             # Colored name + price
-            name_text = font.render(f"{corp.name}:", True, corp.color)
-            price_text = font.render(f"${corp.get_stock_price()}", True, (255, 255, 255))
-            stocks_text = font.render(f"Stocks: {corp.stocks_remaining}", True, (255, 255, 255))
+            name_text = self.text.render(f"{corp.name}:", 24, corp.color)
+            price_text = self.text.render(f"${corp.get_stock_price()}", 24, (255, 255, 255))
+            stocks_text = self.text.render(f"Stocks: {corp.stocks_remaining}", 24, (255, 255, 255))
             
             # Draw corporation info
             surface.blit(name_text, (rect.x + 10, y))
@@ -282,7 +434,7 @@ class BoardRenderer:
             # Draw buy button
             button_rect = pygame.Rect(rect.x + 200, y, 80, 30)  # Make buttons bigger
             pygame.draw.rect(surface, (0, 200, 0), button_rect)
-            button_text = font.render("Buy", True, (0, 0, 0))
+            button_text = self.text.render("Buy", 24, (0, 0, 0))
             surface.blit(button_text, (button_rect.x + 30, button_rect.y + 8))  # Center text
             
             # Store button reference for this corporation
@@ -293,7 +445,7 @@ class BoardRenderer:
         # Draw "Pass" button
         self.pass_button_rect = pygame.Rect(rect.x + 10, y + 20, 100, 40)  # Make button bigger
         pygame.draw.rect(surface, (200, 60, 60), self.pass_button_rect)
-        pass_text = font.render("Pass", True, (255, 255, 255))
+        pass_text = self.text.render("Pass", 24, (255, 255, 255))
         surface.blit(pass_text, (self.pass_button_rect.x + 30, self.pass_button_rect.y + 12))  # Center text
 
     def show_merger_resolution_ui(self, dominant, losing_chains):
@@ -324,43 +476,25 @@ class BoardRenderer:
         pygame.draw.rect(self.game.screen, (50, 50, 50), box_rect)
         pygame.draw.rect(self.game.screen, (200, 200, 200), box_rect, 2)
         
-        font = pygame.font.SysFont(None, 32)
-        small_font = pygame.font.SysFont(None, 24)
-        
         if state['phase'] == 'bonuses':
             # Draw chain info
-            title = font.render(f"Merger Resolution: {chain_name} (Size {original_size})", True, chain.color)
+            title = self.text.render(f"Merger Resolution: {chain_name} (Size {original_size})", 32, chain.color)
             self.game.screen.blit(title, (box_x + 10, box_y + 20))
             
-            # Get shareholders
-            shareholders = sorted(self.game.players,
-                                key=lambda p: p.stocks[chain_name],
-                                reverse=True)
-            
-            # Draw bonuses
+            # Draw bonuses (already paid by GameLogic, from the pre-merger size)
             y = box_y + 60
-            if len(shareholders) > 0 and shareholders[0].stocks[chain_name] > 0:
-                majority_bonus = chain.current_bonus
-                text = small_font.render(
-                    f"Majority: {shareholders[0].name} - ${majority_bonus}",
-                    True, (255, 255, 255)
+            for seat, amount, kind in bonus_payouts(chain.shareholders, chain.bonus_at(original_size)):
+                text = self.text.render(
+                    f"{kind.capitalize()}: {self.game.players[seat].name} - ${amount}",
+                    24, (255, 255, 255)
                 )
                 self.game.screen.blit(text, (box_x + 40, y))
                 y += 30
                 
-            if len(shareholders) > 1 and shareholders[1].stocks[chain_name] > 0:
-                minority_bonus = chain.current_bonus // 2
-                text = small_font.render(
-                    f"Minority: {shareholders[1].name} - ${minority_bonus}",
-                    True, (255, 255, 255)
-                )
-                self.game.screen.blit(text, (box_x + 40, y))
-                y += 30
-            
             # Draw next button
             next_button = pygame.Rect(box_x + box_width - 120, box_y + box_height - 50, 100, 30)
             pygame.draw.rect(self.game.screen, (0, 200, 0), next_button)
-            next_text = font.render("Next", True, (255, 255, 255))
+            next_text = self.text.render("Next", 32, (255, 255, 255))
             self.game.screen.blit(next_text, (next_button.x + 20, next_button.y + 5))
             
             # Store button position for click detection
@@ -368,27 +502,27 @@ class BoardRenderer:
             
         elif state['phase'] == "stock_conversion":
             # Draw chain info
-            title = font.render(f"Stock Conversion: {chain_name}", True, chain.color)
+            title = self.text.render(f"Stock Conversion: {chain_name}", 32, chain.color)
             self.game.screen.blit(title, (box_x + 20, box_y + 20))
             
             # Get player stocks
-            current_player = self.game.logic.get_current_player()
+            current_player = state['players_to_process'][state['current_player_idx']]
             player_stocks = current_player.stocks.get(chain_name, 0)
             dominant_chain = self.game.logic.corporations[state['dominant']]
             
             # Draw stock info
             y = box_y + 60
-            text = small_font.render(
+            text = self.text.render(
                 f"You have: {player_stocks} {chain_name} stocks",
-                True, (255, 255, 255)
+                24, (255, 255, 255)
             )
             self.game.screen.blit(text, (box_x + 40, y))
             y += 30
             
             # Draw conversion options
-            text = small_font.render(
-                f"Convert 2:1 to {state['dominant']} or sell for half price (${chain.get_stock_price() // 2} each)",
-                True, (255, 255, 255)
+            text = self.text.render(
+                f"Convert 2:1 to {state['dominant']} or sell for half price (${chain.price_at(original_size) // 2} each)",
+                24, (255, 255, 255)
             )
             self.game.screen.blit(text, (box_x + 40, y))
             y += 40
@@ -398,34 +532,31 @@ class BoardRenderer:
             convert_enabled = player_stocks >= 2 and dominant_chain.stocks_remaining > 0
             btn_color = (0, 200, 0) if convert_enabled else (100, 100, 100)
             pygame.draw.rect(self.game.screen, btn_color, convert_button)
-            convert_text = font.render("Convert", True, (255, 255, 255))
+            convert_text = self.text.render("Convert", 32, (255, 255, 255))
             self.game.screen.blit(convert_text, (convert_button.x + 20, convert_button.y + 5))
             
             sell_button = pygame.Rect(box_x + 260, y, 200, 30)
             sell_enabled = player_stocks > 0
             btn_color = (200, 0, 0) if sell_enabled else (100, 100, 100)
             pygame.draw.rect(self.game.screen, btn_color, sell_button)
-            sell_text = font.render("Sell", True, (255, 255, 255))
+            sell_text = self.text.render("Sell", 32, (255, 255, 255))
             self.game.screen.blit(sell_text, (sell_button.x + 20, sell_button.y + 5))
 
+            # Store button positions for click detection
+            self.merger_ui_buttons = {
+                'convert': convert_button,
+                'sell': sell_button
+            }
+
             keep_button = pygame.Rect(box_x + 40, y + 40, 200, 30)
             pygame.draw.rect(self.game.screen, (0,0,200), keep_button)
-            keep_text = font.render("Keep", True, (255,255,255))
+            keep_text = self.text.render("Keep", 32, (255,255,255))
             self.game.screen.blit(keep_text, (keep_button.x+20, keep_button.y+5))
             self.merger_ui_buttons['keep'] = keep_button
 
             if not convert_enabled and not sell_enabled:
                 pass_button = pygame.Rect(box_x + 40, y + 40, 200, 30)
                 pygame.draw.rect(self.game.screen, (100,100,100), pass_button)
-                pass_text = font.render("Pass", True, (255,255,255))
+                pass_text = self.text.render("Pass", 32, (255,255,255))
                 self.game.screen.blit(pass_text, (pass_button.x + 20, pass_button.y + 5))
-                self.merger_ui_buttons['pass'] = pass_button
-            
-            # Store button positions for click detection
-            self.merger_ui_buttons = {
-                'convert': convert_button,
-                'sell': sell_button
-            }
-            
-        # Update display
-        pygame.display.flip()
\ No newline at end of file
+                self.merger_ui_buttons['pass'] = pass_button
\ No newline at end of file
@@ -0,0 +1,55 @@
+class LogView:
+    """
+    Scrollable view of a GameLog. Only the records that fit in the view
+    are rendered, and each line's surface is kept (by record) while it
+    stays on screen, so drawing a log that grew by one line renders one
+    line.
+
+    `back` is how many records the view is scrolled up from the newest.
+    While scrolled up the view stays on the same records as new ones come
+    in; at the bottom it follows the log.
+    """
+
+    def __init__(self, log, font, line_height=22, color=(255, 255, 255)):
+        self.log = log
+        self.font = font
+        self.line_height = line_height
+        self.color = color
+        self.back = 0
+        self.visible = 1  # Lines that fit, as of the last draw
+        self.rect = None  # Where the view was last drawn, for hit testing
+        self.lines = {}  # record seq -> rendered line
+        self._seen = log.total
+
+    def scroll(self, lines):
+        """Scroll up (positive) or down (negative) by a number of records."""
+        self.back = max(0, min(self.back + lines, len(self.log) - self.visible))
+
+    def signature(self):
+        """Changes whenever the view would show something different."""
+        self._follow()
+        return self.log.total, self.back
+
+    def _follow(self):
+        added = self.log.total - self._seen
+        self._seen = self.log.total
+        if self.back and added:
+            self.scroll(added)
+
+    def draw(self, surface, rect):
+        self.rect = rect
+        self._follow()
+        self.visible = max(1, (rect.height - 10) // self.line_height)
+        records = self.log.window(self.visible, self.back)
+
+        lines = {}
+        blits = []
+        for i, record in enumerate(records):
+            line = self.lines.get(record.seq)
+            if line is None:
+                line = self.font.render(record.text, True, self.color)
+            lines[record.seq] = line
+            blits.append((line, (rect.x + 5, rect.y + 5 + i * self.line_height)))
+        # Keep only what is on screen now
+        self.lines = lines
+        surface.blits(blits, doreturn=False)
@@ -0,0 +1,94 @@
+import pygame
+from pygame.locals import *
+
+from game.game_log import GameLog
+from game.tile import Tile
+from ui.board_renderer import BoardRenderer
+from utils.constants import BOARD_WIDTH, BOARD_HEIGHT, TILE_SIZE, TILE_COLOR
+
+
+class ReplayViewer:
+    """
+    Steps through a Replay in a window, drawn by BoardRenderer the same way
+    as a live game (the player panel shows the first seat).
+
+    Right/Left: next/previous turn. Up/Down: a keyframe interval forward or
+    back. Home/End: first/last turn. Esc or closing the window quits.
+    """
+
+    def __init__(self, replay):
+        pygame.init()
+        self.replay = replay
+        self.window_width = 1200
+        self.window_height = 800
+        self.right_sidebar_width = 300
+        self.bottom_info_height = 150
+        self.status_area_height = 250
+
+        self.screen = pygame.display.set_mode(
+            (self.window_width, self.window_height),
+            pygame.RESIZABLE | pygame.SCALED,
+            vsync=1
+        )
+        pygame.display.set_caption(f"Acquire replay: seed {replay.record.seed}")
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([QUIT, KEYDOWN, VIDEORESIZE, WINDOWEXPOSED, VIDEOEXPOSE])
+
+        # What BoardRenderer reads from a game
+        self.board = replay.board
+        self.corporations = replay.corporations
+        self.players = replay.players
+        self.logic = replay.logic
+        self.founding_phase = False
+        self.available_chains = []
+        self.grid_tiles = [[Tile(col, row, TILE_SIZE, TILE_COLOR) for row in range(BOARD_HEIGHT)]
+                           for col in range(BOARD_WIDTH)]
+        self.log_messages = GameLog()
+        self.log_messages.add("Replaying seed {} ({} turns)", replay.record.seed, replay.turns)
+
+        self.renderer = BoardRenderer(self)
+        self.running = True
+
+    def seek(self, turn):
+        turn = self.replay.seek(turn, self.log_messages)
+        if self.logic.turn_phase == "end_game":
+            # Score the game as a live one is, for the final scores dialog
+            self.logic.final_scoring(self.log_messages)
+        self.log_messages.add("Turn {} of {}", turn, self.replay.turns)
+
+    def handle_event(self, event):
+        step = self.replay.keyframe_interval
+        keys = {K_RIGHT: 1, K_LEFT: -1, K_UP: step, K_DOWN: -step}
+        if event.type == QUIT or (event.type == KEYDOWN and event.key == K_ESCAPE):
+            self.running = False
+        elif event.type == KEYDOWN and event.key in keys:
+            self.seek(self.replay.turn + keys[event.key])
+        elif event.type == KEYDOWN and event.key == K_HOME:
+            self.seek(0)
+        elif event.type == KEYDOWN and event.key == K_END:
+            self.seek(self.replay.turns)
+        elif event.type == VIDEORESIZE:
+            self.window_width, self.window_height = event.w, event.h
+            self.screen = pygame.display.set_mode(
+                (self.window_width, self.window_height),
+                pygame.RESIZABLE | pygame.SCALED,
+                vsync=1
+            )
+            self.renderer.invalidate()
+        elif event.type in (WINDOWEXPOSED, VIDEOEXPOSE):
+            self.renderer.invalidate()
+
+    def run(self):
+        try:
+            self.renderer.draw()
+            pygame.display.flip()
+            # Nothing moves on its own, so sleep until there is input
+            while self.running:
+                self.handle_event(pygame.event.wait())
+                for event in pygame.event.get():
+                    self.handle_event(event)
+                dirty = self.renderer.draw()
+                if dirty:
+                    pygame.display.update(dirty)
+        finally:
+            pygame.quit()
@@ -0,0 +1,42 @@
+"""Tests for ReplayViewer, drawn to a dummy video driver. Run from src/ with pytest."""
+import io
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from game.game_record import MOVES, TURNS, GameRecordWriter, read_records
+from game.headless import HeadlessGame
+from game.replay import Replay
+from ui.replay_viewer import ReplayViewer
+
+
+@pytest.mark.parametrize("driver", [TURNS, MOVES])
+def test_draws_every_turn_through_the_final_scores(driver):
+    file = io.BytesIO()
+    writer = GameRecordWriter(file)
+    result = HeadlessGame(3, 8, recorder=writer, driver=driver).run()
+    writer.flush()
+    file.seek(0)
+    (record,) = read_records(file)
+
+    viewer = ReplayViewer(Replay(record))
+    try:
+        assert viewer.renderer.draw()
+        for turn in (1, 2, viewer.replay.turns // 2, viewer.replay.turns):
+            viewer.seek(turn)
+            viewer.renderer.draw()
+        assert viewer.logic.turn_phase == "end_game"
+        assert {p.name: p.money for p in viewer.logic.final_scores} == result.final_cash
+
+        # Back from the end, then to the end again
+        viewer.seek(viewer.replay.turns - 1)
+        assert viewer.logic.final_scores is None
+        viewer.renderer.draw()
+        viewer.seek(viewer.replay.turns)
+        assert viewer.renderer.draw()
+        assert viewer.replay.verify()
+    finally:
+        pygame.quit()
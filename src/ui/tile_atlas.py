@@ -0,0 +1,59 @@
+import pygame
+
+from utils.constants import TILE_SIZE, TILE_COLOR
+
+
+class TileAtlas:
+    """
+    Pre-rendered tile sprites: a filled square with its "1A".."12I" label,
+    one per label and fill colour (empty, independent or a chain colour)
+    for board cells, and one per label and size for hand icons.
+
+    Sprites are rendered the first time they are asked for and reused
+    after that. Sprites are sized for the current window, so they are
+    thrown away whenever set_scale() is given a new grid scale.
+    """
+
+    def __init__(self, text):
+        self.text = text  # TextCache the labels are rendered with
+        self.scale = None
+        self.cell_size = 0
+        self.cells = {}
+        self.icons = {}
+
+    def set_scale(self, scale):
+        """Use board sprites for the given grid scale. Returns True if they were rebuilt."""
+        if scale == self.scale:
+            return False
+        self.scale = scale
+        self.cell_size = int((TILE_SIZE - 2) * scale)
+        self.cells.clear()
+        self.icons.clear()  # The hand area is resized along with the grid
+        return True
+
+    def cell(self, label, color):
+        """Board cell sprite for label filled with color, at the current scale."""
+        key = (label, color)
+        sprite = self.cells.get(key)
+        if sprite is None:
+            size = self.cell_size
+            sprite = pygame.Surface((size, size)).convert()
+            sprite.fill(color)
+            text_surface = self.text.render(label, int(24 * self.scale), (0, 0, 0))
+            sprite.blit(text_surface, text_surface.get_rect(center=(size // 2, size // 2)))
+            self.cells[key] = sprite
+        return sprite
+
+    def icon(self, label, size):
+        """Hand icon sprite for label: a bordered tile size x size pixels."""
+        key = (label, size)
+        sprite = self.icons.get(key)
+        if sprite is None:
+            rect = pygame.Rect(0, 0, size, size)
+            sprite = pygame.Surface(rect.size).convert()
+            pygame.draw.rect(sprite, TILE_COLOR, rect)
+            pygame.draw.rect(sprite, (0, 0, 0), rect, 2)  # border
+            text_surface = self.text.render(label, 16, (0, 0, 0))
+            sprite.blit(text_surface, text_surface.get_rect(center=rect.center))
+            self.icons[key] = sprite
+        return sprite
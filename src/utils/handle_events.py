@@ -1,13 +1,17 @@
 import pygame
 from pygame.locals import *
 from utils.helpers import *
+from game.board import DEAD
 
 class EventHandler:
     def __init__(self, game):
         self.game = game
 
-    def handle_events(self):
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        """Handle the given events, or everything queued. Returns how many there were."""
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == QUIT:
                 self.game.running = False
             elif self._handle_merger_resolution_events(event):
@@ -19,8 +23,22 @@ class EventHandler:
                     pygame.RESIZABLE | pygame.SCALED,
                     vsync=1
                 )
+                self.game.renderer.invalidate()
+            elif event.type in (WINDOWEXPOSED, VIDEOEXPOSE):
+                self.game.renderer.invalidate()
             elif event.type == MOUSEBUTTONDOWN:
                 self._handle_mouse_click(event)
+            elif event.type == MOUSEWHEEL:
+                self._handle_log_scroll(event)
+            elif event.type == KEYDOWN and event.key == K_F3:
+                self.game.toggle_profiler()
+        return len(events)
+
+    def _handle_log_scroll(self, event):
+        # Wheel up scrolls back through the log, when over the log area
+        log_view = self.game.renderer.log_view
+        if log_view.rect is not None and log_view.rect.collidepoint(pygame.mouse.get_pos()):
+            log_view.scroll(event.y * 3)
 
     def _handle_mouse_click(self, event):
         current_player = self.game.players[self.game.logic.current_turn_index]
@@ -70,7 +88,13 @@ class EventHandler:
             if icon_rect.collidepoint(mouse_x, mouse_y):
                 self.game.selected_tile_index = self.game.players[0].tiles_in_hand.index(tile_coord)
                 col, row = tile_coord
-                result = self.game.board.place_tile(col, row, "HumanTile", self.game.corporations)
+                play = self.game.board.classify_hand([tile_coord], self.game.corporations)[0]
+                if play.kind == DEAD:
+                    msg = f"Cannot place {col+1}{chr(65+row)}: it would merge two safe chains."
+                    self.game.log_messages.append(msg)
+                    self.game.selected_tile_index = None
+                    return
+                result = self.game.board.place_tile(col, row, "HumanTile", self.game.corporations, play)
 
                 if result == "blocked":
                     msg = f"Cannot place {col+1}{chr(65+row)}: All corporations active. Keep tile for later."
@@ -109,8 +133,8 @@ class EventHandler:
                     print(msg)
                     current_player.remove_tile(tile_coord)
                     
-                    absorbed_count = absorb_independents(self.game.board, col, row, chain_name)
-                    self.game.corporations[chain_name].size += 1 + absorbed_count
+                    absorb_independents(self.game.board, col, row, chain_name)
+                    self.game.logic.sync_chain_size(chain_name)
                     self.game.logic.turn_phase = "buy_stock"
                 else:
                     msg = f"Tile {col+1}{chr(65+row)} already occupied."
@@ -156,66 +180,31 @@ class EventHandler:
 
     def _handle_merger_resolution_events(self, event):
         """Handle events during merger resolution"""
-        if not self.game.logic.merger_state:
+        logic = self.game.logic
+        state = logic.merger_state
+        if not state:
             return False
-        
-        state = self.game.logic.merger_state
+
         current_player = state['players_to_process'][state['current_player_idx']]
-        
         if not current_player.is_human:
             return False
-            
+
         if event.type == MOUSEBUTTONDOWN:
-            mouse_x, mouse_y = event.pos
-            if hasattr(self.game.renderer, 'merger_ui_buttons'):
-                if state['phase'] == 'bonuses':
-                    if (self.game.renderer.merger_ui_buttons is not None and 
-                        'next' in self.game.renderer.merger_ui_buttons and 
-                        self.game.renderer.merger_ui_buttons['next'].collidepoint(mouse_x, mouse_y)):
-                        state['phase'] = 'stock_conversion'
-                        return True
-                elif state['phase'] == 'stock_conversion':
-                    if (self.game.renderer.merger_ui_buttons is not None and 
-                        'convert' in self.game.renderer.merger_ui_buttons and 
-                        self.game.renderer.merger_ui_buttons['convert'].collidepoint(mouse_x, mouse_y)):
-                        chain_name = state['losing_chains'][state['current_chain_idx']][0]
-                        player_stocks = current_player.stocks.get(chain_name, 0)
-                        dominant_stocks = self.game.logic.corporations[state['dominant']].stocks_remaining
-                        if player_stocks >= 2 and dominant_stocks > 0:
-                            self.game.logic.handle_human_stock_choice(convert=True)
-                            return True
-                    if (self.game.renderer.merger_ui_buttons is not None and 
-                        'sell' in self.game.renderer.merger_ui_buttons and 
-                        self.game.renderer.merger_ui_buttons['sell'].collidepoint(mouse_x, mouse_y)):
-                        chain_name = state['losing_chains'][state['current_chain_idx']][0]
-                        player_stocks = current_player.stocks.get(chain_name, 0)
-                        if player_stocks > 0:
-                            self.game.logic.handle_human_stock_choice(convert=False)
-                            return True
-                    if (self.game.renderer.merger_ui_buttons is not None and 
-                        'keep' in self.game.renderer.merger_ui_buttons and 
-                        self.game.renderer.merger_ui_buttons['keep'].collidepoint(mouse_x, mouse_y)):
-                        self.game.logic.handle_human_stock_choice(keep=True)
-                    if (self.game.renderer.merger_ui_buttons is not None and 
-                        'pass' in self.game.renderer.merger_ui_buttons and 
-                        self.game.renderer.merger_ui_buttons['pass'].collidepoint(mouse_x, mouse_y)):
-                        state['current_chain_idx'] += 1
-                        if state['current_chain_idx'] >= len(state['losing_chains']):
-                            self.game.logic.merger_state = None
-                            self.game.logic.turn_phase = "buy_stock"
-                        else:
-                            state['phase'] = 'bonuses'
-                        return True
-                    
-                    state['current_player_idx'] += 1
-                    if state['current_player_idx'] >= len(state['players_to_process']):
-                        state['current_player_idx'] = 0
-                        state['current_chain_idx'] += 1
-                        if state['current_chain_idx'] >= len(state['losing_chains']):
-                            self.game.logic.merger_state = None
-                            self.game.logic.turn_phase = "buy_stock"
-                        else:
-                            state['phase'] = 'bonuses'
-                    return True
-        
+            buttons = self.game.renderer.merger_ui_buttons or {}
+            clicked = next((name for name, rect in buttons.items() if rect.collidepoint(event.pos)), None)
+            if state['phase'] == 'bonuses':
+                if clicked == 'next':
+                    state['phase'] = 'stock_conversion'
+            elif state['phase'] == 'stock_conversion':
+                chain_name = state['losing_chains'][state['current_chain_idx']][0]
+                player_stocks = current_player.stocks.get(chain_name, 0)
+                dominant_stocks = logic.corporations[state['dominant']].stocks_remaining
+                if clicked == 'convert' and player_stocks >= 2 and dominant_stocks > 0:
+                    logic.handle_human_stock_choice(convert=True, log_messages=self.game.log_messages)
+                elif clicked == 'sell' and player_stocks > 0:
+                    logic.handle_human_stock_choice(log_messages=self.game.log_messages)
+                elif clicked in ('keep', 'pass'):
+                    logic.handle_human_stock_choice(keep=True, log_messages=self.game.log_messages)
+            return True
+
         return False
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Frame-time profiling for the game loop.
+
+FrameProfiler times chosen methods (event handling, each game-logic
+phase, each renderer panel) by wrapping them while it is enabled. It
+keeps the last few hundred samples of each for rolling percentiles, plus
+running totals. Disabled, it removes its wrappers again, so the methods
+run exactly as they would without it.
+"""
+import json
+import time
+from collections import deque
+
+import pygame
+
+
+class FrameProfiler:
+    def __init__(self, window=300):
+        self.window = window  # Samples kept per section for the percentiles
+        self.enabled = False
+        self.samples = {}
+        self.counts = {}
+        self.totals = {}
+        self._targets = []  # (object, method name, label or function giving one)
+
+    def instrument(self, obj, name, label):
+        """Time obj.name() under label (a string, or a function called before each call)."""
+        self._targets.append((obj, name, label))
+        if self.enabled:
+            self._wrap(obj, name, label)
+
+    def enable(self):
+        if not self.enabled:
+            self.enabled = True
+            for target in self._targets:
+                self._wrap(*target)
+
+    def disable(self):
+        if self.enabled:
+            self.enabled = False
+            for obj, name, _ in self._targets:
+                obj.__dict__.pop(name, None)
+
+    def toggle(self):
+        self.disable() if self.enabled else self.enable()
+
+    def add(self, label, seconds):
+        samples = self.samples.get(label)
+        if samples is None:
+            samples = self.samples[label] = deque(maxlen=self.window)
+            self.counts[label] = 0
+            self.totals[label] = 0.0
+        samples.append(seconds)
+        self.counts[label] += 1
+        self.totals[label] += seconds
+
+    def _wrap(self, obj, name, label):
+        method = getattr(type(obj), name).__get__(obj)
+        clock = time.perf_counter
+        add = self.add
+
+        if callable(label):
+            def timed(*args, **kwargs):
+                section = label()
+                start = clock()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    add(section, clock() - start)
+        else:
+            def timed(*args, **kwargs):
+                start = clock()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    add(label, clock() - start)
+
+        obj.__dict__[name] = timed
+
+    def stats(self):
+        """{label: {count, mean, p50, p95, p99, max}} in milliseconds, percentiles over the window."""
+        result = {}
+        for label, samples in sorted(self.samples.items()):
+            ordered = sorted(samples)
+            last = len(ordered) - 1
+            result[label] = {
+                "count": self.counts[label],
+                "mean": self.totals[label] / self.counts[label] * 1000,
+                "p50": ordered[last // 2] * 1000,
+                "p95": ordered[last * 95 // 100] * 1000,
+                "p99": ordered[last * 99 // 100] * 1000,
+                "max": ordered[last] * 1000,
+            }
+        return result
+
+    def report(self):
+        lines = [f"{'section':<28}{'count':>8}{'mean':>8}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}  (ms)"]
+        for label, s in self.stats().items():
+            lines.append(f"{label:<28}{s['count']:>8}{s['mean']:>8.2f}{s['p50']:>8.2f}"
+                         f"{s['p95']:>8.2f}{s['p99']:>8.2f}{s['max']:>8.2f}")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        with open(path, "w") as f:
+            json.dump(self.stats(), f, indent=2)
+
+    def draw_overlay(self, surface, text, pos=(5, 5)):
+        """Draw the percentile table on surface with a TextCache. Returns the rect drawn."""
+        lines = [f"{'section':<26}{'p50':>7}{'p95':>7}{'max':>7}"]
+        for label, s in self.stats().items():
+            lines.append(f"{label:<26}{s['p50']:>7.2f}{s['p95']:>7.2f}{s['max']:>7.2f}")
+        surfaces = [text.render(line, 16, (255, 255, 0), "monospace") for line in lines]
+        rect = pygame.Rect(pos, (max(s.get_width() for s in surfaces) + 10,
+                                 len(surfaces) * 14 + 10))
+        pygame.draw.rect(surface, (0, 0, 0), rect)
+        surface.blits([(s, (rect.x + 5, rect.y + 5 + i * 14)) for i, s in enumerate(surfaces)],
+                      doreturn=False)
+        return rect
@@ -0,0 +1,78 @@
+"""
+Fonts and rendered text shared by everything that draws.
+
+The UI draws the same strings over and over: tile labels, hotel rows,
+log lines, button captions. FontRegistry opens each (font, size) once and
+TextCache keeps the surfaces it renders in a least-recently-used cache,
+bounded by the memory their pixels take.
+"""
+from collections import OrderedDict
+
+import pygame
+
+
+class FontRegistry:
+    """Open fonts by (name, size), each only once."""
+
+    def __init__(self):
+        self.fonts = {}
+
+    def get(self, size, name=None):
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, size)
+            self.fonts[key] = font
+        return font
+
+
+class TextCache:
+    """
+    Rendered (antialiased) text surfaces keyed by text, font, size and
+    colour. When the cached surfaces take more than max_bytes, the least
+    recently used ones are dropped. Callers must not draw onto the
+    surfaces they get back, since they are shared.
+    """
+
+    def __init__(self, fonts=None, max_bytes=4 * 1024 * 1024):
+        self.fonts = fonts if fonts is not None else FontRegistry()
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()
+        self.bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def font(self, size, name=None):
+        return self.fonts.get(size, name)
+
+    def render(self, text, size, color, name=None):
+        key = (text, name, size, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.fonts.get(size, name).render(text, True, color)
+        self.surfaces[key] = surface
+        self.bytes += _surface_bytes(surface)
+        while self.bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, old = self.surfaces.popitem(last=False)
+            self.bytes -= _surface_bytes(old)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.bytes = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+
+def _surface_bytes(surface):
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()